@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import os
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 import pydantic
@@ -70,6 +70,8 @@ class Block:
 class Environment:
     env: dict[str, str]
     global_postprocessors: dict[str, NonRefPostprocessor]
+    # Names of the variables in env that are not simply inherited from the process
+    configured_env_keys: set[str] = field(default_factory=set)
 
 
 @dataclass
@@ -353,7 +355,7 @@ def _find_blocks(
 ) -> list[Block]:
     relative_path = path
     if root is not None:
-        relative_path = relative_path.relative_to(root, walk_up=True)
+        relative_path = Path(os.path.relpath(relative_path, root))
     collector = _BlockCollector(
         path=path, relative_path=relative_path, errors=errors, environment=environment
     )
@@ -377,7 +379,8 @@ def load_blocks_from_content(
 
     Returns ``FileData`` object, or ``None`` in case a fatal error happened.
 
-    **Note**: must not be used in parallel.
+    **Note**: must not be used in parallel in the same process, since docutils
+    directives are registered globally. Using it in multiple processes is fine.
     """
     flog = mlog.fields(func="load_blocks_from_content")
     flog.notice("Find code blocks in file")
@@ -416,7 +419,8 @@ def load_blocks_from_file(
 
     Returns ``FileData`` object, or ``None`` in case a fatal error happened.
 
-    **Note**: must not be used in parallel.
+    **Note**: must not be used in parallel in the same process, since docutils
+    directives are registered globally. Using it in multiple processes is fine.
     """
     flog = mlog.fields(func="load_blocks_from_file")
 
@@ -451,6 +455,7 @@ def get_environment(
     env = os.environ.copy()
     env.pop("ANSIBLE_FORCE_COLOR", None)
     env["NO_COLOR"] = "true"
+    configured_env_keys = {"NO_COLOR"}
     if collection_path is not None:
         collections_path = env.get("ANSIBLE_COLLECTIONS_PATH") or ""
         if collections_path:
@@ -458,6 +463,7 @@ def get_environment(
         else:
             collections_path = f"{collection_path}"
         env["ANSIBLE_COLLECTIONS_PATH"] = collections_path
+        configured_env_keys.add("ANSIBLE_COLLECTIONS_PATH")
     postprocessors = {}
     if collection_config is not None:
         if ansible_output_config is not None:
@@ -467,7 +473,12 @@ def get_environment(
         ansible_output_config = collection_config.ansible_output
     if ansible_output_config is not None:
         env.update(ansible_output_config.global_env)
+        configured_env_keys.update(ansible_output_config.global_env)
         postprocessors.update(ansible_output_config.global_postprocessors)
     flog.notice("Environment template: {}", env)
     flog.notice("Global post-processors: {}", postprocessors)
-    return Environment(env=env, global_postprocessors=postprocessors)
+    return Environment(
+        env=env,
+        global_postprocessors=postprocessors,
+        configured_env_keys=configured_env_keys,
+    )
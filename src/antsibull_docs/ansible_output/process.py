@@ -8,7 +8,17 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import importlib
+import inspect
+import os
+import re
+import shutil
 import subprocess
+import time
+import typing as t
+from collections.abc import Collection, Mapping
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -17,19 +27,27 @@ from antsibull_core.logging import get_module_logger
 from antsibull_docutils.rst_code_finder import (
     CodeBlockInfo,
 )
-from antsibull_fileutils.tempfile import AnsibleTemporaryDirectory
+from antsibull_fileutils.tempfile import AnsibleTemporaryDirectory, ansible_mkdtemp
 from antsibull_fileutils.yaml import store_yaml_file
 
 from sphinx_antsibull_ext.schemas.ansible_output_data import (
     AnsibleOutputData,
+    LineFilter,
+    LineFilterDelete,
+    LineFilterKeep,
+    LineFilterSubstitute,
     NonRefPostprocessor,
     PostprocessorCLI,
+    PostprocessorLineFilters,
+    PostprocessorPython,
     VariableSource,
     VariableSourceCodeBlock,
     VariableSourceValue,
 )
 
-from .load import Block, Error
+from .. import app_context
+from ..utils.cache import ResultCache, compute_cache_key, hash_file, hash_files
+from .load import Block, Environment, Error
 
 mlog = get_module_logger(__name__)
 
@@ -181,6 +199,57 @@ async def _execute(
     )
 
 
+def _apply_line_filters(lines: list[str], line_filters: list[LineFilter]) -> list[str]:
+    for line_filter in line_filters:
+        if isinstance(line_filter, LineFilterSubstitute):
+            regex = re.compile(line_filter.substitute)
+            lines = [regex.sub(line_filter.replacement, line) for line in lines]
+        elif isinstance(line_filter, LineFilterDelete):
+            regex = re.compile(line_filter.delete_matching)
+            lines = [line for line in lines if not regex.search(line)]
+        elif isinstance(line_filter, LineFilterKeep):
+            regex = re.compile(line_filter.keep_matching)
+            lines = [line for line in lines if regex.search(line)]
+        else:
+            raise AssertionError(
+                f"Unknown line filter type {type(line_filter)}"
+            )  # pragma: no cover
+    return lines
+
+
+@functools.cache
+def _load_python_postprocessor(reference: str) -> t.Callable[[str], t.Any]:
+    module_name, attribute = reference.split(":", 1)
+    try:
+        obj: t.Any = importlib.import_module(module_name)
+        for part in attribute.split("."):
+            obj = getattr(obj, part)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(
+            f"Cannot load Python postprocessor {reference}: {exc}"
+        ) from exc
+    if not callable(obj):
+        raise ValueError(f"Python postprocessor {reference} is not callable")
+    return obj
+
+
+@functools.cache
+def _hash_python_postprocessor(reference: str) -> str | None:
+    """
+    Compute a hash of the source file defining a Python postprocessor, so that
+    changes to the postprocessor invalidate cached code block contents.
+
+    Returns ``None`` if the postprocessor cannot be loaded, or if its source file
+    cannot be determined.
+    """
+    try:
+        func = _load_python_postprocessor(reference)
+        path = inspect.getsourcefile(func) or inspect.getfile(func)
+    except (ValueError, TypeError):
+        return None
+    return hash_file(path)
+
+
 async def _apply_postprocessor(
     lines: list[str],
     *,
@@ -197,63 +266,477 @@ async def _apply_postprocessor(
         )
         return _massage_stdout(stdout)
 
+    if isinstance(postprocessor, PostprocessorLineFilters):
+        flog.notice("Apply line filters: {}", postprocessor.line_filters)
+        lines = _apply_line_filters(lines, postprocessor.line_filters)
+        return _massage_stdout("\n".join(lines) + "\n")
+
+    if isinstance(postprocessor, PostprocessorPython):
+        flog.notice("Call Python postprocessor: {}", postprocessor.python)
+        func = _load_python_postprocessor(postprocessor.python)
+        try:
+            output = func("\n".join(lines) + "\n")
+        except Exception as exc:
+            raise ValueError(f"{postprocessor.python} raised {exc!r}") from exc
+        if not isinstance(output, str):
+            raise ValueError(
+                f"{postprocessor.python} returned {type(output)} instead of a string"
+            )
+        return _massage_stdout(output)
+
     raise AssertionError(
         f"Unknown post-processor type {type(postprocessor)}"
     )  # pragma: no cover
 
 
+_WORKSPACE_LOCAL_TEMP = "local-tmp"
+
+
+@dataclass
+class Workspace:
+    directory: Path
+    env: dict[str, str]
+
+
+class WorkspacePool:
+    """
+    Pool of workspace directories for running ansible-playbook, which are reused for
+    code blocks with the same environment instead of creating a new temporary
+    directory for every code block.
+
+    Every workspace has its own local temporary directory, which is used unless the
+    environment explicitly configures one. All files in a workspace are removed before
+    it is used for another code block, so no state is kept between code blocks.
+    """
+
+    def __init__(self) -> None:
+        self._directory: Path | None = None
+        self._idle: dict[tuple[tuple[str, str], ...], list[Workspace]] = {}
+        self._counter = 0
+
+    def __enter__(self) -> WorkspacePool:
+        self._directory = ansible_mkdtemp(prefix="antsibull-docs-output")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        self._directory = None
+        self._idle.clear()
+
+    def _create(self, env: dict[str, str]) -> Workspace:
+        if self._directory is None:
+            raise ValueError("Workspace pool has not been entered")
+        self._counter += 1
+        directory = self._directory / f"workspace-{self._counter}"
+        local_temp = directory / _WORKSPACE_LOCAL_TEMP
+        local_temp.mkdir(parents=True)
+        workspace_env = {
+            "ANSIBLE_LOCAL_TEMP": str(local_temp),
+        }
+        workspace_env.update(env)
+        return Workspace(directory=directory, env=workspace_env)
+
+    @staticmethod
+    def _reset(workspace: Workspace) -> None:
+        for entry in workspace.directory.iterdir():
+            if entry.name == _WORKSPACE_LOCAL_TEMP:
+                for child in entry.iterdir():
+                    if child.is_dir() and not child.is_symlink():
+                        shutil.rmtree(child)
+                    else:
+                        child.unlink()
+            elif entry.is_dir() and not entry.is_symlink():
+                shutil.rmtree(entry)
+            else:
+                entry.unlink()
+
+    @asynccontextmanager
+    async def workspace(self, env: dict[str, str]) -> t.AsyncGenerator[Workspace, None]:
+        """
+        Provide an empty workspace for the given environment.
+        """
+        key = tuple(sorted(env.items()))
+        idle = self._idle.setdefault(key, [])
+        workspace = idle.pop() if idle else self._create(env)
+        try:
+            yield workspace
+        finally:
+            # Removing the files is blocking I/O, so do it in a thread
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._reset, workspace)
+            idle.append(workspace)
+
+
+async def _compute_code_block_content_in(
+    block: Block,
+    *,
+    playbook: str,
+    directory: Path,
+    env: dict[str, str],
+) -> list[str]:
+    flog = mlog.fields(func="_compute_code_block_content_in", block_id=block.id)
+
+    file = directory / "playbook.yml"
+    flog.notice("Directory: {}; playbook: {}", directory, file)
+    with open(file, "w", encoding="utf-8") as f:
+        f.write(playbook)
+
+    command = ["ansible-playbook", "playbook.yml"]
+    if block.data.inventory is not None:
+        inventory_filename = "inventory.yaml"
+        store_yaml_file(
+            directory / inventory_filename,
+            block.data.inventory.model_dump(mode="json", exclude_unset=True),
+            nice=True,
+            sort_keys=True,
+        )
+        command.extend(["-i", inventory_filename])
+
+    flog.notice("Run ansible-playbook: {}", command)
+    stdout = await _execute(command, cwd=directory, env=env)
+
+    flog.notice("Post-process result")
+    lines = _massage_stdout(
+        stdout,
+        skip_first_lines=block.data.skip_first_lines or 0,
+        skip_last_lines=block.data.skip_last_lines or 0,
+        prepend_lines=block.data.prepend_lines,
+    )
+    for postprocessor in block.merged_postprocessors:
+        flog.notice("Run post-processor {}", postprocessor)
+        try:
+            lines = await _apply_postprocessor(
+                lines,
+                block_id=block.id,
+                env=block.merged_env,
+                postprocessor=postprocessor,
+            )
+        except ValueError as exc:
+            raise ValueError(
+                f"Error while running post-processor {postprocessor}:\n{exc}"
+            ) from exc
+    return lines
+
+
 async def _compute_code_block_content(
     block: Block,
+    *,
+    playbook: str,
+    workspaces: WorkspacePool | None = None,
 ) -> list[str]:
     flog = mlog.fields(func="_compute_code_block_content", block_id=block.id)
 
     flog.notice("Prepare environment")
     flog.notice("Environment: {}", block.merged_env)
 
+    if workspaces is not None:
+        flog.notice("Use pooled workspace")
+        async with workspaces.workspace(block.merged_env) as workspace:
+            return await _compute_code_block_content_in(
+                block,
+                playbook=playbook,
+                directory=workspace.directory,
+                env=workspace.env,
+            )
+
     flog.notice("Prepare temporary directory")
     with AnsibleTemporaryDirectory(prefix="antsibull-docs-output") as directory:
-        file = directory / "playbook.yml"
-        flog.notice("Directory: {}; playbook: {}", directory, file)
-        with open(file, "w", encoding="utf-8") as f:
-            f.write(
-                _compose_playbook(block.data, previous_blocks=block.previous_blocks)
-            )
+        return await _compute_code_block_content_in(
+            block, playbook=playbook, directory=directory, env=block.merged_env
+        )
 
-        command = ["ansible-playbook", "playbook.yml"]
-        if block.data.inventory is not None:
-            inventory_filename = "inventory.yaml"
-            store_yaml_file(
-                directory / inventory_filename,
-                block.data.inventory.model_dump(mode="json", exclude_unset=True),
-                nice=True,
-                sort_keys=True,
-            )
-            command.extend(["-i", inventory_filename])
 
-        flog.notice("Run ansible-playbook: {}", command)
-        stdout = await _execute(command, cwd=directory, env=block.merged_env)
+# Files and directories of a collection that can influence ansible-playbook's output
+_COLLECTION_CONTENT_PATHS = (
+    "galaxy.yml",
+    "MANIFEST.json",
+    "meta",
+    "playbooks",
+    "plugins",
+    "roles",
+)
+
+# Used by ansible-core if ANSIBLE_COLLECTIONS_PATH is not set
+_DEFAULT_COLLECTIONS_PATHS = (
+    "~/.ansible/collections",
+    "/usr/share/ansible/collections",
+)
+
 
-        flog.notice("Post-process result")
-        lines = _massage_stdout(
-            stdout,
-            skip_first_lines=block.data.skip_first_lines or 0,
-            skip_last_lines=block.data.skip_last_lines or 0,
-            prepend_lines=block.data.prepend_lines,
+def _hash_collections(collections_path: str | None) -> str:
+    """
+    Compute a digest of the content of all collections in the collection search path
+    ``collections_path`` (the value of ``ANSIBLE_COLLECTIONS_PATH``).
+    """
+    if collections_path is None:
+        paths: Collection[str] = _DEFAULT_COLLECTIONS_PATHS
+    else:
+        paths = [path for path in collections_path.split(os.pathsep) if path]
+    digests: list[str | None] = []
+    for path in paths:
+        path = os.path.expanduser(path)
+        if os.path.basename(os.path.normpath(path)) != "ansible_collections":
+            path = os.path.join(path, "ansible_collections")
+        if not os.path.isdir(path):
+            digests.append(None)
+            continue
+        content_paths = [
+            f"{namespace}/{name}/{content_path}"
+            for namespace in sorted(os.listdir(path))
+            if os.path.isdir(os.path.join(path, namespace))
+            for name in sorted(os.listdir(os.path.join(path, namespace)))
+            for content_path in _COLLECTION_CONTENT_PATHS
+        ]
+        digests.append(hash_files(path, content_paths))
+    return compute_cache_key(digests)
+
+
+class ReplacementCache:
+    """
+    Persistent cache for the computed contents of code blocks.
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        *,
+        ansible_version: str,
+        collections_hash: str | None = None,
+        env_keys: Collection[str] = (),
+        path_replacements: Mapping[str, str] | None = None,
+        force: bool = False,
+    ):
+        """
+        :arg cache: The underlying result cache.
+        :arg ansible_version: The output of ``ansible-playbook --version``.
+        :arg collections_hash: A digest of the installed collections.
+        :arg env_keys: Environment variables that are part of the cache key, in
+            addition to ``ANSIBLE_*`` and the ones set by a code block's ``env``.
+            Other variables, like the ones inherited from the calling process, are
+            ignored.
+        :arg path_replacements: Maps temporary paths that change on every run to
+            stable values.
+        :arg force: If ``True``, cached results are never used, but new results are
+            still stored.
+        """
+        self._cache = cache
+        self._path_replacements = sorted(
+            (path_replacements or {}).items(), key=lambda item: -len(item[0])
+        )
+        self._ansible_version = self._replace_paths(ansible_version)
+        self._collections_hash = collections_hash
+        self._env_keys = frozenset(env_keys)
+        self._force = force
+
+    def _replace_paths(self, value: str) -> str:
+        for path, replacement in self._path_replacements:
+            value = value.replace(path, replacement)
+        return value
+
+    @staticmethod
+    def _dump_postprocessor(postprocessor: NonRefPostprocessor) -> t.Any:
+        result = postprocessor.model_dump(mode="json")
+        if isinstance(postprocessor, PostprocessorPython):
+            result["source_hash"] = _hash_python_postprocessor(postprocessor.python)
+        return result
+
+    def get_key(self, block: Block, playbook: str) -> str:
+        """
+        Compute the cache key for a block with the composed playbook ``playbook``.
+        """
+        data = block.data
+        return compute_cache_key(
+            self._ansible_version,
+            self._collections_hash,
+            playbook,
+            (
+                data.inventory.model_dump(mode="json", exclude_unset=True)
+                if data.inventory is not None
+                else None
+            ),
+            {
+                key: self._replace_paths(value)
+                for key, value in block.merged_env.items()
+                if key.startswith("ANSIBLE_")
+                or key in self._env_keys
+                or key in data.env
+            },
+            [
+                self._dump_postprocessor(postprocessor)
+                for postprocessor in block.merged_postprocessors
+            ],
+            data.skip_first_lines,
+            data.skip_last_lines,
+            data.prepend_lines,
+        )
+
+    def get(self, key: str) -> list[str] | None:
+        """
+        Retrieve the content for a cache key, if cached.
+        """
+        if self._force:
+            return None
+        value = self._cache.get(key)
+        if not isinstance(value, dict) or not isinstance(value.get("lines"), list):
+            return None
+        return value["lines"]
+
+    def set(self, key: str, lines: list[str]) -> None:
+        """
+        Store the content for a cache key.
+        """
+        self._cache.set(key, {"lines": lines})
+
+
+async def create_replacement_cache(
+    environment: Environment,
+    *,
+    path_replacements: Mapping[str, str] | None = None,
+    force: bool = False,
+) -> ReplacementCache | None:
+    """
+    Create a cache for computed code block contents if the ``cache_dir`` option is set.
+
+    Returns ``None`` if no cache directory is configured, or if the version of
+    ansible-core cannot be determined.
+
+    The cached results are invalidated by changes to the collections in the collection
+    search path ``ANSIBLE_COLLECTIONS_PATH``, but not by changes to collections
+    installed as Python packages.
+    """
+    flog = mlog.fields(func="create_replacement_cache")
+    app_ctx = app_context.app_ctx.get()
+    cache = ResultCache.create(app_ctx.cache_dir, "ansible-output")
+    if cache is None:
+        return None
+    try:
+        ansible_version = await _execute(
+            ["ansible-playbook", "--version"], env=environment.env
+        )
+    except ValueError as exc:
+        flog.warning(
+            "Not caching results, cannot determine ansible-core version: {}", exc
+        )
+        return None
+    collections_path = environment.env.get("ANSIBLE_COLLECTIONS_PATH")
+    if collections_path is None:
+        collections_path = environment.env.get("ANSIBLE_COLLECTIONS_PATHS")
+    # Reading all collections is blocking I/O, so do it in a thread
+    loop = asyncio.get_running_loop()
+    collections_hash = await loop.run_in_executor(
+        None, _hash_collections, collections_path
+    )
+    return ReplacementCache(
+        cache,
+        ansible_version=ansible_version,
+        collections_hash=collections_hash,
+        env_keys=environment.configured_env_keys,
+        path_replacements=path_replacements,
+        force=force,
+    )
+
+
+class BlockTimings:
+    """
+    Records how long running ansible-playbook took for code blocks.
+
+    If a result cache is provided, the durations recorded in previous runs are
+    available, and the durations of this run can be stored for future runs.
+    """
+
+    _KEY = compute_cache_key("ansible-output-timings")
+
+    def __init__(self, cache: ResultCache | None = None):
+        """
+        :arg cache: The underlying result cache.
+        """
+        self._cache = cache
+        self._history: dict[str, float] = {}
+        #: The durations (in seconds) recorded in this run, indexed by block ID.
+        self.durations: dict[str, float] = {}
+        value = cache.get(self._KEY) if cache else None
+        if isinstance(value, dict):
+            self._history = {
+                block_id: float(duration)
+                for block_id, duration in value.items()
+                if isinstance(duration, (int, float))
+            }
+
+    def get_expected_duration(self, block: Block) -> float | None:
+        """
+        Return the last recorded duration for a block, or ``None`` if it is not known.
+        """
+        duration = self.durations.get(block.id)
+        if duration is None:
+            duration = self._history.get(block.id)
+        return duration
+
+    def record(self, block: Block, duration: float) -> None:
+        """
+        Record the duration for a block.
+        """
+        self.durations[block.id] = duration
+
+    def save(self) -> None:
+        """
+        Store the recorded durations in the cache, if there is one.
+        """
+        if self._cache is None or not self.durations:
+            return
+        timings = dict(self._history)
+        timings.update(self.durations)
+        self._cache.set(self._KEY, timings)
+
+
+def load_block_timings() -> BlockTimings:
+    """
+    Load the durations recorded in previous runs if the ``cache_dir`` option is set.
+    """
+    app_ctx = app_context.app_ctx.get()
+    return BlockTimings(ResultCache.create(app_ctx.cache_dir, "ansible-output-timings"))
+
+
+async def _run_code_block(
+    block: Block,
+    *,
+    playbook: str,
+    timings: BlockTimings | None,
+    workspaces: WorkspacePool | None,
+) -> list[str]:
+    start = time.monotonic()
+    lines = await _compute_code_block_content(
+        block, playbook=playbook, workspaces=workspaces
+    )
+    if timings is not None:
+        timings.record(block, time.monotonic() - start)
+    return lines
+
+
+async def _get_code_block_content(
+    block: Block,
+    *,
+    cache: ReplacementCache | None,
+    timings: BlockTimings | None,
+    workspaces: WorkspacePool | None,
+) -> list[str]:
+    flog = mlog.fields(func="_get_code_block_content", block_id=block.id)
+    playbook = _compose_playbook(block.data, previous_blocks=block.previous_blocks)
+    if cache is None:
+        return await _run_code_block(
+            block, playbook=playbook, timings=timings, workspaces=workspaces
         )
-        for postprocessor in block.merged_postprocessors:
-            flog.notice("Run post-processor {}", postprocessor)
-            try:
-                lines = await _apply_postprocessor(
-                    lines,
-                    block_id=block.id,
-                    env=block.merged_env,
-                    postprocessor=postprocessor,
-                )
-            except ValueError as exc:
-                raise ValueError(
-                    f"Error while running post-processor {postprocessor}:\n{exc}"
-                ) from exc
+
+    key = cache.get_key(block, playbook)
+    lines = cache.get(key)
+    if lines is not None:
+        flog.notice("Using cached result {}", key)
         return lines
+    lines = await _run_code_block(
+        block, playbook=playbook, timings=timings, workspaces=workspaces
+    )
+    cache.set(key, lines)
+    return lines
 
 
 @dataclass
@@ -267,10 +750,20 @@ class Replacement:
 
 async def compute_replacement(
     block: Block,
+    *,
+    cache: ReplacementCache | None = None,
+    timings: BlockTimings | None = None,
+    workspaces: WorkspacePool | None = None,
 ) -> Replacement | Error | None:
     """
     Compute replacement for a block.
 
+    If ``cache`` is provided, ansible-playbook is only run if no result for the same
+    playbook, inventory, environment and post-processors has been cached.
+    If ``timings`` is provided, the time ansible-playbook took is recorded in it.
+    If ``workspaces`` is provided, ansible-playbook is run in a pooled workspace
+    instead of a new temporary directory.
+
     Returns either a ``Replacement`` object,
     ``None`` in case the replacement is identical to the current content,
     or an ``Error`` object in case the computation failed.
@@ -278,7 +771,9 @@ async def compute_replacement(
     flog = mlog.fields(func="compute_replacement", block_id=block.id)
 
     try:
-        new_content = await _compute_code_block_content(block)
+        new_content = await _get_code_block_content(
+            block, cache=cache, timings=timings, workspaces=workspaces
+        )
     except Exception as exc:  # pylint: disable=broad-exception-caught
         flog.notice("Error while computing replacement: {}", exc)
         return Error(
@@ -9,9 +9,10 @@ from __future__ import annotations
 
 import typing as t
 from collections import defaultdict
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Mapping, MutableMapping, Sequence
 
 from .docs_parsing.routing import CollectionRoutingT
+from .rst_labels import get_attribute_ref, get_option_ref, get_return_value_ref
 from .utils.rst import massage_rst_label
 
 
@@ -104,7 +105,7 @@ def _add_seealso(
 def _add_aliases(
     plugin_name: str,
     plugin_record: MutableMapping[str, t.Any],
-    routing_sources: list[str],
+    routing_sources: Sequence[str],
 ) -> None:
     collection_prefix = ".".join(plugin_name.split(".", 2)[:2]) + "."
     for redirect in routing_sources:
@@ -116,6 +117,135 @@ def _add_aliases(
                 plugin_record["aliases"].append(alias)
 
 
+def get_routing_sources(
+    collection_routing: CollectionRoutingT,
+) -> dict[str, dict[str, list[str]]]:
+    """
+    Collect the names of all plugins that redirect to a plugin.
+
+    :arg collection_routing: The routing information of all collections.
+    :returns: A mapping of plugin type to a mapping of plugin FQCN to the list of plugin
+        FQCNs that redirect to it.
+    """
+    result: dict[str, dict[str, list[str]]] = {}
+    for plugin_type, plugins in collection_routing.items():
+        routing_sources: defaultdict[str, list[str]] = defaultdict(list)
+        for plugin_name, plugin_meta in plugins.items():
+            redirect = plugin_meta.get("redirect")
+            if isinstance(redirect, str):
+                routing_sources[redirect].append(plugin_name)
+        result[plugin_type] = dict(routing_sources)
+    return result
+
+
+def _collect_rst_labels(
+    options_data: Mapping[str, Mapping[str, t.Any]],
+    suboption_entry: str,
+    rst_label_prefix: str,
+    labels: dict[str, str],
+) -> dict[str, str]:
+    # The options must have been processed by add_full_key() before
+    for entry in options_data.values():
+        for full_key_rst in entry["full_keys_rst"]:
+            key = "/".join(full_key_rst)
+            labels[key] = rst_label_prefix + key
+        suboptions = entry.get(suboption_entry)
+        if suboptions:
+            _collect_rst_labels(suboptions, suboption_entry, rst_label_prefix, labels)
+    return labels
+
+
+def _get_rst_labels(
+    plugin_name: str,
+    plugin_type: str,
+    doc: Mapping[str, t.Any],
+    suboption_entry: str,
+    role_entrypoint: str | None = None,
+) -> dict[str, dict[str, str]]:
+    return {
+        "option": _collect_rst_labels(
+            doc["options"],
+            suboption_entry,
+            get_option_ref(plugin_name, plugin_type, role_entrypoint, []),
+            {},
+        ),
+        "attribute": {
+            attribute: get_attribute_ref(
+                plugin_name, plugin_type, role_entrypoint, attribute
+            )
+            for attribute in doc.get("attributes") or {}
+        },
+    }
+
+
+def augment_plugin_record(
+    plugin_name: str,
+    plugin_type: str,
+    plugin_record: MutableMapping[str, t.Any],
+    routing_sources: Sequence[str] = (),
+) -> None:
+    """
+    Add the additional data to a single plugin record that only depends on the plugin
+    itself. This is everything ``augment_docs()`` does except for filling in see-alsos.
+
+    :arg plugin_name: The FQCN of the plugin.
+    :arg plugin_type: The type of the plugin.
+    :arg plugin_record: The normalized plugin record that will be augmented.
+    :arg routing_sources: FQCNs of the plugins redirecting to this plugin.
+
+    .. warning:: This function operates by side-effect.  The plugin_record dictionay is modified
+        directly.
+    """
+    rst_labels: dict[str, t.Any] = {}
+    if plugin_record.get("return"):
+        add_full_key(plugin_record["return"], "contains")
+        rst_labels["return_value"] = _collect_rst_labels(
+            plugin_record["return"],
+            "contains",
+            get_return_value_ref(plugin_name, plugin_type, None, []),
+            {},
+        )
+    if plugin_record.get("doc"):
+        add_full_key(plugin_record["doc"]["options"], "suboptions")
+        rst_labels.update(
+            _get_rst_labels(
+                plugin_name, plugin_type, plugin_record["doc"], "suboptions"
+            )
+        )
+        _add_aliases(plugin_name, plugin_record["doc"], routing_sources)
+    if plugin_record.get("entry_points"):
+        rst_labels["entry_points"] = {}
+        for entry_point_name, entry_point in plugin_record["entry_points"].items():
+            add_full_key(entry_point["options"], "options")
+            rst_labels["entry_points"][entry_point_name] = _get_rst_labels(
+                plugin_name, plugin_type, entry_point, "options", entry_point_name
+            )
+    # The labels are kept out of the option, return value, and attribute entries
+    # so that equal entries of different plugins can still be shared
+    plugin_record["rst_labels"] = rst_labels
+
+
+def augment_seealso(
+    plugin_info: Mapping[str, Mapping[str, MutableMapping[str, t.Any]]],
+) -> None:
+    """
+    In see-alsos that reference to modules or plugins but that have no description,
+    automatically insert the destination's short_description (if available).
+
+    This is the part of ``augment_docs()`` that needs the data of all plugins.
+
+    :arg plugin_info: The plugin_info that will be analyzed and augmented.
+
+    .. warning:: This function operates by side-effect.  The plugin_info dictionay is modified
+        directly.
+    """
+    for plugin_map in plugin_info.values():
+        for plugin_record in plugin_map.values():
+            doc = plugin_record.get("doc")
+            if doc and doc.get("seealso"):
+                _add_seealso(doc["seealso"], plugin_info)
+
+
 def augment_docs(
     plugin_info: MutableMapping[str, MutableMapping[str, t.Any]],
     collection_routing: CollectionRoutingT,
@@ -127,32 +257,27 @@ def augment_docs(
     Current Augmentations:
 
     * ``full_key`` allows displaying nested suboptions and return dicts.
+    * ``rst_labels`` maps full keys of options and return values, and attribute names, to
+      their RST labels. For roles, the labels are stored per entry point.
     * In see-alsos that reference to modules or plugins but that have no description,
       automatically insert the destination's short_description (if available)
 
+    ``normalize_all_plugin_info()`` can do everything but the see-also part in its worker
+    processes; see ``augment_plugin_record()`` and ``augment_seealso()``.
+
     :arg plugin_info: The plugin_info that will be analyzed and augmented.
 
     .. warning:: This function operates by side-effect.  The plugin_info dictionay is modified
         directly.
     """
+    all_routing_sources = get_routing_sources(collection_routing)
     for plugin_type, plugin_map in plugin_info.items():
-        # First collect all routing targets
-        routing_sources: defaultdict[str, list[str]] = defaultdict(list)
-        for plugin_name, plugin_meta in collection_routing.get(plugin_type, {}).items():
-            redirect = plugin_meta.get("redirect")
-            if isinstance(redirect, str):
-                routing_sources[redirect].append(plugin_name)
-        # Now augment all plugin records
+        routing_sources = all_routing_sources.get(plugin_type, {})
         for plugin_name, plugin_record in plugin_map.items():
-            if plugin_record.get("return"):
-                add_full_key(plugin_record["return"], "contains")
-            if plugin_record.get("doc"):
-                add_full_key(plugin_record["doc"]["options"], "suboptions")
-                if plugin_record["doc"].get("seealso"):
-                    _add_seealso(plugin_record["doc"]["seealso"], plugin_info)
-                _add_aliases(
-                    plugin_name, plugin_record["doc"], routing_sources[plugin_name]
-                )
-            if plugin_record.get("entry_points"):
-                for entry_point in plugin_record["entry_points"].values():
-                    add_full_key(entry_point["options"], "options")
+            augment_plugin_record(
+                plugin_name,
+                plugin_type,
+                plugin_record,
+                routing_sources.get(plugin_name, ()),
+            )
+    augment_seealso(plugin_info)
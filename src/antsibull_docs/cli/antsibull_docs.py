@@ -85,6 +85,7 @@ ARGS_MAP: dict[str, Callable[[], Callable[[], int]]] = {
     "lint-collection-docs": _create_loader("lint_docs", "lint_collection_docs"),
     "lint-core-docs": _create_loader("lint_docs", "lint_core_docs"),
     "ansible-output": _create_loader("ansible_output", "run_ansible_output"),
+    "serve": _create_loader("serve", "serve_docs"),
 }
 
 #: The filename for the file which lists raw collection names
@@ -92,7 +93,12 @@ DEFAULT_PIECES_FILE: str = "ansible.in"
 
 
 def _normalize_docs_options(args: argparse.Namespace) -> None:
-    if args.command in ("lint-collection-docs", "lint-core-docs", "ansible-output"):
+    if args.command in (
+        "lint-collection-docs",
+        "lint-core-docs",
+        "ansible-output",
+        "serve",
+    ):
         return
 
     args.dest_dir = os.path.abspath(os.path.realpath(args.dest_dir))
@@ -816,6 +822,41 @@ def parse_args(program_name: str, args: list[str]) -> argparse.Namespace:
         help="Determine whether to also check extra RST files"
         " for valid collection references.",
     )
+    lint_collection_docs_parser.add_argument(
+        "--link-collections",
+        dest="link_collections",
+        action=BooleanOptionalAction,
+        default=False,
+        help="When --plugin-docs or --check-extra-docs-refs is specified,"
+        " provide the collection and its dependencies to ansible-doc with"
+        " symbolic links instead of copying them. Falls back to copying"
+        " if symbolic links cannot be used.",
+    )
+    lint_collection_docs_parser.add_argument(
+        "--watch",
+        dest="watch",
+        action=BooleanOptionalAction,
+        default=False,
+        help="After linting, keep watching the collection for changes, and lint"
+        " everything again that is affected by changed files. Press Ctrl+C to stop.",
+    )
+    lint_collection_docs_parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=1.0,
+        help="Interval in seconds in which to look for changed files in --watch mode."
+        " (default: %(default)s)",
+    )
+    lint_collection_docs_parser.add_argument(
+        "--fast-docs-extraction",
+        dest="fast_docs_extraction",
+        action=BooleanOptionalAction,
+        default=True,
+        help="In --watch mode, extract the documentation of changed plugins directly"
+        " from their files instead of calling ansible-doc, if the result is"
+        " guaranteed to be the same. (default: %(default)s)",
+    )
 
     #
     # Lint core docs
@@ -875,12 +916,93 @@ def parse_args(program_name: str, args: list[str]) -> argparse.Namespace:
         help="Force enable or disable color in diffs when using --check."
         " By default decides on whether stdout is a tty or not.",
     )
+    ansible_output_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Run ansible-playbook for all code blocks, even if the result for a code"
+        " block has been cached. Results are only cached if the cache_dir option is"
+        " set in the configuration.",
+    )
+    ansible_output_parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print how long ansible-playbook took for every code block.",
+    )
+    ansible_output_parser.add_argument(
+        "--reuse-workspaces",
+        action="store_true",
+        help="Reuse the directories ansible-playbook is run in for code blocks with"
+        " the same environment, instead of creating a new temporary directory for"
+        " every code block. Every directory has its own local temporary directory,"
+        " and is emptied before it is reused.",
+    )
     ansible_output_parser.add_argument(
         "--config",
         help="Path to config file. Can only be specified when at least one path"
         " has been provided to ansible-output.",
     )
 
+    #
+    # Serve documentation of collections for previewing
+    #
+    serve_parser = subparsers.add_parser(
+        "serve",
+        parents=[template_parser, insert_version_parser],
+        description="Serve documentation of installed collections over HTTP for"
+        " previewing. Pages are rendered when they are requested.",
+    )
+    serve_parser.add_argument(
+        nargs="+",
+        dest="collections",
+        help="One or more installed collections to document. The wildcard '*'"
+        " can be used for the namespace, the collection name, or both"
+        " ('foo.*', '*.bar', '*.*').",
+    )
+    serve_parser.add_argument(
+        "--output-format",
+        default="simplified-rst",
+        choices=["ansible-docsite", "simplified-rst"],
+        help="What kind of output format to use. Pages ending in .html are converted"
+        " from RST with docutils, which does not support the Sphinx extensions"
+        " used by ansible-docsite. (default: %(default)s)",
+    )
+    serve_parser.add_argument(
+        "--bind",
+        default="127.0.0.1",
+        help="Address to listen on. (default: %(default)s)",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=8000,
+        help="Port to listen on. Use 0 to pick a free port. (default: %(default)s)",
+    )
+    serve_parser.add_argument(
+        "--watch",
+        dest="watch",
+        action=BooleanOptionalAction,
+        default=True,
+        help="Watch the collections for changes, and update the documentation of"
+        " changed plugins. (default: %(default)s)",
+    )
+    serve_parser.add_argument(
+        "--watch-interval",
+        dest="watch_interval",
+        type=float,
+        default=1.0,
+        help="Interval in seconds in which to look for changed files."
+        " (default: %(default)s)",
+    )
+    serve_parser.add_argument(
+        "--fast-docs-extraction",
+        dest="fast_docs_extraction",
+        action=BooleanOptionalAction,
+        default=True,
+        help="Extract the documentation of changed plugins directly from their files"
+        " instead of calling ansible-doc, if the result is guaranteed to be the same."
+        " (default: %(default)s)",
+    )
+
     # This must come after all parser setup
     if HAS_ARGCOMPLETE:
         argcomplete.autocomplete(parser)
@@ -13,6 +13,8 @@ import sys
 import textwrap
 import typing as t
 from collections.abc import Mapping, MutableMapping
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
 
 from antsibull_core.logging import get_module_logger
 from antsibull_core.schemas.collection_meta import (
@@ -24,36 +26,44 @@ from antsibull_core.venv import FakeVenvRunner, VenvRunner
 from packaging.version import Version as PypiVer
 
 from ... import app_context
-from ...augment_docs import augment_docs
+from ...augment_docs import augment_seealso
 from ...collection_links import load_collections_links
 from ...constants import DOCUMENTABLE_PLUGINS
 from ...docs_parsing import AnsibleCollectionMetadata
 from ...docs_parsing.parsing import get_ansible_plugin_info
 from ...docs_parsing.routing import (
+    CollectionRoutingT,
     find_stubs,
     load_all_collection_routing,
     remove_redirect_duplicates,
 )
 from ...env_variables import (
+    EnvironmentVariableInfo,
+    collect_environment_variables,
     collect_referable_envvars,
-    collect_referenced_environment_variables,
     load_ansible_config,
 )
 from ...extra_docs import CollectionExtraDocsInfoT, load_collections_extra_docs
 from ...jinja2 import FilenameGenerator, OutputFormat
 from ...process_docs import (
-    get_callback_plugin_contents,
-    get_collection_contents,
+    PluginCatalogue,
+    PluginErrorsRT,
+    deduplicate_plugin_info,
     get_collection_namespaces,
-    get_plugin_contents,
     normalize_all_plugin_info,
 )
 from ...schemas.app_context import (
     DEFAULT_COLLECTION_INSTALL_CMD,
     DEFAULT_COLLECTION_URL_TRANSFORM,
 )
+from ...schemas.collection_links import CollectionLinks
 from ...utils.collection_name_transformer import CollectionNameTransformer
-from ...write_docs import CollectionInfoT, _get_collection_dir
+from ...write_docs import (
+    BasicPluginInfo,
+    CollectionInfoT,
+    _get_collection_dir,
+    create_template_executor,
+)
 from ...write_docs.changelog import output_changelogs
 from ...write_docs.collections import (
     output_collection_indexes,
@@ -345,6 +355,261 @@ def _add_deprecation_info(
             metadata.removal_ansible_major_version = meta.removal.major_version
 
 
+@dataclass
+class CollectionsDocsData:
+    """
+    The loaded and normalized documentation of a set of collections, together with
+    all data derived from it that is needed to render the documentation.
+    """
+
+    #: Metadata of all collections, including the excluded ones.
+    full_collection_metadata: Mapping[str, AnsibleCollectionMetadata]
+    #: Metadata of the collections to document.
+    collection_metadata: dict[str, AnsibleCollectionMetadata]
+    collection_routing: CollectionRoutingT
+    stubs_info: Mapping[str, Mapping[str, Mapping[str, t.Any]]]
+    new_plugin_info: dict[str, MutableMapping[str, t.Any]]
+    nonfatal_errors: PluginErrorsRT
+    extra_docs_data: Mapping[str, CollectionExtraDocsInfoT]
+    link_data: Mapping[str, CollectionLinks]
+    collection_meta: CollectionsMetadata | None = None
+
+    # The following fields are computed by update_contents()
+    catalogue: PluginCatalogue = field(init=False)
+    plugin_contents: Mapping[str, Mapping[str, Mapping[str, BasicPluginInfo]]] = field(
+        init=False
+    )
+    callback_plugin_contents: Mapping[
+        str, Mapping[str, Mapping[str, BasicPluginInfo]]
+    ] = field(init=False)
+    collection_to_plugin_info: CollectionInfoT = field(init=False)
+    referenced_env_vars: Mapping[str, EnvironmentVariableInfo] = field(init=False)
+    referable_envvars: set[str] = field(init=False)
+    collection_namespaces: Mapping[str, list[str]] = field(init=False)
+
+    def __post_init__(self):
+        self.update_contents()
+
+    def update_contents(self) -> None:
+        """
+        Compute the data derived from the plugin information.
+
+        Needs to be called again when the plugin information has been modified.
+        """
+        flog = mlog.fields(func="CollectionsDocsData.update_contents")
+
+        catalogue = PluginCatalogue.create(self.new_plugin_info, self.nonfatal_errors)
+        self.catalogue = catalogue
+        self.plugin_contents = catalogue.plugin_contents
+        self.callback_plugin_contents = catalogue.callback_plugin_contents
+        collection_to_plugin_info = catalogue.collection_contents
+        # Make sure collections without documentable plugins are mentioned
+        for collection in self.collection_metadata:
+            collection_to_plugin_info[collection]  # pylint:disable=pointless-statement
+        self.collection_to_plugin_info = collection_to_plugin_info
+        flog.debug("Finished getting collection data")
+
+        # Handle environment variables
+        ansible_config = load_ansible_config(
+            self.full_collection_metadata["ansible.builtin"]
+        )
+        self.referenced_env_vars, core_env_vars = collect_environment_variables(
+            catalogue.get_env_vars(), ansible_config
+        )
+        self.referable_envvars = collect_referable_envvars(
+            self.referenced_env_vars, core_env_vars, self.collection_metadata
+        )
+
+        self.collection_namespaces = get_collection_namespaces(
+            self.collection_to_plugin_info.keys(), collection_meta=self.collection_meta
+        )
+
+
+def load_collections_docs_data(
+    venv: VenvRunner | FakeVenvRunner,
+    collection_dir: str | None,
+    *,
+    collection_names: list[str] | None = None,
+    exclude_collection_names: list[str] | None = None,
+    collection_meta: CollectionsMetadata | None = None,
+    ansible_version: PypiVer | None = None,
+) -> CollectionsDocsData:
+    """
+    Load and normalize the documentation of a set of installed collections.
+
+    See ``generate_docs_for_all_collections()`` for a description of the arguments.
+    """
+    flog = mlog.fields(func="load_collections_docs_data")
+
+    if collection_names is not None and all(
+        ab not in collection_names
+        for ab in ("ansible.builtin", "ansible.*", "*.builtin", "*.*")
+    ):
+        exclude_collection_names = ["ansible.builtin"]
+
+    # Get the info from the plugins
+    plugin_info, full_collection_metadata = asyncio.run(
+        get_ansible_plugin_info(venv, collection_dir, collection_names=collection_names)
+    )
+    flog.notice("Finished parsing info from plugins and collections")
+    # flog.fields(plugin_info=plugin_info).debug('Plugin data')
+    # flog.fields(
+    #     collection_metadata=full_collection_metadata).debug('Collection metadata')
+
+    _add_deprecation_info(full_collection_metadata, collection_meta, ansible_version)
+
+    collection_metadata = dict(full_collection_metadata)
+    _remove_collections(
+        plugin_info, collection_metadata, exclude_collection_names or []
+    )
+    if (
+        "ansible._protomatter" in collection_metadata
+        and collection_names is None
+        and not any(
+            any(
+                plugin_name.startswith("ansible._protomatter.")
+                for plugin_name in plugins
+            )
+            for plugins in plugin_info.values()
+        )
+    ):
+        _remove_collections(plugin_info, collection_metadata, ["ansible._protomatter"])
+
+    # Load collection routing information
+    collection_routing = asyncio.run(load_all_collection_routing(collection_metadata))
+    flog.notice("Finished loading collection routing information")
+    # flog.fields(collection_routing=collection_routing).debug('Collection routing infos')
+
+    remove_redirect_duplicates(plugin_info, collection_routing)
+    stubs_info = find_stubs(plugin_info, collection_routing)
+    _remove_collections_from_mapping(stubs_info, exclude_collection_names or [])
+    # flog.fields(stubs_info=stubs_info).debug('Stubs info')
+
+    new_plugin_info, nonfatal_errors = asyncio.run(
+        normalize_all_plugin_info(
+            plugin_info, collection_routing, release_plugin_info=True
+        )
+    )
+    flog.fields(errors=len(nonfatal_errors)).notice("Finished data validation")
+    augment_seealso(new_plugin_info)
+    deduplicate_plugin_info(new_plugin_info)
+    flog.notice("Finished calculating new data")
+
+    # Load collection extra docs data
+    extra_docs_data = asyncio.run(
+        load_collections_extra_docs(
+            {name: data.path for name, data in collection_metadata.items()}
+        )
+    )
+    flog.debug("Finished getting collection extra docs data")
+
+    # Load collection links data
+    link_data = asyncio.run(
+        load_collections_links(
+            {name: data.path for name, data in collection_metadata.items()}
+        )
+    )
+    flog.debug("Finished getting collection link data")
+
+    return CollectionsDocsData(
+        full_collection_metadata=full_collection_metadata,
+        collection_metadata=collection_metadata,
+        collection_routing=collection_routing,
+        stubs_info=stubs_info,
+        new_plugin_info=new_plugin_info,
+        nonfatal_errors=nonfatal_errors,
+        extra_docs_data=extra_docs_data,
+        link_data=link_data,
+        collection_meta=collection_meta,
+    )
+
+
+async def _output_plugins_and_indexes(
+    data: CollectionsDocsData,
+    output: TrackingOutput,
+    executor: Executor,
+    *,
+    collection_url: CollectionNameTransformer,
+    collection_install: CollectionNameTransformer,
+    output_format: OutputFormat,
+    filename_generator: FilenameGenerator,
+    create_indexes: bool,
+    create_env_vars: bool,
+    squash_hierarchy: bool,
+    use_html_blobs: bool,
+    for_official_docsite: bool,
+    add_version: bool,
+) -> None:
+    """
+    Write the plugin pages, and concurrently the plugin, callback plugin and deprecation
+    indexes and the environment variable page.
+
+    The indexes are rendered in the worker processes of ``executor``, while the plugin
+    pages are rendered in this process.
+    """
+    common_args: dict[str, t.Any] = {
+        "collection_url": collection_url,
+        "collection_install": collection_install,
+        "output_format": output_format,
+        "filename_generator": filename_generator,
+    }
+    writers = [
+        output_all_plugin_rst(
+            data.collection_to_plugin_info,
+            data.new_plugin_info,
+            data.nonfatal_errors,
+            output,
+            collection_metadata=data.collection_metadata,
+            link_data=data.link_data,
+            squash_hierarchy=squash_hierarchy,
+            use_html_blobs=use_html_blobs,
+            for_official_docsite=for_official_docsite,
+            referable_envvars=data.referable_envvars,
+            add_version=add_version,
+            **common_args,
+        )
+    ]
+    index_args: dict[str, t.Any] = {
+        **common_args,
+        "for_official_docsite": for_official_docsite,
+        "referable_envvars": data.referable_envvars,
+        "add_version": add_version,
+        "executor": executor,
+    }
+    if create_indexes:
+        writers.append(
+            output_plugin_indexes(
+                data.plugin_contents, data.collection_metadata, output, **index_args
+            )
+        )
+        writers.append(
+            output_callback_indexes(data.callback_plugin_contents, output, **index_args)
+        )
+        writers.append(
+            output_deprecation_index(
+                data.plugin_contents,
+                data.collection_metadata,
+                output,
+                deprecated_plugin_info=data.catalogue.get_deprecated_plugins(),
+                **index_args,
+            )
+        )
+    if create_env_vars:
+        writers.append(
+            output_environment_variables(
+                output,
+                data.referenced_env_vars,
+                output_format=output_format,
+                filename_generator=filename_generator,
+                squash_hierarchy=squash_hierarchy,
+                referable_envvars=data.referable_envvars,
+                add_version=add_version,
+                executor=executor,
+            )
+        )
+    await asyncio.gather(*writers)
+
+
 def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many-branches
     venv: VenvRunner | FakeVenvRunner,
     collection_dir: str | None,
@@ -420,87 +685,21 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
         ansible_version,
     )
 
-    if collection_names is not None and all(
-        ab not in collection_names
-        for ab in ("ansible.builtin", "ansible.*", "*.builtin", "*.*")
-    ):
-        exclude_collection_names = ["ansible.builtin"]
-
     app_ctx = app_context.app_ctx.get()
 
-    # Get the info from the plugins
-    plugin_info, full_collection_metadata = asyncio.run(
-        get_ansible_plugin_info(venv, collection_dir, collection_names=collection_names)
-    )
-    flog.notice("Finished parsing info from plugins and collections")
-    # flog.fields(plugin_info=plugin_info).debug('Plugin data')
-    # flog.fields(
-    #     collection_metadata=full_collection_metadata).debug('Collection metadata')
-
-    _add_deprecation_info(full_collection_metadata, collection_meta, ansible_version)
-
-    collection_metadata = dict(full_collection_metadata)
-    _remove_collections(
-        plugin_info, collection_metadata, exclude_collection_names or []
-    )
-    if (
-        "ansible._protomatter" in collection_metadata
-        and collection_names is None
-        and not any(
-            any(
-                plugin_name.startswith("ansible._protomatter.")
-                for plugin_name in plugins
-            )
-            for plugins in plugin_info.values()
-        )
-    ):
-        _remove_collections(plugin_info, collection_metadata, ["ansible._protomatter"])
-
-    # Load collection routing information
-    collection_routing = asyncio.run(load_all_collection_routing(collection_metadata))
-    flog.notice("Finished loading collection routing information")
-    # flog.fields(collection_routing=collection_routing).debug('Collection routing infos')
-
-    remove_redirect_duplicates(plugin_info, collection_routing)
-    stubs_info = find_stubs(plugin_info, collection_routing)
-    _remove_collections_from_mapping(stubs_info, exclude_collection_names or [])
-    # flog.fields(stubs_info=stubs_info).debug('Stubs info')
-
-    new_plugin_info, nonfatal_errors = asyncio.run(
-        normalize_all_plugin_info(plugin_info)
-    )
-    flog.fields(errors=len(nonfatal_errors)).notice("Finished data validation")
-    augment_docs(new_plugin_info, collection_routing)
-    flog.notice("Finished calculating new data")
-
-    # Load collection extra docs data
-    extra_docs_data = asyncio.run(
-        load_collections_extra_docs(
-            {name: data.path for name, data in collection_metadata.items()}
-        )
-    )
-    flog.debug("Finished getting collection extra docs data")
-
-    # Load collection links data
-    link_data = asyncio.run(
-        load_collections_links(
-            {name: data.path for name, data in collection_metadata.items()}
-        )
+    data = load_collections_docs_data(
+        venv,
+        collection_dir,
+        collection_names=collection_names,
+        exclude_collection_names=exclude_collection_names,
+        collection_meta=collection_meta,
+        ansible_version=ansible_version,
     )
-    flog.debug("Finished getting collection link data")
-
-    plugin_contents = get_plugin_contents(new_plugin_info, nonfatal_errors)
-    callback_plugin_contents = get_callback_plugin_contents(new_plugin_info)
-    collection_to_plugin_info = get_collection_contents(plugin_contents)
-    # Make sure collections without documentable plugins are mentioned
-    for collection in collection_metadata:
-        collection_to_plugin_info[collection]  # pylint:disable=pointless-statement
-    flog.debug("Finished getting collection data")
 
     # Fail on errors
-    if fail_on_error and nonfatal_errors:
+    if fail_on_error and data.nonfatal_errors:
         print("Found errors in some modules or plugins:")
-        for plugin_type, plugins in sorted(nonfatal_errors.items()):
+        for plugin_type, plugins in sorted(data.nonfatal_errors.items()):
             for plugin_name, errors in sorted(plugins.items()):
                 for error in errors:
                     print(
@@ -508,19 +707,6 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
                     )
         return 1
 
-    # Handle environment variables
-    ansible_config = load_ansible_config(full_collection_metadata["ansible.builtin"])
-    referenced_env_vars, core_env_vars = collect_referenced_environment_variables(
-        new_plugin_info, ansible_config
-    )
-    referable_envvars = collect_referable_envvars(
-        referenced_env_vars, core_env_vars, collection_metadata
-    )
-
-    collection_namespaces = get_collection_namespaces(
-        collection_to_plugin_info.keys(), collection_meta=collection_meta
-    )
-
     collection_url = CollectionNameTransformer(
         app_ctx.collection_url, DEFAULT_COLLECTION_URL_TRANSFORM
     )
@@ -533,15 +719,15 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
         include_collection_name_in_plugins=include_collection_name_in_plugins
     )
 
-    output = TrackingOutput(dest_dir)
+    output = TrackingOutput(dest_dir, copy_mode=app_ctx.copy_mode)
 
     # Only build top-level index if requested
     if create_indexes:
         asyncio.run(
             output_collection_index(
-                collection_to_plugin_info,
-                collection_namespaces,
-                collection_metadata,
+                data.collection_to_plugin_info,
+                data.collection_namespaces,
+                data.collection_metadata,
                 output,
                 collection_url=collection_url,
                 collection_install=collection_install,
@@ -549,15 +735,15 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
                 filename_generator=filename_generator,
                 breadcrumbs=breadcrumbs,
                 for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
+                referable_envvars=data.referable_envvars,
                 add_version=add_antsibull_docs_version,
             )
         )
         flog.notice("Finished writing collection index")
         asyncio.run(
             output_collection_namespace_indexes(
-                collection_namespaces,
-                collection_metadata,
+                data.collection_namespaces,
+                data.collection_metadata,
                 output,
                 collection_url=collection_url,
                 collection_install=collection_install,
@@ -565,75 +751,28 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
                 filename_generator=filename_generator,
                 breadcrumbs=breadcrumbs,
                 for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
+                referable_envvars=data.referable_envvars,
                 add_version=add_antsibull_docs_version,
             )
         )
         flog.notice("Finished writing collection namespace index")
-        asyncio.run(
-            output_plugin_indexes(
-                plugin_contents,
-                collection_metadata,
-                output,
-                collection_url=collection_url,
-                collection_install=collection_install,
-                output_format=output_format,
-                filename_generator=filename_generator,
-                for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
-                add_version=add_antsibull_docs_version,
-            )
-        )
-        output.register_pattern(
-            "collections", f"index_*{output_format.output_extension}"
-        )
-        flog.notice("Finished writing plugin indexes")
-        asyncio.run(
-            output_callback_indexes(
-                callback_plugin_contents,
-                output,
-                collection_url=collection_url,
-                collection_install=collection_install,
-                output_format=output_format,
-                filename_generator=filename_generator,
-                for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
-                add_version=add_antsibull_docs_version,
-            )
-        )
-        flog.notice("Finished writing callback plugin indexes")
-        asyncio.run(
-            output_deprecation_index(
-                plugin_contents,
-                collection_metadata,
-                output,
-                collection_url=collection_url,
-                collection_install=collection_install,
-                output_format=output_format,
-                filename_generator=filename_generator,
-                for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
-                add_version=add_antsibull_docs_version,
-            )
-        )
-        flog.notice("Finished writing deprecation index")
 
     if create_collection_indexes:
         asyncio.run(
             output_collection_indexes(
-                collection_to_plugin_info,
+                data.collection_to_plugin_info,
                 output,
                 collection_url=collection_url,
                 collection_install=collection_install,
-                collection_metadata=collection_metadata,
+                collection_metadata=data.collection_metadata,
                 squash_hierarchy=squash_hierarchy,
-                extra_docs_data=extra_docs_data,
-                link_data=link_data,
+                extra_docs_data=data.extra_docs_data,
+                link_data=data.link_data,
                 output_format=output_format,
                 filename_generator=filename_generator,
                 breadcrumbs=breadcrumbs,
                 for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
+                referable_envvars=data.referable_envvars,
                 add_version=add_antsibull_docs_version,
             )
         )
@@ -657,58 +796,71 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
 
         asyncio.run(
             output_changelogs(
-                collection_to_plugin_info,
+                data.collection_to_plugin_info,
                 output,
-                collection_metadata=collection_metadata,
+                collection_metadata=data.collection_metadata,
                 squash_hierarchy=squash_hierarchy,
                 output_format=output_format,
             )
         )
         flog.notice("Finished writing indexes")
 
-    if add_redirect_stubs:
+    # Plugin stubs and indexes are rendered in worker processes sharing one template
+    # environment per worker
+    with create_template_executor(
+        collection_url=collection_url,
+        collection_install=collection_install,
+        output_format=output_format,
+        filename_generator=filename_generator,
+        referable_envvars=data.referable_envvars,
+    ) as executor:
+        if add_redirect_stubs:
+            asyncio.run(
+                output_all_plugin_stub_rst(
+                    data.stubs_info,
+                    output,
+                    collection_url=collection_url,
+                    collection_install=collection_install,
+                    collection_metadata=data.collection_metadata,
+                    link_data=data.link_data,
+                    output_format=output_format,
+                    filename_generator=filename_generator,
+                    squash_hierarchy=squash_hierarchy,
+                    for_official_docsite=for_official_docsite,
+                    referable_envvars=data.referable_envvars,
+                    add_version=add_antsibull_docs_version,
+                    executor=executor,
+                )
+            )
+            flog.debug("Finished writing plugin stubs")
+
         asyncio.run(
-            output_all_plugin_stub_rst(
-                stubs_info,
+            _output_plugins_and_indexes(
+                data,
                 output,
+                executor,
                 collection_url=collection_url,
                 collection_install=collection_install,
-                collection_metadata=collection_metadata,
-                link_data=link_data,
                 output_format=output_format,
                 filename_generator=filename_generator,
+                create_indexes=create_indexes,
+                create_env_vars=output_format == OutputFormat.ANSIBLE_DOCSITE,
                 squash_hierarchy=squash_hierarchy,
+                use_html_blobs=use_html_blobs,
                 for_official_docsite=for_official_docsite,
-                referable_envvars=referable_envvars,
                 add_version=add_antsibull_docs_version,
             )
         )
-        flog.debug("Finished writing plugin stubs")
-
-    asyncio.run(
-        output_all_plugin_rst(
-            collection_to_plugin_info,
-            new_plugin_info,
-            nonfatal_errors,
-            output,
-            collection_url=collection_url,
-            collection_install=collection_install,
-            collection_metadata=collection_metadata,
-            link_data=link_data,
-            output_format=output_format,
-            filename_generator=filename_generator,
-            squash_hierarchy=squash_hierarchy,
-            use_html_blobs=use_html_blobs,
-            for_official_docsite=for_official_docsite,
-            referable_envvars=referable_envvars,
-            add_version=add_antsibull_docs_version,
+    if create_indexes:
+        output.register_pattern(
+            "collections", f"index_*{output_format.output_extension}"
         )
-    )
+        flog.notice("Finished writing plugin, callback plugin, and deprecation indexes")
     flog.debug("Finished writing plugin docs")
 
     _register_plugin_patterns(
         output,
-        collection_to_plugin_info,
+        data.collection_to_plugin_info,
         filename_generator=filename_generator,
         output_format=output_format,
         squash_hierarchy=squash_hierarchy,
@@ -717,26 +869,14 @@ def generate_docs_for_all_collections(  # noqa: C901  # pylint: disable=too-many
     if add_extra_docs:
         asyncio.run(
             output_extra_docs(
-                output, extra_docs_data, squash_hierarchy=squash_hierarchy
+                output, data.extra_docs_data, squash_hierarchy=squash_hierarchy
             )
         )
         flog.debug("Finished writing extra docs")
 
-        _register_extra_docs(output, extra_docs_data, squash_hierarchy=squash_hierarchy)
-
-    if output_format == OutputFormat.ANSIBLE_DOCSITE:
-        asyncio.run(
-            output_environment_variables(
-                output,
-                referenced_env_vars,
-                output_format=output_format,
-                filename_generator=filename_generator,
-                squash_hierarchy=squash_hierarchy,
-                referable_envvars=referable_envvars,
-                add_version=add_antsibull_docs_version,
-            )
+        _register_extra_docs(
+            output, data.extra_docs_data, squash_hierarchy=squash_hierarchy
         )
-        flog.debug("Finished writing environment variables")
 
     # Cleanup
     if cleanup != "no":
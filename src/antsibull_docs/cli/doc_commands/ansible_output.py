@@ -8,8 +8,12 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import contextlib
 import os
+import typing as t
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pydantic
@@ -25,7 +29,14 @@ from ...ansible_output.load import (
     get_environment,
     load_blocks_from_file,
 )
-from ...ansible_output.process import Replacement, compute_replacement
+from ...ansible_output.process import (
+    BlockTimings,
+    Replacement,
+    WorkspacePool,
+    compute_replacement,
+    create_replacement_cache,
+    load_block_timings,
+)
 from ...ansible_output.replace import (
     apply_replacements,
     colorize,
@@ -39,6 +50,8 @@ from ...utils.collection_copier import CollectionCopier
 
 mlog = get_module_logger(__name__)
 
+_T = t.TypeVar("_T")
+
 
 def find_blocks_in_file(
     path: Path,
@@ -52,6 +65,7 @@ def find_blocks_in_file(
     Process RST file.
 
     Note that this function must not be used in multiple threads at the same time!
+    It is safe to use it in multiple processes at the same time.
     """
     data = load_blocks_from_file(
         path, root=root, errors=errors, environment=environment
@@ -60,27 +74,36 @@ def find_blocks_in_file(
         blocks.extend(data.blocks)
 
 
-def find_blocks_in_directory(
+def _find_blocks_in_worker(
+    path: Path, root: Path | None, environment: Environment
+) -> tuple[list[Error], list[Block]]:
+    errors: list[Error] = []
+    blocks: list[Block] = []
+    find_blocks_in_file(
+        path, root=root, errors=errors, blocks=blocks, environment=environment
+    )
+    return errors, blocks
+
+
+def find_files_in_directory(
     path: Path,
     *,
     errors: list[Error],
-    blocks: list[Block],
-    environment: Environment,
+    files: list[tuple[Path, Path | None]],
 ) -> None:
-    flog = mlog.fields(func="find_blocks_in_directory")
+    """
+    Find all RST files in a directory tree, and add them together with the tree's root
+    to ``files``. The files are added in a stable (sorted) order.
+    """
+    flog = mlog.fields(func="find_files_in_directory")
     flog.notice("Walking {}", path)
     try:
-        for dirpath, _, filenames in path.walk():
+        for dirpath, dirnames, filenames in os.walk(path):
             flog.notice("Processing {}: found {}", dirpath, filenames)
-            for filename in filenames:
+            dirnames.sort()
+            for filename in sorted(filenames):
                 if filename.endswith(".rst"):
-                    find_blocks_in_file(
-                        dirpath / filename,
-                        root=path,
-                        errors=errors,
-                        blocks=blocks,
-                        environment=environment,
-                    )
+                    files.append((Path(dirpath) / filename, path))
     except Exception as exc:  # pylint: disable=broad-exception-caught
         errors.append(Error(path, None, None, f"Error while listing files: {exc}"))
 
@@ -90,26 +113,40 @@ def find_blocks(
     *,
     environment: Environment,
 ) -> tuple[list[Error], list[Block]]:
+    lib_ctx = app_context.lib_ctx.get()
     errors: list[Error] = []
     blocks: list[Block] = []
+    files: list[tuple[Path, Path | None]] = []
     for path in paths:
         path_obj = Path(path)
         if path_obj.is_dir():
-            find_blocks_in_directory(
-                path_obj,
-                errors=errors,
-                blocks=blocks,
-                environment=environment,
-            )
+            find_files_in_directory(path_obj, errors=errors, files=files)
         elif path_obj.exists():
-            find_blocks_in_file(
-                path_obj,
-                errors=errors,
-                blocks=blocks,
-                environment=environment,
-            )
+            files.append((path_obj, None))
         else:
             errors.append(Error(path_obj, None, None, "Does not exist"))
+
+    # Parsing RST uses global docutils state and is CPU bound, so do it in subprocesses
+    # if there is more than one file
+    if len(files) > 1:
+        with ProcessPoolExecutor(max_workers=lib_ctx.process_max) as executor:
+            results = list(
+                executor.map(
+                    _find_blocks_in_worker,
+                    [path for path, _ in files],
+                    [root for _, root in files],
+                    [environment] * len(files),
+                )
+            )
+    else:
+        results = [
+            _find_blocks_in_worker(path, root, environment) for path, root in files
+        ]
+
+    # Collect results in the order of the files
+    for file_errors, file_blocks in results:
+        errors.extend(file_errors)
+        blocks.extend(file_blocks)
     return errors, blocks
 
 
@@ -148,13 +185,6 @@ def print_errors(
                     print()
 
 
-async def _compute_replacement(
-    block: Block, *, semaphore: asyncio.Semaphore
-) -> Replacement | Error | None:
-    async with semaphore:
-        return await compute_replacement(block)
-
-
 def _get_parallelism() -> int:
     lib_ctx = app_context.lib_ctx.get()
     if lib_ctx.process_max is not None and lib_ctx.process_max > 0:
@@ -171,8 +201,69 @@ def _get_parallelism() -> int:
     return 1
 
 
+def _get_weight(block: Block, parallelism: int) -> int:
+    if block.data.exclusive:
+        return parallelism
+    return min(block.data.weight or 1, parallelism)
+
+
+def _sort_blocks(blocks: list[Block], *, timings: BlockTimings) -> list[int]:
+    """
+    Return the indices of the blocks in the order they should be started in.
+
+    Blocks without a recorded duration come first, followed by the others ordered by
+    their last duration, longest first.
+    """
+
+    def get_key(index: int) -> tuple[bool, float]:
+        duration = timings.get_expected_duration(blocks[index])
+        return duration is not None, -(duration or 0.0)
+
+    return sorted(range(len(blocks)), key=get_key)
+
+
+async def _schedule(
+    blocks: list[Block],
+    *,
+    parallelism: int,
+    timings: BlockTimings,
+    run: t.Callable[[Block], t.Awaitable[_T]],
+) -> list[_T]:
+    """
+    Run ``run()`` for all blocks, while the sum of the weights of the blocks being
+    processed is at most ``parallelism``.
+
+    Blocks are started strictly in the order determined by ``_sort_blocks()``, so that
+    blocks with a large weight are not starved by blocks with a smaller weight.
+    The results are returned in the order of ``blocks``.
+    """
+    results: dict[int, _T] = {}
+    pending = collections.deque(_sort_blocks(blocks, timings=timings))
+    running: dict[asyncio.Future[_T], tuple[int, int]] = {}
+    available = parallelism
+    while pending or running:
+        while pending and _get_weight(blocks[pending[0]], parallelism) <= available:
+            index = pending.popleft()
+            weight = _get_weight(blocks[index], parallelism)
+            available -= weight
+            running[asyncio.ensure_future(run(blocks[index]))] = (index, weight)
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for future in done:
+            index, weight = running.pop(future)
+            available += weight
+            results[index] = future.result()
+    return [results[index] for index in range(len(blocks))]
+
+
 async def _compute_replacements(
-    blocks: list[Block], *, errors: list[Error]
+    blocks: list[Block],
+    *,
+    errors: list[Error],
+    environment: Environment,
+    timings: BlockTimings,
+    force: bool = False,
+    reuse_workspaces: bool = False,
+    path_replacements: dict[str, str] | None = None,
 ) -> list[Replacement]:
     flog = mlog.fields(func="_compute_replacements")
     flog.notice("Processing {} blocks", len(blocks))
@@ -180,9 +271,23 @@ async def _compute_replacements(
     parallelism = _get_parallelism()
     flog.notice("Limiting to {} parallel subprocesses", parallelism)
 
-    semaphore = asyncio.Semaphore(parallelism)
-    computers = [_compute_replacement(block, semaphore=semaphore) for block in blocks]
-    computed_results = await asyncio.gather(*computers)
+    cache = None
+    if blocks:
+        cache = await create_replacement_cache(
+            environment, path_replacements=path_replacements, force=force
+        )
+
+    with contextlib.ExitStack() as stack:
+        workspaces = stack.enter_context(WorkspacePool()) if reuse_workspaces else None
+        computed_results = await _schedule(
+            blocks,
+            parallelism=parallelism,
+            timings=timings,
+            run=lambda block: compute_replacement(
+                block, cache=cache, timings=timings, workspaces=workspaces
+            ),
+        )
+    timings.save()
 
     result = []
     for replacement in computed_results:
@@ -195,16 +300,54 @@ async def _compute_replacements(
     return result
 
 
+def print_timings(
+    blocks: list[Block],
+    *,
+    timings: BlockTimings,
+    color: bool,
+) -> None:
+    print()
+    print(colorize("Timings:", color_code="bold", color=color))
+    durations = [
+        (timings.durations.get(block.id), block)
+        for block in blocks
+        if block.id in timings.durations
+    ]
+    durations.sort(key=lambda entry: -(entry[0] or 0.0))
+    for duration, block in durations:
+        print(f"{duration:8.2f}s {block.path}:{block.data_line or '-'}")
+    cached = len(blocks) - len(durations)
+    if cached:
+        print(f"{cached} code block{'' if cached == 1 else 's'} not run")
+
+
 def _run_ansible_output(
     *,
     paths: tuple[str, ...],
     environment: Environment,
     check: bool,
     force_color: bool | None,
+    force: bool = False,
+    print_block_timings: bool = False,
+    reuse_workspaces: bool = False,
+    path_replacements: dict[str, str] | None = None,
 ) -> int:
     color = detect_color(force=force_color)
     errors, blocks = find_blocks(paths, environment=environment)
-    replacements = asyncio.run(_compute_replacements(blocks, errors=errors))
+    timings = load_block_timings()
+    replacements = asyncio.run(
+        _compute_replacements(
+            blocks,
+            errors=errors,
+            environment=environment,
+            timings=timings,
+            force=force,
+            reuse_workspaces=reuse_workspaces,
+            path_replacements=path_replacements,
+        )
+    )
+    if print_block_timings:
+        print_timings(blocks, timings=timings, color=color)
     if check:
         errors.extend(
             convert_replacements_to_errors(replacements=replacements, color=color)
@@ -245,6 +388,9 @@ def run_ansible_output() -> int:
     check: bool = app_ctx.extra["check"]
     force_color: bool | None = app_ctx.extra["force_color"]
     config: str | None = app_ctx.extra["config"]
+    force: bool = app_ctx.extra["force"]
+    print_block_timings: bool = app_ctx.extra["timings"]
+    reuse_workspaces: bool = app_ctx.extra["reuse_workspaces"]
 
     if paths:
         try:
@@ -257,6 +403,9 @@ def run_ansible_output() -> int:
             environment=environment,
             check=check,
             force_color=force_color,
+            force=force,
+            print_block_timings=print_block_timings,
+            reuse_workspaces=reuse_workspaces,
         )
 
     if config is not None:
@@ -293,9 +442,15 @@ def run_ansible_output() -> int:
         rst_dir = "docs/docsite/rst"
         if os.path.exists(rst_dir):
             paths = (rst_dir,)
+        # The copy of the collection is in a new temporary directory for every run;
+        # its content is part of the result cache's key through ANSIBLE_COLLECTIONS_PATH
         return _run_ansible_output(
             paths=paths,
             environment=environment,
             check=check,
             force_color=force_color,
+            force=force,
+            print_block_timings=print_block_timings,
+            reuse_workspaces=reuse_workspaces,
+            path_replacements={copier.dir: "<collection copy>"},
         )
@@ -9,18 +9,24 @@ from __future__ import annotations
 
 import json
 import os
+import shutil
+import sys
 import textwrap
 import typing as t
+from collections import defaultdict
+from collections.abc import Mapping, MutableMapping
 
 from antsibull_core.logging import get_module_logger
 
 from ... import app_context
 from ...collection_config import lint_collection_config
 from ...collection_links import lint_collection_links
+from ...docs_parsing import AnsibleCollectionMetadata
 from ...jinja2.environment import OutputFormat
 from ...lint_collection_names import CollectionNameLinter
 from ...lint_extra_docs import lint_collection_extra_docs_files
 from ...lint_plugin_docs import lint_plugin_docs
+from ...process_docs import PluginErrorsRT
 from ...schemas.app_context import (
     DEFAULT_COLLECTION_INSTALL_CMD,
     DEFAULT_COLLECTION_URL_TRANSFORM,
@@ -31,9 +37,14 @@ from ...utils.collection_copier import (
 )
 from ...utils.collection_name_transformer import CollectionNameTransformer
 from ...utils.collection_names import (
+    NameCollection,
     ValidCollectionRefs,
     collect_names,
+    find_changed_plugins,
+    update_collection_names,
 )
+from ...utils.file_watcher import FileWatcher, is_ignored_in_collection
+from ...write_docs import BasicPluginInfo
 
 mlog = get_module_logger(__name__)
 
@@ -97,123 +108,337 @@ def normalize_and_sort_messages(
     )
 
 
-def lint_collection_docs() -> int:
-    """
-    Lint collection documentation for inclusion into the collection's docsite.
-
-    :returns: A return code for the program.  See :func:`antsibull.cli.antsibull_docs.main` for
-        details on what each code means.
-    """
-    flog = mlog.fields(func="lint_collection_docs")
-    flog.notice("Begin collection docs linting")
+_ErrorsT = list[
+    tuple[str, t.Optional[int], t.Optional[t.Union[int, tuple[int, int]]], str]
+]
 
-    app_ctx = app_context.app_ctx.get()
 
-    message_format: MessageFormat = app_ctx.extra["message_format"]
+def _sync_file(source: str, destination: str) -> None:
+    if os.path.exists(source):
+        if os.path.exists(destination) and os.path.samefile(source, destination):
+            return
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if os.path.lexists(destination):
+            os.unlink(destination)
+        shutil.copy2(source, destination)
+    elif os.path.lexists(destination) and not os.path.isdir(destination):
+        os.unlink(destination)
 
-    collection_root: str = app_ctx.extra["collection_root_path"]
-    plugin_docs: bool = app_ctx.extra["plugin_docs"]
-    validate_collections_refs: ValidCollectionRefs = app_ctx.extra[
-        "validate_collections_refs"
-    ]
-    validate_refs_in_extra_docs: bool = app_ctx.extra["check_extra_docs_refs"]
-    disallow_unknown_collection_refs: bool = app_ctx.extra[
-        "disallow_unknown_collection_refs"
-    ]
-    skip_rstcheck: bool = app_ctx.extra["skip_rstcheck"]
-    disallow_semantic_markup: bool = app_ctx.extra["disallow_semantic_markup"]
-    output_format = OutputFormat.parse(app_ctx.extra["output_format"])
 
-    flog.notice("Linting docs config file")
-    errors = lint_collection_config(collection_root)
+class _CollectionDocsLinter:
+    """
+    Lint the documentation of a collection.
 
-    flog.notice("Linting collection links")
-    errors.extend(lint_collection_links(collection_root))
+    Keeps all data needed to lint the collection again after some of its files changed.
+    """
 
-    if validate_refs_in_extra_docs or plugin_docs:
-        collection_url = CollectionNameTransformer(
+    def __init__(
+        self,
+        *,
+        collection_root: str,
+        plugin_docs: bool,
+        validate_collections_refs: ValidCollectionRefs,
+        validate_refs_in_extra_docs: bool,
+        disallow_unknown_collection_refs: bool,
+        skip_rstcheck: bool,
+        disallow_semantic_markup: bool,
+        output_format: OutputFormat,
+        fast_docs_extraction: bool = False,
+    ):
+        app_ctx = app_context.app_ctx.get()
+        self.collection_root = collection_root
+        self.plugin_docs = plugin_docs
+        self.validate_collections_refs = validate_collections_refs
+        self.validate_refs_in_extra_docs = validate_refs_in_extra_docs
+        self.disallow_unknown_collection_refs = disallow_unknown_collection_refs
+        self.skip_rstcheck = skip_rstcheck
+        self.disallow_semantic_markup = disallow_semantic_markup
+        self.output_format = output_format
+        self.fast_docs_extraction = fast_docs_extraction
+        self.collection_url = CollectionNameTransformer(
             app_ctx.collection_url, DEFAULT_COLLECTION_URL_TRANSFORM
         )
-        collection_install = CollectionNameTransformer(
+        self.collection_install = CollectionNameTransformer(
             app_ctx.collection_install,
             DEFAULT_COLLECTION_INSTALL_CMD,
         )
-        try:
-            flog.notice("Loading collection information")
-            with load_collection_infos(
-                path_to_collection=collection_root,
-                copy_dependencies=validate_collections_refs != "all",
-            ) as (
-                collection_name,
-                collections_dir,
-                dependencies,
-                load_errors,
-            ):
-                for error in load_errors:
-                    errors.append((error.path, None, None, error.error))
+        self.config_errors: _ErrorsT = []
+        self.links_errors: _ErrorsT = []
+        self.load_errors: _ErrorsT = []
+        self.plugin_errors: _ErrorsT = []
+        self.extra_docs_errors: _ErrorsT = []
+        # Set by load_names()
+        self.collection_name: str | None = None
+        self.collections_dir: str | None = None
+        self.dependencies: list[str] = []
+        self.name_collection: NameCollection | None = None
+        self.new_plugin_info: MutableMapping[str, MutableMapping[str, t.Any]] = {}
+        self.nonfatal_errors: PluginErrorsRT = defaultdict(lambda: defaultdict(list))
+        self.collection_to_plugin_info: Mapping[
+            str, dict[str, Mapping[str, BasicPluginInfo]]
+        ] = {}
+        self.collection_metadata: Mapping[str, AnsibleCollectionMetadata] = {}
+
+    @property
+    def needs_names(self) -> bool:
+        return self.validate_refs_in_extra_docs or self.plugin_docs
+
+    def get_errors(self) -> _ErrorsT:
+        return [
+            *self.config_errors,
+            *self.links_errors,
+            *self.load_errors,
+            *self.plugin_errors,
+            *self.extra_docs_errors,
+        ]
+
+    def lint_config(self) -> None:
+        self.config_errors = lint_collection_config(self.collection_root)
+
+    def lint_links(self) -> None:
+        self.links_errors = lint_collection_links(self.collection_root)
+
+    def load_names(self) -> None:
+        assert self.collection_name is not None
+        (
+            self.name_collection,
+            self.new_plugin_info,
+            self.nonfatal_errors,
+            self.collection_to_plugin_info,
+            self.collection_metadata,
+        ) = collect_names(
+            collection_name=self.collection_name,
+            collections_dir=self.collections_dir,
+            dependencies=self.dependencies,
+            validate_collections_refs=self.validate_collections_refs,
+        )
+
+    def update_names(self, changed_plugins: set[tuple[str, str]] | None) -> None:
+        assert self.collection_name is not None
+        assert self.name_collection is not None
+        self.collection_to_plugin_info = update_collection_names(
+            name_collection=self.name_collection,
+            new_plugin_info=self.new_plugin_info,
+            nonfatal_errors=self.nonfatal_errors,
+            collection_metadata=self.collection_metadata,
+            collection_name=self.collection_name,
+            collections_dir=self.collections_dir,
+            changed_plugins=changed_plugins,
+            fast_extraction=self.fast_docs_extraction,
+        )
+
+    def lint_plugin_docs(self) -> None:
+        assert self.collection_name is not None
+        assert self.name_collection is not None
+        self.plugin_errors = lint_plugin_docs(
+            name_collection=self.name_collection,
+            new_plugin_info=self.new_plugin_info,
+            nonfatal_errors=self.nonfatal_errors,
+            collection_to_plugin_info=self.collection_to_plugin_info,
+            collection_metadata=self.collection_metadata,
+            collection_name=self.collection_name,
+            original_path_to_collection=self.collection_root,
+            collection_url=self.collection_url,
+            collection_install=self.collection_install,
+            validate_collections_refs=self.validate_collections_refs,
+            disallow_unknown_collection_refs=self.disallow_unknown_collection_refs,
+            skip_rstcheck=self.skip_rstcheck,
+            disallow_semantic_markup=self.disallow_semantic_markup,
+            output_format=self.output_format,
+        )
+
+    def lint_extra_docs(self) -> None:
+        if not self.needs_names:
+            self.extra_docs_errors = lint_collection_extra_docs_files(
+                self.collection_root
+            )
+            return
+        assert self.collection_name is not None
+        names_linter = None
+        if self.validate_refs_in_extra_docs:
+            assert self.name_collection is not None
+            names_linter = CollectionNameLinter(
+                collection_name=self.collection_name,
+                name_collection=self.name_collection,
+                validate_collections_refs=self.validate_collections_refs,
+                disallow_unknown_collection_refs=self.disallow_unknown_collection_refs,
+            )
+        self.extra_docs_errors = lint_collection_extra_docs_files(
+            self.collection_root,
+            collection_name=self.collection_name,
+            names_linter=names_linter,
+        )
+
+    def _find_changed_plugins(
+        self, changed_files: set[str]
+    ) -> set[tuple[str, str]] | None:
+        assert self.collection_name is not None
+        return find_changed_plugins(
+            changed_files,
+            collection_name=self.collection_name,
+            new_plugin_info=self.new_plugin_info,
+            collection_to_plugin_info=self.collection_to_plugin_info,
+            collection_metadata=self.collection_metadata,
+        )
 
+    def _sync_files(self, changed_files: set[str]) -> None:
+        assert self.collection_name is not None
+        copy_path = self.collection_metadata[self.collection_name].path
+        if os.path.realpath(copy_path) == os.path.realpath(self.collection_root):
+            return
+        for path in changed_files:
+            _sync_file(
+                os.path.join(self.collection_root, path),
+                os.path.join(copy_path, path),
+            )
+
+    def update(self, changed_files: set[str]) -> None:
+        """
+        Lint everything again that is affected by the changed files.
+        """
+        flog = mlog.fields(func="_CollectionDocsLinter.update")
+        if "docs/docsite/config.yml" in changed_files:
+            self.lint_config()
+        if "docs/docsite/links.yml" in changed_files:
+            self.lint_links()
+
+        relint_plugins = "docs/docsite/links.yml" in changed_files
+        relint_extra_docs = any(
+            path.startswith("docs/docsite/") for path in changed_files
+        )
+        if self.needs_names:
+            self._sync_files(changed_files)
+            metadata_files = {"galaxy.yml", "MANIFEST.json", "meta/runtime.yml"}
+            plugin_files = {
+                path
+                for path in changed_files
+                if path.startswith(("plugins/", "roles/"))
+            }
+            if metadata_files & changed_files:
                 flog.notice("Collecting names of collection objects")
-                (
-                    name_collection,
-                    new_plugin_info,
-                    nonfatal_errors,
-                    collection_to_plugin_info,
-                    collection_metadata,
-                ) = collect_names(
-                    collection_name=collection_name,
-                    collections_dir=collections_dir,
-                    dependencies=dependencies,
-                    validate_collections_refs=validate_collections_refs,
+                self.load_names()
+            elif plugin_files:
+                flog.notice("Updating names of collection objects")
+                self.update_names(self._find_changed_plugins(plugin_files))
+            if metadata_files & changed_files or plugin_files:
+                relint_plugins = True
+                relint_extra_docs = (
+                    relint_extra_docs or self.validate_refs_in_extra_docs
                 )
 
-                if plugin_docs:
-                    flog.notice("Linting plugin docs")
-                    lint_errors = lint_plugin_docs(
-                        name_collection=name_collection,
-                        new_plugin_info=new_plugin_info,
-                        nonfatal_errors=nonfatal_errors,
-                        collection_to_plugin_info=collection_to_plugin_info,
-                        collection_metadata=collection_metadata,
-                        collection_name=collection_name,
-                        original_path_to_collection=collection_root,
-                        collection_url=collection_url,
-                        collection_install=collection_install,
-                        validate_collections_refs=validate_collections_refs,
-                        disallow_unknown_collection_refs=disallow_unknown_collection_refs,
-                        skip_rstcheck=skip_rstcheck,
-                        disallow_semantic_markup=disallow_semantic_markup,
-                        output_format=output_format,
-                    )
-                    errors.extend(lint_errors)
-
-                flog.notice("Linting extra docs files")
-                names_linter = None
-                if validate_refs_in_extra_docs:
-                    names_linter = CollectionNameLinter(
-                        collection_name=collection_name,
-                        name_collection=name_collection,
-                        validate_collections_refs=validate_collections_refs,
-                        disallow_unknown_collection_refs=disallow_unknown_collection_refs,
-                    )
-                errors.extend(
-                    lint_collection_extra_docs_files(
-                        collection_root,
-                        collection_name=collection_name,
-                        names_linter=names_linter,
-                    )
-                )
+        if relint_plugins and self.plugin_docs:
+            flog.notice("Linting plugin docs")
+            self.lint_plugin_docs()
+        if relint_extra_docs:
+            flog.notice("Linting extra docs files")
+            self.lint_extra_docs()
 
-        except CollectionLoadError as exc:
-            errors.append((exc.path, None, None, exc.error))
-    else:
-        flog.notice("Linting extra docs files")
-        errors.extend(lint_collection_extra_docs_files(collection_root))
 
-    messages = normalize_and_sort_messages(errors)
+def _print_results(linter: _CollectionDocsLinter, message_format: MessageFormat) -> int:
+    messages = normalize_and_sort_messages(linter.get_errors())
     print_messages(messages, message_format)
     return 3 if messages else 0
 
 
+def _watch_collection_docs(
+    linter: _CollectionDocsLinter,
+    message_format: MessageFormat,
+    interval: float,
+) -> int:
+    flog = mlog.fields(func="_watch_collection_docs")
+    rc = _print_results(linter, message_format)
+    watcher = FileWatcher(linter.collection_root, ignore=is_ignored_in_collection)
+    try:
+        while True:
+            flog.notice("Waiting for changes")
+            sys.stdout.flush()
+            changed_files = watcher.wait_for_changes(interval)
+            flog.notice(f"Changed files: {', '.join(sorted(changed_files))}")
+            linter.update(changed_files)
+            rc = _print_results(linter, message_format)
+    except KeyboardInterrupt:
+        return rc
+
+
+def lint_collection_docs() -> int:
+    """
+    Lint collection documentation for inclusion into the collection's docsite.
+
+    :returns: A return code for the program.  See :func:`antsibull.cli.antsibull_docs.main` for
+        details on what each code means.
+    """
+    flog = mlog.fields(func="lint_collection_docs")
+    flog.notice("Begin collection docs linting")
+
+    app_ctx = app_context.app_ctx.get()
+
+    message_format: MessageFormat = app_ctx.extra["message_format"]
+    link_collections: bool = app_ctx.extra["link_collections"]
+    watch: bool = app_ctx.extra["watch"]
+    watch_interval: float = app_ctx.extra["watch_interval"]
+
+    linter = _CollectionDocsLinter(
+        collection_root=app_ctx.extra["collection_root_path"],
+        plugin_docs=app_ctx.extra["plugin_docs"],
+        validate_collections_refs=app_ctx.extra["validate_collections_refs"],
+        validate_refs_in_extra_docs=app_ctx.extra["check_extra_docs_refs"],
+        disallow_unknown_collection_refs=app_ctx.extra[
+            "disallow_unknown_collection_refs"
+        ],
+        skip_rstcheck=app_ctx.extra["skip_rstcheck"],
+        disallow_semantic_markup=app_ctx.extra["disallow_semantic_markup"],
+        output_format=OutputFormat.parse(app_ctx.extra["output_format"]),
+        fast_docs_extraction=app_ctx.extra["fast_docs_extraction"],
+    )
+
+    flog.notice("Linting docs config file")
+    linter.lint_config()
+
+    flog.notice("Linting collection links")
+    linter.lint_links()
+
+    if not linter.needs_names:
+        flog.notice("Linting extra docs files")
+        linter.lint_extra_docs()
+        if watch:
+            return _watch_collection_docs(linter, message_format, watch_interval)
+        return _print_results(linter, message_format)
+
+    try:
+        flog.notice("Loading collection information")
+        with load_collection_infos(
+            path_to_collection=linter.collection_root,
+            copy_dependencies=linter.validate_collections_refs != "all",
+            link_collections=link_collections,
+        ) as (
+            linter.collection_name,
+            linter.collections_dir,
+            linter.dependencies,
+            load_errors,
+        ):
+            linter.load_errors = [
+                (error.path, None, None, error.error) for error in load_errors
+            ]
+
+            flog.notice("Collecting names of collection objects")
+            linter.load_names()
+
+            if linter.plugin_docs:
+                flog.notice("Linting plugin docs")
+                linter.lint_plugin_docs()
+
+            flog.notice("Linting extra docs files")
+            linter.lint_extra_docs()
+
+            if watch:
+                return _watch_collection_docs(linter, message_format, watch_interval)
+
+    except CollectionLoadError as exc:
+        linter.load_errors.append((exc.path, None, None, exc.error))
+
+    return _print_results(linter, message_format)
+
+
 def lint_core_docs() -> int:
     """
     Lint collection documentation for inclusion into the collection's docsite.
@@ -0,0 +1,515 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""Serve the documentation of collections over HTTP for previewing."""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import html
+import re
+import threading
+import typing as t
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from antsibull_core.logging import get_module_logger
+from antsibull_core.venv import FakeVenvRunner
+from docutils.core import publish_string
+from docutils.writers.html5_polyglot import Writer as HTMLWriter
+
+from ... import app_context
+from ...collection_links import load_collections_links
+from ...extra_docs import load_collections_extra_docs
+from ...jinja2 import FilenameGenerator, OutputFormat
+from ...jinja2.environment import doc_environment, get_template_filename
+from ...schemas.app_context import (
+    DEFAULT_COLLECTION_INSTALL_CMD,
+    DEFAULT_COLLECTION_URL_TRANSFORM,
+)
+from ...utils.collection_name_transformer import CollectionNameTransformer
+from ...utils.collection_names import (
+    find_changed_plugins,
+    reload_collection_plugin_info,
+)
+from ...utils.file_watcher import FileWatcher, is_ignored_in_collection
+from ...write_docs.changelog import output_changelogs
+from ...write_docs.collections import output_collection_indexes, output_extra_docs
+from ...write_docs.hierarchy import (
+    output_collection_index,
+    output_collection_namespace_indexes,
+)
+from ...write_docs.indexes import (
+    output_callback_indexes,
+    output_deprecation_index,
+    output_environment_variables,
+    output_plugin_indexes,
+)
+from ...write_docs.io import MemoryOutput
+from ...write_docs.plugin_stubs import output_all_plugin_stub_rst
+from ...write_docs.plugins import create_plugin_rst
+from ._build import CollectionsDocsData, load_collections_docs_data
+
+mlog = get_module_logger(__name__)
+
+
+_METADATA_FILES = frozenset(["galaxy.yml", "MANIFEST.json", "meta/runtime.yml"])
+
+# Collections that are never watched for changes
+_UNWATCHED_COLLECTIONS = frozenset(["ansible.builtin", "ansible._protomatter"])
+
+_RST_LINK_RE = re.compile(r'href="(?![a-zA-Z][a-zA-Z0-9+.-]*:)([^"#]*)\.rst(#[^"]*)?"')
+
+
+def rst_to_html(content: str) -> str:
+    """
+    Convert a RST page to a simplified HTML page with plain docutils.
+
+    Sphinx-specific roles and directives are not supported by docutils. Problems are not
+    reported, but the affected markup is shown as-is or dropped.
+    """
+    result = publish_string(
+        content,
+        writer=HTMLWriter(),
+        settings_overrides={
+            "report_level": 5,
+            "halt_level": 5,
+            "output_encoding": "unicode",
+            "embed_stylesheet": False,
+        },
+    )
+    return _RST_LINK_RE.sub(r'href="\1.html\2"', t.cast(str, result))
+
+
+class _DocsServer:
+    """
+    Keep the documentation of collections in memory, and render pages on demand.
+
+    Plugin and role pages are rendered individually when requested. All other pages
+    (indexes, changelogs, redirect stubs, ...) are rendered together when the first of
+    them is requested. Rendered pages are cached until the documentation changes.
+    """
+
+    def __init__(
+        self,
+        load: t.Callable[[], CollectionsDocsData],
+        *,
+        output_format: OutputFormat,
+        use_html_blobs: bool = False,
+        fast_extraction: bool = True,
+        add_version: bool = True,
+    ):
+        app_ctx = app_context.app_ctx.get()
+        self._load = load
+        self.output_format = output_format
+        self.use_html_blobs = use_html_blobs
+        self.fast_extraction = fast_extraction
+        self.add_version = add_version
+        self.collection_url = CollectionNameTransformer(
+            app_ctx.collection_url, DEFAULT_COLLECTION_URL_TRANSFORM
+        )
+        self.collection_install = CollectionNameTransformer(
+            app_ctx.collection_install, DEFAULT_COLLECTION_INSTALL_CMD
+        )
+        self.filename_generator = FilenameGenerator()
+        self.lock = threading.RLock()
+        self._pages: dict[str, str] = {}
+        self._plugin_pages: dict[str, tuple[str, str, str]] = {}
+        self._other_pages: MemoryOutput | None = None
+        self.data = load()
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Forget all rendered pages. Needs to be called whenever ``data`` changes.
+        """
+        env = doc_environment(
+            collection_url=self.collection_url,
+            collection_install=self.collection_install,
+            referable_envvars=self.data.referable_envvars,
+            output_format=self.output_format,
+            filename_generator=self.filename_generator,
+        )
+        self._plugin_tmpl = env.get_template(
+            get_template_filename("plugin", self.output_format)
+        )
+        self._role_tmpl = env.get_template(
+            get_template_filename("role", self.output_format)
+        )
+        self._error_tmpl = env.get_template(
+            get_template_filename("plugin-error", self.output_format)
+        )
+        self._pages.clear()
+        self._other_pages = None
+        self._plugin_pages.clear()
+        for (
+            collection_name,
+            plugins_by_type,
+        ) in self.data.collection_to_plugin_info.items():
+            namespace, collection = collection_name.split(".", 1)
+            for plugin_type, plugins in plugins_by_type.items():
+                for plugin_short_name in plugins:
+                    filename = self.filename_generator.plugin_filename(
+                        f"{collection_name}.{plugin_short_name}",
+                        plugin_type,
+                        self.output_format,
+                    )
+                    path = f"collections/{namespace}/{collection}/{filename}"
+                    self._plugin_pages[path] = (
+                        collection_name,
+                        plugin_type,
+                        plugin_short_name,
+                    )
+
+    def _render_plugin(
+        self, collection_name: str, plugin_type: str, plugin_short_name: str
+    ) -> str:
+        plugin_name = f"{collection_name}.{plugin_short_name}"
+        return create_plugin_rst(
+            collection_name,
+            self.data.collection_metadata[collection_name],
+            self.data.link_data[collection_name],
+            plugin_short_name,
+            plugin_type,
+            self.data.new_plugin_info[plugin_type].get(plugin_name) or {},
+            self.data.nonfatal_errors[plugin_type][plugin_name],
+            self._role_tmpl if plugin_type == "role" else self._plugin_tmpl,
+            self._error_tmpl,
+            use_html_blobs=self.use_html_blobs,
+            add_version=self.add_version,
+        )
+
+    async def _render_other_pages(self, output: MemoryOutput) -> None:
+        data = self.data
+        common_args: dict[str, t.Any] = {
+            "collection_url": self.collection_url,
+            "collection_install": self.collection_install,
+            "output_format": self.output_format,
+            "filename_generator": self.filename_generator,
+            "add_version": self.add_version,
+        }
+        await output_collection_index(
+            data.collection_to_plugin_info,
+            data.collection_namespaces,
+            data.collection_metadata,
+            output,
+            referable_envvars=data.referable_envvars,
+            **common_args,
+        )
+        await output_collection_namespace_indexes(
+            data.collection_namespaces,
+            data.collection_metadata,
+            output,
+            referable_envvars=data.referable_envvars,
+            **common_args,
+        )
+        await output_plugin_indexes(
+            data.plugin_contents,
+            data.collection_metadata,
+            output,
+            referable_envvars=data.referable_envvars,
+            **common_args,
+        )
+        await output_callback_indexes(
+            data.callback_plugin_contents,
+            output,
+            referable_envvars=data.referable_envvars,
+            **common_args,
+        )
+        await output_deprecation_index(
+            data.plugin_contents,
+            data.collection_metadata,
+            output,
+            referable_envvars=data.referable_envvars,
+            deprecated_plugin_info=data.catalogue.get_deprecated_plugins(),
+            **common_args,
+        )
+        await output_collection_indexes(
+            data.collection_to_plugin_info,
+            output,
+            collection_metadata=data.collection_metadata,
+            extra_docs_data=data.extra_docs_data,
+            link_data=data.link_data,
+            referable_envvars=data.referable_envvars,
+            **common_args,
+        )
+        await output_changelogs(
+            data.collection_to_plugin_info,
+            output,
+            collection_metadata=data.collection_metadata,
+            output_format=self.output_format,
+        )
+        await output_all_plugin_stub_rst(
+            data.stubs_info,
+            output,
+            collection_metadata=data.collection_metadata,
+            link_data=data.link_data,
+            referable_envvars=data.referable_envvars,
+            **common_args,
+        )
+        await output_extra_docs(output, data.extra_docs_data)
+        if self.output_format == OutputFormat.ANSIBLE_DOCSITE:
+            await output_environment_variables(
+                output,
+                data.referenced_env_vars,
+                output_format=self.output_format,
+                filename_generator=self.filename_generator,
+                referable_envvars=data.referable_envvars,
+                add_version=self.add_version,
+            )
+
+    def _get_other_pages(self) -> MemoryOutput:
+        if self._other_pages is None:
+            flog = mlog.fields(func="_DocsServer._get_other_pages")
+            flog.notice("Rendering index pages")
+            output = MemoryOutput()
+            asyncio.run(self._render_other_pages(output))
+            self._other_pages = output
+        return self._other_pages
+
+    def get_paths(self) -> list[str]:
+        """
+        Return the paths of all pages that can be served.
+        """
+        with self.lock:
+            other_pages = self._get_other_pages()
+            return sorted(
+                {*self._plugin_pages, *other_pages.files, *other_pages.copied_files}
+            )
+
+    def get_rst(self, path: str) -> str | None:
+        """
+        Return the RST page for ``path``, or ``None`` if there is no such page.
+        """
+        with self.lock:
+            page = self._pages.get(path)
+            if page is not None:
+                return page
+            plugin = self._plugin_pages.get(path)
+            if plugin is not None:
+                page = self._render_plugin(*plugin)
+            else:
+                other_pages = self._get_other_pages()
+                page = other_pages.files.get(path)
+                source = other_pages.copied_files.get(path)
+                if page is None and source is not None:
+                    # Extra docs are read again every time, so that changes are visible
+                    with open(source, encoding="utf-8") as f:
+                        return f.read()
+            if page is not None:
+                self._pages[path] = page
+            return page
+
+    def get_page(self, path: str) -> tuple[str, str] | None:
+        """
+        Return content type and content for a request path, or ``None`` if there is no
+        such page.
+
+        Paths ending with ``.html`` return the corresponding RST page converted to HTML.
+        The root path returns a list of all pages.
+        """
+        path = path.lstrip("/")
+        if path in ("", "index.html"):
+            links = "\n".join(
+                f'<li><a href="{html.escape(page[:-4])}.html">{html.escape(page)}</a>'
+                f' (<a href="{html.escape(page)}">RST</a>)</li>'
+                for page in self.get_paths()
+                if page.endswith(".rst")
+            )
+            return "text/html", (
+                "<!DOCTYPE html>\n<html><head><meta charset=utf-8>"
+                "<title>antsibull-docs serve</title></head>\n"
+                f"<body><ul>\n{links}\n</ul></body></html>\n"
+            )
+        if path.endswith(".html"):
+            content = self.get_rst(f"{path[:-5]}.rst")
+            return None if content is None else ("text/html", rst_to_html(content))
+        content = self.get_rst(path)
+        return None if content is None else ("text/plain", content)
+
+    def get_watched_collections(self) -> dict[str, str]:
+        """
+        Return a mapping of the collections to watch to their paths.
+        """
+        return {
+            name: metadata.path
+            for name, metadata in self.data.collection_metadata.items()
+            if name not in _UNWATCHED_COLLECTIONS
+        }
+
+    def _reload_plugins(self, collection_name: str, changed_files: set[str]) -> None:
+        changed_plugins = find_changed_plugins(
+            changed_files,
+            collection_name=collection_name,
+            new_plugin_info=self.data.new_plugin_info,
+            collection_to_plugin_info=self.data.collection_to_plugin_info,
+            collection_metadata=self.data.collection_metadata,
+        )
+        self.data.collection_routing = reload_collection_plugin_info(
+            new_plugin_info=self.data.new_plugin_info,
+            nonfatal_errors=self.data.nonfatal_errors,
+            collection_metadata=self.data.collection_metadata,
+            collection_name=collection_name,
+            collections_dir=None,
+            changed_plugins=changed_plugins,
+            fast_extraction=self.fast_extraction,
+        )
+        self.data.update_contents()
+
+    def _reload_docsite(self, collection_name: str) -> None:
+        path = {collection_name: self.data.collection_metadata[collection_name].path}
+        extra_docs_data = dict(self.data.extra_docs_data)
+        extra_docs_data.update(asyncio.run(load_collections_extra_docs(path)))
+        link_data = dict(self.data.link_data)
+        link_data.update(asyncio.run(load_collections_links(path)))
+        self.data.extra_docs_data = extra_docs_data
+        self.data.link_data = link_data
+
+    def update(self, collection_name: str, changed_files: set[str]) -> None:
+        """
+        Update everything that is affected by changed files of a collection.
+
+        ``changed_files`` are relative to the collection's root and use ``/`` as the path
+        separator.
+        """
+        flog = mlog.fields(func="_DocsServer.update")
+        plugin_files = {
+            path for path in changed_files if path.startswith(("plugins/", "roles/"))
+        }
+        with self.lock:
+            if _METADATA_FILES & changed_files:
+                flog.notice("Loading all collections")
+                self.data = self._load()
+            else:
+                if plugin_files:
+                    flog.notice(f"Updating plugins of {collection_name}")
+                    self._reload_plugins(collection_name, plugin_files)
+                if any(path.startswith("docs/docsite/") for path in changed_files):
+                    flog.notice(f"Updating extra docs of {collection_name}")
+                    self._reload_docsite(collection_name)
+            self._reset()
+
+
+class _WatchStopped(Exception):
+    pass
+
+
+def _watch_collection(
+    server: _DocsServer,
+    collection_name: str,
+    path: str,
+    interval: float,
+    stop: threading.Event,
+) -> None:
+    flog = mlog.fields(func="_watch_collection")
+
+    def sleep(seconds: float) -> None:
+        if stop.wait(seconds):
+            raise _WatchStopped
+
+    watcher = FileWatcher(path, ignore=is_ignored_in_collection)
+    try:
+        while True:
+            changed_files = watcher.wait_for_changes(interval, sleep=sleep)
+            flog.notice(
+                f"Changed files in {collection_name}:"
+                f" {', '.join(sorted(changed_files))}"
+            )
+            try:
+                server.update(collection_name, changed_files)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                flog.error(f"Error while updating {collection_name}: {exc}")
+    except _WatchStopped:
+        pass
+
+
+def _create_request_handler(server: _DocsServer) -> type[BaseHTTPRequestHandler]:
+    class RequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            path = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path)
+            try:
+                page = server.get_page(path)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                mlog.fields(func="RequestHandler.do_GET").error(
+                    f"Error while rendering {path}: {exc}"
+                )
+                self.send_error(500, explain=str(exc))
+                return
+            if page is None:
+                self.send_error(404)
+                return
+            content_type, content = page
+            body = content.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: t.Any) -> None:
+            # pylint: disable-next=redefined-builtin
+            mlog.fields(func="RequestHandler.log_message").debug(format % args)
+
+    return RequestHandler
+
+
+def serve_docs() -> int:
+    """
+    Serve the documentation of installed collections over HTTP.
+
+    :returns: A return code for the program.  See :func:`antsibull.cli.antsibull_docs.main` for
+        details on what each code means.
+    """
+    flog = mlog.fields(func="serve_docs")
+    flog.notice("Begin serving collection docs")
+
+    app_ctx = app_context.app_ctx.get()
+
+    venv = FakeVenvRunner()
+    collection_names: list[str] = app_ctx.extra["collections"]
+    server = _DocsServer(
+        lambda: load_collections_docs_data(
+            venv, None, collection_names=collection_names
+        ),
+        output_format=OutputFormat.parse(app_ctx.extra["output_format"]),
+        use_html_blobs=app_ctx.use_html_blobs,
+        fast_extraction=app_ctx.extra["fast_docs_extraction"],
+        add_version=app_ctx.add_antsibull_docs_version,
+    )
+
+    stop_watching = threading.Event()
+    watch_threads: list[threading.Thread] = []
+    if app_ctx.extra["watch"]:
+        for collection_name, path in server.get_watched_collections().items():
+            thread = threading.Thread(
+                target=contextvars.copy_context().run,
+                args=(
+                    _watch_collection,
+                    server,
+                    collection_name,
+                    path,
+                    app_ctx.extra["watch_interval"],
+                    stop_watching,
+                ),
+                daemon=True,
+            )
+            thread.start()
+            watch_threads.append(thread)
+
+    httpd = HTTPServer(
+        (app_ctx.extra["bind"], app_ctx.extra["port"]), _create_request_handler(server)
+    )
+    host, port = httpd.server_address[:2]
+    print(f"Serving documentation on http://{host!s}:{port}/ (press Ctrl+C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        stop_watching.set()
+        for thread in watch_threads:
+            thread.join()
+    return 0
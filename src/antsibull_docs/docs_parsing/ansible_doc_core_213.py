@@ -150,12 +150,52 @@ def _limit_by_wildcards(
     return ret_collection_metadata, ret_collection_names
 
 
+def _exclude_collections(
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+    collection_names: list[str] | None,
+    exclude_collections: (
+        t.Callable[[Mapping[str, AnsibleCollectionMetadata]], t.Collection[str]] | None
+    ),
+) -> list[str] | None:
+    if exclude_collections is None:
+        return collection_names
+    flog = mlog.fields(func="_exclude_collections")
+    excluded = set(exclude_collections(collection_metadata))
+    if not excluded:
+        return collection_names
+    flog.debug(f"Not retrieving plugins of {', '.join(sorted(excluded))}")
+    return [
+        collection_name
+        for collection_name in (
+            collection_metadata if collection_names is None else collection_names
+        )
+        if collection_name not in excluded
+    ]
+
+
+async def _get_ansible_doc_output(
+    venv: VenvRunner | FakeVenvRunner,
+    env: dict[str, str],
+    ansible_core_version: PypiVer,
+    collection_names: list[str] | None,
+) -> Mapping[str, t.Any]:
+    if collection_names == []:
+        # All collections have been excluded, no need to call ansible-doc
+        return {"all": {}}
+    return await _call_ansible_doc(
+        venv, env, *_get_ansible_doc_filters(ansible_core_version, collection_names)
+    )
+
+
 async def get_ansible_plugin_info(
     venv: VenvRunner | FakeVenvRunner,
     ansible_core_version: PypiVer,
     collection_dir: str | None,
     collection_names: list[str] | None = None,
     fetch_all_installed: bool = False,
+    exclude_collections: (
+        t.Callable[[Mapping[str, AnsibleCollectionMetadata]], t.Collection[str]] | None
+    ) = None,
 ) -> tuple[
     MutableMapping[str, MutableMapping[str, t.Any]],
     Mapping[str, AnsibleCollectionMetadata],
@@ -173,6 +213,9 @@ async def get_ansible_plugin_info(
                            information for plugins in these collections.
     :arg fetch_all_installed: If set to ``True``, will also retrieve plugins of installed
         collections outside ``collection_dir`` (if specified).
+    :arg exclude_collections: Optional callback that is called with the collection metadata
+        once it has been retrieved. The plugins of the collections it returns are not
+        retrieved, but the collections are still part of the returned metadata.
     :returns: An tuple. The first component is a nested directory structure that looks like:
 
             plugin_type:
@@ -205,9 +248,13 @@ async def get_ansible_plugin_info(
             collection_metadata, collection_names or []
         )
 
+    collection_names = _exclude_collections(
+        collection_metadata, collection_names, exclude_collections
+    )
+
     flog.debug("Retrieving and loading plugin documentation")
-    ansible_doc_output = await _call_ansible_doc(
-        venv, env, *_get_ansible_doc_filters(ansible_core_version, collection_names)
+    ansible_doc_output = await _get_ansible_doc_output(
+        venv, env, ansible_core_version, collection_names
     )
 
     flog.debug("Processing plugin documentation")
@@ -0,0 +1,581 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Extract plugin documentation directly from the collection's files, without ansible-doc.
+
+This reproduces what ``ansible-doc --metadata-dump`` returns for a single plugin by
+reading the documentation variables with Python's ``ast`` module and by merging the
+documentation fragments in the same way as ansible-core. Only the common cases are
+supported. Whenever the result could differ from ansible-doc's,
+:class:`UnsupportedPluginError` is raised, and the caller must fall back to ansible-doc.
+"""
+
+from __future__ import annotations
+
+import ast
+import datetime
+import json
+import os
+import typing as t
+from collections.abc import Mapping, MutableMapping
+
+from antsibull_fileutils.yaml import load_yaml_bytes, load_yaml_file
+from yaml import YAMLError
+
+from ..constants import DOCUMENTABLE_PLUGINS
+from . import AnsibleCollectionMetadata
+from .fqcn import get_fqcn_parts
+
+# Filters and tests can share files, and ansible-doc has special handling for Jinja2's
+# built-in filters and tests.
+_UNSUPPORTED_PLUGIN_TYPES = frozenset(["filter", "test"])
+
+_DOC_VARIABLES = {
+    "DOCUMENTATION": "doc",
+    "EXAMPLES": "examples",
+    "RETURN": "return",
+    "ANSIBLE_METADATA": "metadata",
+}
+
+_DOC_EXTENSIONS = (".py", ".yml", ".yaml")
+
+_ROLE_ARGSPEC_FILES = tuple(
+    f"{basename}{ext}"
+    for basename in ("argument_specs", "main")
+    for ext in (".yml", ".yaml", ".json")
+)
+
+
+class UnsupportedPluginError(Exception):
+    """
+    The documentation of a plugin cannot be extracted without ansible-doc.
+    """
+
+
+def _get_plugin_directory(collection_path: str, plugin_type: str) -> str:
+    directory = "modules" if plugin_type == "module" else plugin_type
+    return os.path.join(collection_path, "plugins", directory)
+
+
+def _get_routing_key(plugin_type: str) -> str:
+    return "modules" if plugin_type == "module" else plugin_type
+
+
+def _load_plugin_routing(
+    collection_name: str, collection_path: str
+) -> Mapping[str, t.Any]:
+    if collection_name == "ansible.builtin":
+        path = os.path.join(collection_path, "config", "ansible_builtin_runtime.yml")
+    else:
+        path = os.path.join(collection_path, "meta", "runtime.yml")
+    if not os.path.exists(path):
+        return {}
+    try:
+        data = load_yaml_file(path)
+    except (OSError, YAMLError) as exc:
+        raise UnsupportedPluginError(f"Cannot load {path}: {exc}") from exc
+    if not isinstance(data, Mapping):
+        return {}
+    plugin_routing = data.get("plugin_routing")
+    return plugin_routing if isinstance(plugin_routing, Mapping) else {}
+
+
+class _Collection:
+    """
+    Lazily loaded information on a collection.
+    """
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self._plugin_routing: Mapping[str, t.Any] | None = None
+
+    def get_routing(self, routing_key: str, plugin_name: str) -> t.Any:
+        if self._plugin_routing is None:
+            self._plugin_routing = _load_plugin_routing(self.name, self.path)
+        plugins = self._plugin_routing.get(routing_key)
+        if not isinstance(plugins, Mapping):
+            return None
+        return plugins.get(plugin_name)
+
+
+def _load_yaml(content: str, filename: str) -> t.Any:
+    try:
+        return load_yaml_bytes(content.encode("utf-8"))
+    except YAMLError as exc:
+        # This includes tags like !unsafe, which the safe loader does not know
+        raise UnsupportedPluginError(f"Cannot parse YAML in {filename}: {exc}") from exc
+
+
+def _read_python_file(filename: str) -> ast.Module:
+    try:
+        with open(filename, "rb") as f:
+            return ast.parse(f.read(), filename=filename)
+    except (OSError, SyntaxError, ValueError) as exc:
+        raise UnsupportedPluginError(f"Cannot parse {filename}: {exc}") from exc
+
+
+def _read_doc_variables(filename: str) -> dict[str, t.Any]:
+    result: dict[str, t.Any] = dict.fromkeys(_DOC_VARIABLES.values())
+    if filename.endswith(".py"):
+        for node in _read_python_file(filename).body:
+            if not isinstance(node, ast.Assign):
+                continue
+            for target in node.targets:
+                # ansible-doc also ignores assignments to attributes, tuples, ...
+                if isinstance(target, ast.Name) and target.id in _DOC_VARIABLES:
+                    result[_DOC_VARIABLES[target.id]] = _get_doc_variable_value(
+                        target.id, node.value, filename
+                    )
+        return result
+
+    try:
+        with open(filename, "rb") as f:
+            data = load_yaml_bytes(f.read())
+    except (OSError, YAMLError) as exc:
+        raise UnsupportedPluginError(f"Cannot load {filename}: {exc}") from exc
+    if not isinstance(data, Mapping):
+        raise UnsupportedPluginError(f"{filename} does not contain a dictionary")
+    for variable, key in _DOC_VARIABLES.items():
+        result[key] = data.get(variable)
+    return result
+
+
+def _get_doc_variable_value(variable: str, value: ast.expr, filename: str) -> t.Any:
+    if isinstance(value, ast.Dict):
+        try:
+            return ast.literal_eval(value)
+        except (TypeError, ValueError) as exc:
+            raise UnsupportedPluginError(
+                f"Cannot evaluate {variable} in {filename}: {exc}"
+            ) from exc
+    if not isinstance(value, ast.Constant) or not isinstance(value.value, str):
+        raise UnsupportedPluginError(
+            f"{variable} in {filename} is neither a string nor a dictionary"
+        )
+    if variable == "EXAMPLES":
+        return value.value
+    return _load_yaml(value.value, filename)
+
+
+class _VersionsAndDatesProcessor:
+    """
+    Port of ansible-core's ``add_collection_to_versions_and_dates()``.
+    """
+
+    def __init__(self, collection_name: str, is_module: bool):
+        self.collection_name = collection_name
+        self.is_module = is_module
+
+    def _add(self, data: MutableMapping[str, t.Any], field: str) -> None:
+        if field not in data:
+            data[field] = self.collection_name
+
+    def _process_deprecation(self, deprecation: t.Any, top_level: bool = False):
+        if not isinstance(deprecation, MutableMapping):
+            return
+        field = "removed_from_collection" if top_level else "collection_name"
+        if (self.is_module or top_level) and "removed_in" in deprecation:
+            self._add(deprecation, field)
+        if "removed_at_date" in deprecation:
+            self._add(deprecation, field)
+        if not (self.is_module or top_level) and "version" in deprecation:
+            self._add(deprecation, field)
+
+    def _process_version_added(self, data: MutableMapping[str, t.Any]) -> None:
+        if "version_added" in data:
+            self._add(data, "version_added_collection")
+
+    def _process_option_specifiers(self, specifiers: t.Any) -> None:
+        if not isinstance(specifiers, list):
+            return
+        for specifier in specifiers:
+            if isinstance(specifier, MutableMapping):
+                self._process_version_added(specifier)
+                self._process_deprecation(specifier.get("deprecated"))
+
+    def _process_options(self, options: t.Any) -> None:
+        if not isinstance(options, MutableMapping):
+            return
+        for option in options.values():
+            if not isinstance(option, MutableMapping):
+                continue
+            self._process_version_added(option)
+            if not self.is_module:
+                for key in ("env", "ini", "vars"):
+                    self._process_option_specifiers(option.get(key))
+                self._process_deprecation(option.get("deprecated"))
+            self._process_options(option.get("suboptions"))
+
+    def _process_return_values(self, return_values: t.Any) -> None:
+        if not isinstance(return_values, MutableMapping):
+            return
+        for return_value in return_values.values():
+            if isinstance(return_value, MutableMapping):
+                self._process_version_added(return_value)
+                self._process_return_values(return_value.get("contains"))
+
+    def process(self, fragment: t.Any, return_docs: bool = False) -> None:
+        if not fragment:
+            return
+        if return_docs:
+            self._process_return_values(fragment)
+            return
+        self._process_version_added(fragment)
+        self._process_deprecation(fragment.get("deprecated"), top_level=True)
+        self._process_options(fragment.get("options"))
+        attributes = fragment.get("attributes")
+        if isinstance(attributes, MutableMapping):
+            for attribute in attributes.values():
+                if isinstance(attribute, MutableMapping):
+                    self._process_version_added(attribute)
+
+
+def _merge_fragment(target: MutableMapping[str, t.Any], source: Mapping[str, t.Any]):
+    """
+    Port of ansible-core's ``merge_fragment()``.
+    """
+    for key, value in source.items():
+        if key in target:
+            try:
+                if isinstance(target[key], MutableMapping):
+                    value.update(target[key])
+                elif isinstance(target[key], list):
+                    value = sorted(frozenset(value + target[key]))
+                else:
+                    raise TypeError(f"invalid type {type(target[key]).__name__}")
+            except (AttributeError, TypeError) as exc:
+                raise UnsupportedPluginError(
+                    f"Cannot extend a documentation fragment with {key!r}: {exc}"
+                ) from exc
+        target[key] = value
+
+
+class _FragmentResolver:
+    """
+    Find documentation fragments like ansible-core's fragment loader.
+    """
+
+    def __init__(self, collections: Mapping[str, _Collection]):
+        self._collections = collections
+        self._fragments: dict[tuple[str, str], Mapping[str, t.Any]] = {}
+
+    def _load_fragment_class(self, path: str) -> Mapping[str, t.Any]:
+        class_node: ast.ClassDef | None = None
+        for node in _read_python_file(path).body:
+            if isinstance(node, ast.ClassDef) and node.name == "ModuleDocFragment":
+                class_node = node
+        if class_node is None:
+            raise UnsupportedPluginError(f"{path} has no ModuleDocFragment class")
+        if any(
+            not isinstance(base, ast.Name) or base.id != "object"
+            for base in class_node.bases
+        ):
+            raise UnsupportedPluginError(
+                f"ModuleDocFragment in {path} has base classes"
+            )
+        variables: dict[str, t.Any] = {}
+        for node in class_node.body:
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if not isinstance(target, ast.Name):
+                        raise UnsupportedPluginError(
+                            f"Unsupported assignment in line {node.lineno} of {path}"
+                        )
+                    if isinstance(node.value, ast.Constant) and isinstance(
+                        node.value.value, str
+                    ):
+                        variables[target.id] = node.value.value
+                    else:
+                        variables[target.id] = None
+        return variables
+
+    def _find(self, name: str) -> tuple[str, Mapping[str, t.Any]] | None:
+        parts = name.split(".")
+        if len(parts) == 1:
+            # Short names always refer to ansible-core's fragments, since
+            # ANSIBLE_DOC_FRAGMENT_PLUGINS is set to /dev/null
+            parts = ["ansible", "builtin", name]
+        elif len(parts) == 2:
+            return None
+        collection_name = ".".join(parts[:2])
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            raise UnsupportedPluginError(
+                f"Documentation fragment {name} is from an unknown collection"
+            )
+        fragment_name = ".".join(parts[2:])
+        if collection.get_routing("doc_fragments", fragment_name) is not None:
+            raise UnsupportedPluginError(
+                f"Documentation fragment {name} has routing information"
+            )
+        path = (
+            os.path.join(collection.path, "plugins", "doc_fragments", *parts[2:])
+            + ".py"
+        )
+        if not os.path.isfile(path):
+            return None
+        if len(parts) > 3:
+            raise UnsupportedPluginError(
+                f"Documentation fragment {name} is in a subdirectory"
+            )
+        key = (collection_name, fragment_name)
+        if key not in self._fragments:
+            self._fragments[key] = self._load_fragment_class(path)
+        return collection_name, self._fragments[key]
+
+    def resolve(self, slug: str) -> tuple[str, str, str]:
+        """
+        Given an entry of ``extends_documentation_fragment``, return the name of the
+        fragment's collection, the fragment's name, and the YAML content.
+        """
+        if slug != slug.strip():
+            raise UnsupportedPluginError(f"Documentation fragment {slug!r} has spaces")
+        name = slug
+        variable = "DOCUMENTATION"
+        found = self._find(name)
+        if found is None and "." in slug:
+            name, variable = slug.rsplit(".", 1)
+            variable = variable.upper()
+            found = self._find(name)
+        if found is None:
+            raise UnsupportedPluginError(f"Unknown documentation fragment {slug}")
+        collection_name, variables = found
+        if variable not in variables:
+            if variable != "DOCUMENTATION":
+                raise UnsupportedPluginError(f"Unknown documentation fragment {slug}")
+            return collection_name, name, "{}"
+        content = variables[variable]
+        if content is None:
+            raise UnsupportedPluginError(
+                f"{variable} of documentation fragment {name} is not a string"
+            )
+        return collection_name, name, content
+
+
+def _apply_fragment(
+    doc: MutableMapping[str, t.Any],
+    fragment: MutableMapping[str, t.Any],
+    fragment_name: str,
+) -> None:
+    for key in ("notes", "seealso"):
+        value = fragment.pop(key, None)
+        if value:
+            try:
+                doc.setdefault(key, []).extend(value)
+            except (AttributeError, TypeError) as exc:
+                raise UnsupportedPluginError(
+                    f"Cannot add {key} of documentation fragment {fragment_name}: {exc}"
+                ) from exc
+
+    if "options" not in fragment and "attributes" not in fragment:
+        raise UnsupportedPluginError(
+            f"Documentation fragment {fragment_name} has neither options"
+            " nor attributes"
+        )
+
+    for key in ("options", "attributes"):
+        if key in fragment:
+            if key in doc:
+                _merge_fragment(doc[key], fragment.pop(key))
+            else:
+                doc[key] = fragment.pop(key)
+
+    _merge_fragment(doc, fragment)
+
+
+def _add_fragments(
+    doc: MutableMapping[str, t.Any],
+    filename: str,
+    is_module: bool,
+    fragment_resolver: _FragmentResolver,
+) -> None:
+    """
+    Port of ansible-core's ``add_fragments()``.
+    """
+    fragments = doc.pop("extends_documentation_fragment", [])
+    if isinstance(fragments, str):
+        fragments = fragments.split(",")
+    if not isinstance(fragments, list) or not all(
+        isinstance(fragment, str) for fragment in fragments
+    ):
+        raise UnsupportedPluginError(
+            f"Invalid extends_documentation_fragment in {filename}"
+        )
+
+    for slug in fragments:
+        fragment_collection, fragment_name, content = fragment_resolver.resolve(slug)
+        fragment = _load_yaml(content, filename)
+        if not isinstance(fragment, MutableMapping):
+            raise UnsupportedPluginError(
+                f"Documentation fragment {fragment_name} is not a dictionary"
+            )
+        _VersionsAndDatesProcessor(fragment_collection, is_module).process(fragment)
+        _apply_fragment(doc, fragment, fragment_name)
+
+
+def _json_default(value: t.Any) -> t.Any:
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _to_json(data: t.Any) -> t.Any:
+    # ansible-doc's output is JSON, so make sure that dates, non-string keys, tuples,
+    # ... are converted the same way
+    try:
+        return json.loads(json.dumps(data, default=_json_default))
+    except (TypeError, ValueError) as exc:
+        raise UnsupportedPluginError(
+            f"Cannot serialize documentation as JSON: {exc}"
+        ) from exc
+
+
+def _find_doc_file(plugin_directory: str, name: str, is_module: bool) -> str:
+    try:
+        candidates = [
+            entry
+            for entry in os.listdir(plugin_directory)
+            if os.path.splitext(entry)[0] == name
+        ]
+    except OSError as exc:
+        raise UnsupportedPluginError(f"Cannot list {plugin_directory}: {exc}") from exc
+    if candidates == [f"{name}.py"]:
+        filename = candidates[0]
+    else:
+        # Only modules can be non-Python files (for example PowerShell modules) with
+        # a sidecar documentation file
+        doc_files = [
+            candidate for candidate in candidates if candidate.endswith(_DOC_EXTENSIONS)
+        ]
+        if (
+            not is_module
+            or len(candidates) != 2
+            or len(doc_files) != 1
+            or doc_files[0].endswith(".py")
+        ):
+            raise UnsupportedPluginError(
+                f"Cannot determine documentation file for {name} in {plugin_directory}"
+            )
+        filename = doc_files[0]
+    path = os.path.join(plugin_directory, filename)
+    if os.path.islink(path) or not os.path.isfile(path):
+        raise UnsupportedPluginError(f"{path} is not a regular file")
+    return path
+
+
+def _has_action(collection: _Collection, name: str) -> bool:
+    if collection.get_routing("action", name) is not None:
+        raise UnsupportedPluginError(f"Action plugin {name} has routing information")
+    return os.path.isfile(
+        os.path.join(_get_plugin_directory(collection.path, "action"), f"{name}.py")
+    )
+
+
+def _extract_plugin(
+    collection: _Collection,
+    plugin_type: str,
+    plugin_fqcn: str,
+    name: str,
+    fragment_resolver: _FragmentResolver,
+) -> dict[str, t.Any]:
+    is_module = plugin_type == "module"
+    filename = _find_doc_file(
+        _get_plugin_directory(collection.path, plugin_type), name, is_module
+    )
+    data = _read_doc_variables(filename)
+    doc = data["doc"]
+    if not doc or not isinstance(doc, MutableMapping):
+        raise UnsupportedPluginError(f"{filename} has no valid documentation")
+
+    _VersionsAndDatesProcessor(collection.name, is_module).process(doc)
+    _add_fragments(doc, filename, is_module, fragment_resolver)
+    if data["return"]:
+        _VersionsAndDatesProcessor(collection.name, is_module).process(
+            data["return"], return_docs=True
+        )
+
+    doc["filename"] = filename
+    doc["collection"] = collection.name
+    doc["plugin_name"] = plugin_fqcn
+    if is_module:
+        doc["has_action"] = _has_action(collection, name)
+    return _to_json(data)
+
+
+def _extract_role(collection: _Collection, name: str) -> dict[str, t.Any]:
+    meta_path = os.path.join(collection.path, "roles", name, "meta")
+    for filename in _ROLE_ARGSPEC_FILES:
+        path = os.path.join(meta_path, filename)
+        if os.path.exists(path):
+            break
+    else:
+        raise UnsupportedPluginError(f"Role {name} has no argument spec")
+    try:
+        data = load_yaml_file(path)
+    except (OSError, YAMLError) as exc:
+        raise UnsupportedPluginError(f"Cannot load {path}: {exc}") from exc
+    if data is None:
+        data = {}
+    argspec = data.get("argument_specs", {}) if isinstance(data, Mapping) else None
+    if not argspec or not isinstance(argspec, Mapping):
+        raise UnsupportedPluginError(f"Role {name} has no entrypoints in {path}")
+    return _to_json(
+        {
+            "path": collection.path,
+            "collection": collection.name,
+            "entry_points": {
+                entry_point: spec or {} for entry_point, spec in argspec.items()
+            },
+        }
+    )
+
+
+def extract_plugin_info(
+    plugins: t.Iterable[tuple[str, str]],
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+) -> MutableMapping[str, MutableMapping[str, t.Any]]:
+    """
+    Extract the documentation of some plugins in the same format as
+    ``get_ansible_plugin_info()``, but without calling ansible-doc.
+
+    :arg plugins: Tuples of plugin type and FQCN of the plugins to extract.
+    :arg collection_metadata: The collection metadata returned by
+        ``get_ansible_plugin_info()``. Used to locate plugins and documentation fragments.
+    :raises UnsupportedPluginError: If the documentation of one of the plugins might
+        differ from what ansible-doc returns. In that case, ansible-doc must be used.
+    """
+    collections = {
+        name: _Collection(name, metadata.path)
+        for name, metadata in collection_metadata.items()
+    }
+    fragment_resolver = _FragmentResolver(collections)
+    plugin_map: MutableMapping[str, MutableMapping[str, t.Any]] = {
+        plugin_type: {} for plugin_type in DOCUMENTABLE_PLUGINS
+    }
+    for plugin_type, plugin_fqcn in plugins:
+        if plugin_type in _UNSUPPORTED_PLUGIN_TYPES:
+            raise UnsupportedPluginError(f"Cannot extract {plugin_type} plugins")
+        namespace, collection_name, name = get_fqcn_parts(plugin_fqcn)
+        collection = collections.get(f"{namespace}.{collection_name}")
+        if collection is None or collection.name == "ansible.builtin":
+            raise UnsupportedPluginError(f"Cannot extract plugins of {plugin_fqcn}")
+        if "." in name or name.startswith("_"):
+            raise UnsupportedPluginError(f"Unsupported plugin name {plugin_fqcn}")
+        if plugin_type == "role":
+            plugin_map[plugin_type][plugin_fqcn] = _extract_role(collection, name)
+            continue
+        routing = collection.get_routing(_get_routing_key(plugin_type), name)
+        if isinstance(routing, Mapping) and (
+            "redirect" in routing or "tombstone" in routing
+        ):
+            raise UnsupportedPluginError(f"{plugin_fqcn} is redirected or removed")
+        plugin_map[plugin_type][plugin_fqcn] = _extract_plugin(
+            collection, plugin_type, plugin_fqcn, name, fragment_resolver
+        )
+    return plugin_map
+
+
+__all__ = ("UnsupportedPluginError", "extract_plugin_info")
@@ -32,6 +32,9 @@ async def get_ansible_plugin_info(
     collection_dir: str | None,
     collection_names: list[str] | None = None,
     fetch_all_installed: bool = False,
+    exclude_collections: (
+        t.Callable[[Mapping[str, AnsibleCollectionMetadata]], t.Collection[str]] | None
+    ) = None,
 ) -> tuple[
     MutableMapping[str, MutableMapping[str, t.Any]],
     Mapping[str, AnsibleCollectionMetadata],
@@ -47,6 +50,9 @@ async def get_ansible_plugin_info(
                            information for plugins in these collections.
     :arg fetch_all_installed: If set to ``True``, will also retrieve plugins of installed
         collections outside ``collection_dir`` (if specified).
+    :arg exclude_collections: Optional callback that is called with the collection metadata
+        once it has been retrieved. The plugins of the collections it returns are not
+        retrieved, but the collections are still part of the returned metadata.
     :returns: An tuple. The first component is a nested directory structure that looks like:
 
             plugin_type:
@@ -82,6 +88,7 @@ async def get_ansible_plugin_info(
             collection_dir=collection_dir,
             collection_names=collection_names,
             fetch_all_installed=fetch_all_installed,
+            exclude_collections=exclude_collections,
         )
 
     raise RuntimeError(f"Invalid value for doc_parsing_backend: {doc_parsing_backend}")
@@ -10,7 +10,7 @@ from __future__ import annotations
 import os
 import os.path
 import typing as t
-from collections.abc import Generator, Mapping
+from collections.abc import Generator, Iterable, Mapping, Sequence
 
 from antsibull_fileutils import yaml
 
@@ -69,28 +69,39 @@ def _find_env_vars(
             yield from _find_env_vars(option_data["suboptions"])
 
 
+def find_plugin_env_vars(
+    plugin_record: Mapping[str, t.Any],
+) -> tuple[tuple[str, list[str] | None], ...]:
+    """
+    Find all environment variables referenced by the options of a plugin.
+
+    :arg plugin_record: The normalized plugin record.
+    :returns: A tuple of pairs of environment variable name and option description.
+    """
+    plugin_options: Mapping[str, Mapping[str, t.Any]] = (
+        plugin_record.get("doc") or {}
+    ).get("options") or {}
+    return tuple(_find_env_vars(plugin_options))
+
+
 def _collect_env_vars_and_descriptions(
-    plugin_info: Mapping[str, Mapping[str, t.Any]],
+    plugin_env_vars: Iterable[tuple[str, str, Sequence[tuple[str, list[str] | None]]]],
     core_envs: set[str],
 ) -> tuple[Mapping[str, EnvironmentVariableInfo], Mapping[str, list[list[str]]]]:
     other_variables: dict[str, EnvironmentVariableInfo] = {}
     other_variable_description: dict[str, list[list[str]]] = {}
-    for plugin_type, plugins in plugin_info.items():
-        for plugin_name, plugin_data in plugins.items():
-            plugin_options: Mapping[str, Mapping[str, t.Any]] = (
-                plugin_data.get("doc") or {}
-            ).get("options") or {}
-            for env_var, env_var_description in _find_env_vars(plugin_options):
-                if env_var in core_envs:
-                    continue
-                if env_var not in other_variables:
-                    other_variables[env_var] = EnvironmentVariableInfo(env_var)
-                    other_variable_description[env_var] = []
-                if plugin_type not in other_variables[env_var].plugins:
-                    other_variables[env_var].plugins[plugin_type] = []
-                other_variables[env_var].plugins[plugin_type].append(plugin_name)
-                if env_var_description is not None:
-                    other_variable_description[env_var].append(env_var_description)
+    for plugin_type, plugin_name, env_vars in plugin_env_vars:
+        for env_var, env_var_description in env_vars:
+            if env_var in core_envs:
+                continue
+            if env_var not in other_variables:
+                other_variables[env_var] = EnvironmentVariableInfo(env_var)
+                other_variable_description[env_var] = []
+            if plugin_type not in other_variables[env_var].plugins:
+                other_variables[env_var].plugins[plugin_type] = []
+            other_variables[env_var].plugins[plugin_type].append(plugin_name)
+            if env_var_description is not None:
+                other_variable_description[env_var].append(env_var_description)
     return other_variables, other_variable_description
 
 
@@ -111,20 +122,18 @@ def _augment_env_var_descriptions(
             variable_info.description = value
 
 
-def collect_referenced_environment_variables(
-    plugin_info: Mapping[str, Mapping[str, t.Any]],
+def collect_environment_variables(
+    plugin_env_vars: Iterable[tuple[str, str, Sequence[tuple[str, list[str] | None]]]],
     ansible_config: Mapping[str, Mapping[str, t.Any]],
 ) -> tuple[Mapping[str, EnvironmentVariableInfo], set[str]]:
     """
     Collect referenced environment variables that are not defined in the ansible-core
-    configuration.
+    configuration from precomputed per-plugin environment variable references.
 
-    :arg plugin_info: Mapping of plugin type to a mapping of plugin name to plugin record.
+    :arg plugin_env_vars: Iterable of tuples of plugin type, plugin name, and the result of
+        ``find_plugin_env_vars()`` for that plugin.
     :arg ansible_config: The Ansible base configuration (``lib/ansible/config/base.yml``).
-    :returns: A tuple consisting of a
-        Mapping of environment variable name to an environment variable infomation object,
-        and a set of environment variable names that are part of the ansible-core
-        configuration.
+    :returns: See ``collect_referenced_environment_variables()``.
     """
     core_envs = {"ANSIBLE_CONFIG"}
     for config in ansible_config.values():
@@ -133,12 +142,37 @@ def collect_referenced_environment_variables(
                 core_envs.add(env["name"])
 
     other_variables, other_variable_description = _collect_env_vars_and_descriptions(
-        plugin_info, core_envs
+        plugin_env_vars, core_envs
     )
     _augment_env_var_descriptions(other_variables, other_variable_description)
     return other_variables, core_envs
 
 
+def collect_referenced_environment_variables(
+    plugin_info: Mapping[str, Mapping[str, t.Any]],
+    ansible_config: Mapping[str, Mapping[str, t.Any]],
+) -> tuple[Mapping[str, EnvironmentVariableInfo], set[str]]:
+    """
+    Collect referenced environment variables that are not defined in the ansible-core
+    configuration.
+
+    :arg plugin_info: Mapping of plugin type to a mapping of plugin name to plugin record.
+    :arg ansible_config: The Ansible base configuration (``lib/ansible/config/base.yml``).
+    :returns: A tuple consisting of a
+        Mapping of environment variable name to an environment variable infomation object,
+        and a set of environment variable names that are part of the ansible-core
+        configuration.
+    """
+    return collect_environment_variables(
+        (
+            (plugin_type, plugin_name, find_plugin_env_vars(plugin_data))
+            for plugin_type, plugins in plugin_info.items()
+            for plugin_name, plugin_data in plugins.items()
+        ),
+        ansible_config,
+    )
+
+
 def collect_referable_envvars(
     referenced_env_vars: Mapping[str, EnvironmentVariableInfo],
     core_env_vars: set[str],
@@ -11,6 +11,7 @@ import dataclasses
 import typing as t
 
 from .markup.semantic_helper import split_option_like_name
+from .utils.cache import compute_cache_key
 from .utils.collection_names import (
     NameCollection,
     ValidCollectionRefs,
@@ -52,6 +53,18 @@ class CollectionNameLinter:
         self._validate_collections_refs = validate_collections_refs
         self._disallow_unknown_collection_refs = disallow_unknown_collection_refs
 
+    def get_fingerprint(self) -> str:
+        """
+        Return a hash of everything that influences the validation results,
+        for use in cache keys.
+        """
+        return compute_cache_key(
+            self._name_collection.get_fingerprint(),
+            self._collection_name_prefix,
+            self._validate_collections_refs,
+            self._disallow_unknown_collection_refs,
+        )
+
     def validate_collection_name(self, collection_name: str) -> list[str]:
         if self._validate_collections_refs == "self":
             if f"{collection_name}." == self._collection_name_prefix:
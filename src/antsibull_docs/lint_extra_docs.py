@@ -7,11 +7,16 @@
 
 from __future__ import annotations
 
+import hashlib
+import importlib.metadata
 import os
 import os.path
 import re
 import typing as t
+from concurrent.futures import ProcessPoolExecutor
 
+import docutils
+import sphinx
 from antsibull_docutils.utils import parse_document
 from docutils import nodes
 from docutils.parsers.rst import Directive as _DocutilsDirective
@@ -20,10 +25,12 @@ from docutils.parsers.rst.directives import unchanged as _directive_param_unchan
 from docutils.utils import unescape as _docutils_unescape
 from sphinx.util.matching import patfilter as _sphinx_patfilter
 
+import antsibull_docs
 from sphinx_antsibull_ext import directives as antsibull_directives
 from sphinx_antsibull_ext import roles as antsibull_roles
 from sphinx_antsibull_ext.sphinx_helper import extract_explicit_title
 
+from . import app_context
 from .extra_docs import (
     ExtraDocsIndexError,
     Section,
@@ -42,6 +49,7 @@ from .markup.semantic_helper import (
     parse_return_value_ref,
 )
 from .rstcheck import check_rst_content
+from .utils.cache import ResultCache, compute_cache_key
 
 _RST_LABEL_DEFINITION = re.compile(r"""^\.\. _([^:]+):""")
 
@@ -383,47 +391,188 @@ def _check_toctrees(
     return result
 
 
-def _check_file(
+_ErrorT = tuple[t.Optional[int], t.Optional[t.Union[int, tuple[int, int]]], str]
+
+# Names linter used by worker processes. It is set once per worker by
+# _init_worker() so that it does not need to be pickled for every file.
+_WORKER_NAMES_LINTER: CollectionNameLinter | None = None
+
+
+def _init_worker(names_linter: CollectionNameLinter | None) -> None:
+    global _WORKER_NAMES_LINTER  # pylint:disable=global-statement
+    _WORKER_NAMES_LINTER = names_linter
+
+
+def _check_content(
+    content: str,
     path: str,
     relpath: str,
     collection_name: str,
     names_linter: CollectionNameLinter | None,
     docs: list[tuple[str, str]],
-    result: list[tuple[str, int | None, int | tuple[int, int] | None, str]],
-) -> list[str]:
+) -> tuple[list[str], list[_ErrorT]]:
+    result: list[_ErrorT] = []
     try:
-        # Load content
-        with open(path, encoding="utf-8") as f:
-            content = f.read()
         # Rstcheck
-        errors = lint_optional_conditions(
-            content=content,
-            path=path,
-            collection_name=collection_name,
+        result.extend(
+            lint_optional_conditions(
+                content=content,
+                path=path,
+                collection_name=collection_name,
+            )
         )
-        result.extend((path, line, col, msg) for (line, col, msg) in errors)
         # Check Ansible names
         errors, doc = load_document_and_optionally_check_antsibull_roles(
             content=content,
             path=path,
             names_linter=names_linter,
         )
-        result.extend((path, line, col, msg) for (line, col, msg) in errors)
-        # Check toctrees
+        result.extend(errors)
+        # Check toctrees (re-using the document parsed above)
         if doc:
-            result.extend(
-                (path, line, col, msg)
-                for line, col, msg in _check_toctrees(doc, relpath, docs)
-            )
+            result.extend(_check_toctrees(doc, relpath, docs))
         # Lint labels
         labels, errors = lint_required_conditions(
             content=content, collection_name=collection_name
         )
-        result.extend((path, line, col, msg) for (line, col, msg) in errors)
-        return labels
+        result.extend(errors)
+        return labels, result
     except Exception as e:  # pylint:disable=broad-except
-        result.append((path, None, None, str(e)))
-        return []
+        result.append((None, None, str(e)))
+        return [], result
+
+
+def _check_content_in_worker(
+    args: tuple[str, str, str, str, list[tuple[str, str]]],
+) -> tuple[list[str], list[_ErrorT]]:
+    content, path, relpath, collection_name, docs = args
+    return _check_content(
+        content, path, relpath, collection_name, _WORKER_NAMES_LINTER, docs
+    )
+
+
+def _get_tool_versions() -> dict[str, str | None]:
+    versions: dict[str, str | None] = {
+        "antsibull-docs": antsibull_docs.__version__,
+        "docutils": docutils.__version__,
+        "sphinx": sphinx.__version__,
+    }
+    for package in ("rstcheck", "rstcheck-core"):
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+class _ExtraDocsLintCache:
+    """
+    Persistent cache of per-file lint results, keyed by the file's content hash and
+    everything else the results depend on.
+    """
+
+    def __init__(
+        self,
+        cache: ResultCache,
+        collection_name: str,
+        names_linter: CollectionNameLinter | None,
+        docs: list[tuple[str, str]],
+    ):
+        self.cache = cache
+        self.base_key = compute_cache_key(
+            _get_tool_versions(),
+            collection_name,
+            names_linter.get_fingerprint() if names_linter else None,
+            sorted(relpath for _, relpath in docs),
+        )
+
+    def get_key(self, content: str, path: str, relpath: str) -> str:
+        return compute_cache_key(
+            self.base_key,
+            path,
+            relpath,
+            hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        )
+
+    def get(self, key: str) -> tuple[list[str], list[_ErrorT]] | None:
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        return data["labels"], [
+            (line, tuple(col) if isinstance(col, list) else col, msg)
+            for line, col, msg in data["errors"]
+        ]
+
+    def set(self, key: str, labels: list[str], errors: list[_ErrorT]) -> None:
+        self.cache.set(key, {"labels": labels, "errors": errors})
+
+
+def _check_files(
+    docs: list[tuple[str, str]],
+    collection_name: str,
+    names_linter: CollectionNameLinter | None,
+    result: list[tuple[str, int | None, int | tuple[int, int] | None, str]],
+) -> set[str]:
+    app_ctx = app_context.app_ctx.get()
+    lib_ctx = app_context.lib_ctx.get()
+    cache = ResultCache.create(app_ctx.cache_dir, "extra-docs-lint")
+    lint_cache = (
+        _ExtraDocsLintCache(cache, collection_name, names_linter, docs)
+        if cache
+        else None
+    )
+
+    file_results: list[tuple[list[str], list[_ErrorT]] | None] = []
+    cache_keys: list[str | None] = []
+    jobs: list[tuple[int, tuple[str, str, str, str, list[tuple[str, str]]]]] = []
+    for index, (doc_path, rel_doc_path) in enumerate(docs):
+        key: str | None = None
+        file_result: tuple[list[str], list[_ErrorT]] | None = None
+        try:
+            with open(doc_path, encoding="utf-8") as f:
+                content = f.read()
+        except Exception as e:  # pylint:disable=broad-except
+            file_result = ([], [(None, None, str(e))])
+        else:
+            if lint_cache:
+                key = lint_cache.get_key(content, doc_path, rel_doc_path)
+                file_result = lint_cache.get(key)
+            if file_result is None:
+                jobs.append(
+                    (index, (content, doc_path, rel_doc_path, collection_name, docs))
+                )
+        file_results.append(file_result)
+        cache_keys.append(key)
+
+    # Parsing RST is CPU bound, so do it in subprocesses if there is more than one file
+    if len(jobs) > 1:
+        with ProcessPoolExecutor(
+            max_workers=lib_ctx.process_max,
+            initializer=_init_worker,
+            initargs=(names_linter,),
+        ) as executor:
+            job_results = list(
+                executor.map(_check_content_in_worker, [args for _, args in jobs])
+            )
+    else:
+        job_results = [
+            _check_content(*args[:4], names_linter, args[4]) for _, args in jobs
+        ]
+
+    for (index, _), job_result in zip(jobs, job_results):
+        file_results[index] = job_result
+        key = cache_keys[index]
+        if lint_cache and key is not None:
+            lint_cache.set(key, *job_result)
+
+    # Collect results in the order of the files
+    all_labels: set[str] = set()
+    for (doc_path, _), file_result in zip(docs, file_results):
+        assert file_result is not None
+        labels, errors = file_result
+        all_labels.update(labels)
+        result.extend((doc_path, line, col, msg) for (line, col, msg) in errors)
+    return all_labels
 
 
 def _lint_toctree(sections: list[Section], docs: list[tuple[str, str]]) -> list[str]:
@@ -460,14 +609,8 @@ def lint_collection_extra_docs_files(
                 )
             ]
     result: list[tuple[str, int | None, int | tuple[int, int] | None, str]] = []
-    all_labels: set[str] = set()
     docs = find_extra_docs(path_to_collection)
-    for doc_path, rel_doc_path in docs:
-        all_labels.update(
-            _check_file(
-                doc_path, rel_doc_path, collection_name, names_linter, docs, result
-            )
-        )
+    _check_files(docs, collection_name, names_linter, result)
     index_path = os.path.join(path_to_collection, "docs", "docsite", "extra-docs.yml")
     try:
         sections, index_errors = load_extra_docs_index(index_path)
@@ -8,9 +8,19 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import os
+import sys
 import typing as t
 from collections import defaultdict
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import (
+    AsyncGenerator,
+    Generator,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Sequence,
+)
 from concurrent.futures import ProcessPoolExecutor
 from string import ascii_uppercase as _CAPITAL_LETTERS_STRING
 
@@ -20,7 +30,10 @@ from antsibull_core.logging import get_module_logger
 from antsibull_core.schemas.collection_meta import CollectionsMetadata
 
 from . import app_context
+from .augment_docs import augment_plugin_record, get_routing_sources
 from .docs_parsing.fqcn import get_fqcn_parts
+from .docs_parsing.routing import CollectionRoutingT
+from .env_variables import find_plugin_env_vars
 from .schemas.docs import DOCS_SCHEMAS
 from .schemas.docs.base import BaseModel
 from .write_docs import BasicPluginInfo
@@ -90,6 +103,12 @@ def _match_prefix(
 
 
 def _exc_to_string(exc: p.ValidationError, model_name: str) -> str:
+    return _errors_to_string(exc.errors(), model_name)
+
+
+def _errors_to_string(
+    errors: Sequence[pydantic_core.ErrorDetails], model_name: str
+) -> str:
     def _display_error_loc(error: pydantic_core.ErrorDetails) -> str:
         # pydantic 2 includes the class name of a t.Union[] in the location list.
         # For example:
@@ -113,13 +132,12 @@ def _exc_to_string(exc: p.ValidationError, model_name: str) -> str:
             result += "".join(f"; {k}={v}" for k, v in ctx.items())
         return result
 
-    def display_errors(errors: list[pydantic_core.ErrorDetails]) -> str:
+    def display_errors(errors: Sequence[pydantic_core.ErrorDetails]) -> str:
         return "\n".join(
             f'{_display_error_loc(e)}\n  {e["msg"]} ({_display_error_type_and_ctx(e)})'
             for e in errors
         )
 
-    errors = exc.errors()
     no_errors = len(errors)
     return (
         f'{no_errors} validation error{"" if no_errors == 1 else "s"} for {model_name}\n'
@@ -140,6 +158,31 @@ def _fix_builtin_plugins(
         doc["name"] = plugin_name.split(".")[-1]
 
 
+#: The fields of a plugin record that are normalized, in the order they are validated.
+_NORMALIZED_FIELDS = ("doc", "examples", "return")
+
+
+@functools.cache
+def _get_plugin_validator(plugin_type: str) -> p.TypeAdapter:
+    """
+    Return a validator for the normalized fields of a plugin record of the given type.
+
+    The validators are created once per (worker) process.
+    """
+    if plugin_type == "role":
+        return p.TypeAdapter(DOCS_SCHEMAS[plugin_type])  # type: ignore[arg-type]
+    schemas: Mapping[str, type[BaseModel]] = DOCS_SCHEMAS[
+        plugin_type
+    ]  # type: ignore[assignment]
+    # The fields of a model are ordered by reversed MRO, so list the bases in reverse
+    # order to obtain the same key order as when validating the fields one by one
+    model = p.create_model(
+        f"{plugin_type.capitalize()}RecordSchema",
+        __base__=tuple(schemas[field] for field in reversed(_NORMALIZED_FIELDS)),
+    )
+    return p.TypeAdapter(model)
+
+
 def normalize_plugin_info(
     plugin_name: str, plugin_type: str, plugin_info: MutableMapping[str, t.Any]
 ) -> tuple[dict[str, t.Any], list[str]]:
@@ -167,9 +210,10 @@ def normalize_plugin_info(
         role_schema: type[BaseModel] = DOCS_SCHEMAS[
             plugin_type
         ]  # type: ignore[attr-defined, assignment]
+        validator = _get_plugin_validator(plugin_type)
         try:
-            parsed = role_schema.model_validate(plugin_info)
-            return parsed.model_dump(by_alias=True), errors
+            parsed = validator.validate_python(plugin_info)
+            return validator.dump_python(parsed, by_alias=True), errors
         except p.ValidationError as e:
             raise ValueError(  # pylint:disable=raise-missing-from
                 _exc_to_string(e, role_schema.__name__)
@@ -178,40 +222,171 @@ def normalize_plugin_info(
     if plugin_name.startswith("ansible.builtin."):
         _fix_builtin_plugins(plugin_name, plugin_type, plugin_info)
 
-    new_info: dict[str, t.Any] = {}
-    # Note: loop through "doc" before any other keys.
-    for field in ("doc", "examples", "return"):
-        schema: type[BaseModel] = DOCS_SCHEMAS[plugin_type][
-            field
-        ]  # type: ignore[index, assignment]
-        try:
-            field_model = schema.model_validate({field: plugin_info.get(field)})
-        except p.ValidationError as e:
-            if field == "doc":
-                # We can't recover if there's not a doc field
-                # pydantic exceptions are not picklable (probably due to bugs in the pickle module)
-                # so convert it to an exception type which is picklable
-                raise ValueError(  # pylint:disable=raise-missing-from
-                    _exc_to_string(e, schema.__name__)
-                )
+    validator = _get_plugin_validator(plugin_type)
+    fields = {field: plugin_info.get(field) for field in _NORMALIZED_FIELDS}
+    try:
+        parsed = validator.validate_python(fields)
+    except p.ValidationError as e:
+        parsed = _validate_with_defaults(plugin_type, fields, e, errors)
+
+    return validator.dump_python(parsed, by_alias=True), errors
+
 
-            # But we can use the default value (some variant of "empty") for everything else
-            # Note: We looped through doc first and returned an exception if doc did not normalize
-            # so we're able to use it in the error message here.
-            errors.append(
-                f'Unable to normalize {new_info["doc"]["name"]}: {field}'
-                f" due to: {_exc_to_string(e, schema.__name__)}"
+def _validate_with_defaults(
+    plugin_type: str,
+    fields: Mapping[str, t.Any],
+    exc: p.ValidationError,
+    errors: list[str],
+) -> t.Any:
+    """
+    Handle a failed validation of the normalized fields of a plugin record.
+
+    Fields other than ``doc`` that failed to validate are replaced by their default
+    values, and a nonfatal error is added to ``errors`` for each of them.
+    """
+    schemas: Mapping[str, type[BaseModel]] = DOCS_SCHEMAS[
+        plugin_type
+    ]  # type: ignore[assignment]
+    field_errors: dict[str, list[pydantic_core.ErrorDetails]] = {}
+    for error in exc.errors():
+        field = str(error["loc"][0]) if error["loc"] else "doc"
+        field_errors.setdefault(field, []).append(error)
+
+    if "doc" in field_errors or not field_errors.keys() <= fields.keys():
+        # We can't recover if there's not a doc field
+        # pydantic exceptions are not picklable (probably due to bugs in the pickle module)
+        # so convert it to an exception type which is picklable
+        raise ValueError(  # pylint:disable=raise-missing-from
+            _errors_to_string(
+                field_errors.get("doc", exc.errors()), schemas["doc"].__name__
             )
+        )
 
-            field_model = DOCS_SCHEMAS[plugin_type][field]()  # type: ignore[index]
+    # But we can use the default value (some variant of "empty") for everything else
+    try:
+        parsed = _get_plugin_validator(plugin_type).validate_python(
+            {
+                field: value
+                for field, value in fields.items()
+                if field not in field_errors
+            }
+        )
+    except p.ValidationError as e:
+        raise ValueError(  # pylint:disable=raise-missing-from
+            _exc_to_string(e, schemas["doc"].__name__)
+        )
+    errors.extend(
+        f"Unable to normalize {parsed.doc.name}: {field}"
+        f" due to: {_errors_to_string(field_errors[field], schemas[field].__name__)}"
+        for field in _NORMALIZED_FIELDS
+        if field in field_errors
+    )
+    return parsed
+
+
+def _normalize_and_augment_plugin_info(
+    plugin_name: str,
+    plugin_type: str,
+    plugin_info: MutableMapping[str, t.Any],
+    routing_sources: Sequence[str],
+) -> tuple[dict[str, t.Any], list[str]]:
+    new_info, errors = normalize_plugin_info(plugin_name, plugin_type, plugin_info)
+    if new_info:
+        augment_plugin_record(plugin_name, plugin_type, new_info, routing_sources)
+    return new_info, errors
+
+
+def _iterate_plugin_records(
+    plugin_info: Mapping[str, Mapping[str, t.Any]], release: bool
+) -> Generator[tuple[str, str, t.Any], None, None]:
+    for plugin_type in list(plugin_info):
+        plugin_list_for_type = plugin_info[plugin_type]
+        for plugin_name in list(plugin_list_for_type):
+            if release:
+                plugin_record = t.cast(
+                    MutableMapping[str, t.Any], plugin_list_for_type
+                ).pop(plugin_name)
+            else:
+                plugin_record = plugin_list_for_type[plugin_name]
+            yield plugin_type, plugin_name, plugin_record
+
+
+async def _normalize_plugins(
+    plugin_info: Mapping[str, Mapping[str, t.Any]],
+    collection_routing: CollectionRoutingT | None,
+    release: bool,
+) -> AsyncGenerator[tuple[str, str, t.Any], None]:
+    """
+    Normalize all plugins in subprocesses and yield the plugin type, plugin name, and
+    the result (or exception) for every plugin as soon as it is available.
+
+    Only a limited number of plugin records are handed to the workers at the same time,
+    so that a record released from ``plugin_info`` is not kept alive longer than needed.
+    """
+    loop = asyncio.get_running_loop()
+    lib_ctx = app_context.lib_ctx.get()
+    max_workers = lib_ctx.process_max or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+
+    all_routing_sources = (
+        get_routing_sources(collection_routing)
+        if collection_routing is not None
+        else None
+    )
 
-        new_info.update(field_model.model_dump(by_alias=True))
+    def submit(
+        plugin_type: str, plugin_name: str, plugin_record: t.Any
+    ) -> asyncio.Future:
+        if all_routing_sources is None:
+            return loop.run_in_executor(
+                executor,
+                normalize_plugin_info,
+                plugin_name,
+                plugin_type,
+                plugin_record,
+            )
+        return loop.run_in_executor(
+            executor,
+            _normalize_and_augment_plugin_info,
+            plugin_name,
+            plugin_type,
+            plugin_record,
+            all_routing_sources.get(plugin_type, {}).get(plugin_name, []),
+        )
 
-    return (new_info, errors)
+    # Normalize each plugin in a subprocess since normalization is CPU bound
+    pending: dict[asyncio.Future, tuple[str, str]] = {}
+    records = _iterate_plugin_records(plugin_info, release)
+    try:
+        while True:
+            for plugin_type, plugin_name, plugin_record in records:
+                pending[submit(plugin_type, plugin_name, plugin_record)] = (
+                    plugin_type,
+                    plugin_name,
+                )
+                if len(pending) >= 4 * max_workers:
+                    break
+            if not pending:
+                break
+            done, dummy = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                plugin_type, plugin_name = pending.pop(future)
+                exc = future.exception()
+                yield plugin_type, plugin_name, (
+                    exc if exc is not None else future.result()
+                )
+    finally:
+        # Also stop the workers if the caller does not consume all results
+        executor.shutdown(cancel_futures=True)
 
 
 async def normalize_all_plugin_info(
     plugin_info: Mapping[str, Mapping[str, t.Any]],
+    collection_routing: CollectionRoutingT | None = None,
+    *,
+    release_plugin_info: bool = False,
 ) -> tuple[dict[str, MutableMapping[str, t.Any]], PluginErrorsRT]:
     """
     Normalize the data in plugin_info so that it is ready to be passed to the templates.
@@ -219,6 +394,13 @@ async def normalize_all_plugin_info(
     :arg plugin_info: Mapping of information about plugins.  This contains information about all of
         the plugins that are to be documented. See the schema in :mod:`antsibull.schemas.docs` for
         the structure of the information.
+    :arg collection_routing: If provided, the normalized plugin records are also augmented
+        in the worker processes with everything ``augment_docs()`` adds, except for the
+        see-also descriptions. ``augment_seealso()`` must be called on the result afterwards.
+    :kwarg release_plugin_info: If set to ``True``, the plugin records are removed from
+        ``plugin_info`` (which must be mutable) when they are handed to the workers, so
+        that the raw and the normalized data do not need to be kept in memory at the
+        same time.
     :returns: A tuple of plugin_info (this is a "copy" of the input plugin_info with all of the
         data normalized) and a mapping of errors.  The plugin_info may have less records than the
         input plugin_info if there were plugin records which failed to validate.  The mapping of
@@ -231,24 +413,24 @@ async def normalize_all_plugin_info(
                     - error string
                     - error string
     """
-    loop = asyncio.get_running_loop()
-    lib_ctx = app_context.lib_ctx.get()
-    executor = ProcessPoolExecutor(max_workers=lib_ctx.process_max)
-
-    # Normalize each plugin in a subprocess since normalization is CPU bound
-    normalizers = {}
-    for plugin_type, plugin_list_for_type in plugin_info.items():
-        for plugin_name, plugin_record in plugin_list_for_type.items():
-            normalizers[(plugin_type, plugin_name)] = loop.run_in_executor(
-                executor, normalize_plugin_info, plugin_name, plugin_type, plugin_record
-            )
-
-    results = await asyncio.gather(*normalizers.values(), return_exceptions=True)
+    # Remember the order of the plugins so that the result does not depend on the order
+    # in which the workers finish
+    order = [
+        (plugin_type, plugin_name)
+        for plugin_type, plugin_list_for_type in plugin_info.items()
+        for plugin_name in plugin_list_for_type
+    ]
+    results: dict[tuple[str, str], t.Any] = {}
+    async for plugin_type, plugin_name, plugin_record in _normalize_plugins(
+        plugin_info, collection_routing, release_plugin_info
+    ):
+        results[(plugin_type, plugin_name)] = plugin_record
 
     new_plugin_info: defaultdict[str, MutableMapping[str, t.Any]]
     new_plugin_info = defaultdict(dict)
     nonfatal_errors: PluginErrorsRT = defaultdict(lambda: defaultdict(list))
-    for (plugin_type, plugin_name), plugin_record in zip(normalizers, results):
+    for plugin_type, plugin_name in order:
+        plugin_record = results.pop((plugin_type, plugin_name))
         # Errors which broke doc parsing (and therefore we won't have enough info to
         # build a docs page)
         if isinstance(plugin_record, BaseException):
@@ -267,6 +449,290 @@ async def normalize_all_plugin_info(
     return new_plugin_info, nonfatal_errors
 
 
+class _Deduplicator:
+    """
+    Replace equal sub-structures of JSON-like data with a single shared instance.
+
+    Only dictionaries, lists, tuples, and strings are shared. Dictionaries are only
+    considered equal if their keys appear in the same order.
+    """
+
+    __slots__ = ("_strings", "_containers", "visited")
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+        # Since all children of a container are deduplicated before the container itself,
+        # the ids of the children are enough to identify its content.
+        self._containers: dict[tuple, t.Any] = {}
+        self.visited = 0
+
+    def deduplicate(self, value: t.Any) -> tuple[t.Any, t.Hashable | None]:
+        """
+        Return the shared instance for a value, together with a key identifying its content.
+        The key is ``None`` if the value cannot be shared.
+        """
+        if isinstance(value, str):
+            value = self._strings.setdefault(value, value)
+            return value, id(value)
+        if value is None or type(value) in (bool, int):
+            return value, (type(value), value)
+        if type(value) is float:
+            # repr() distinguishes 0.0 from -0.0
+            return value, (float, repr(value))
+        if type(value) is dict:
+            content = self._deduplicate_children(value, value.items())
+        elif type(value) is list:
+            content = self._deduplicate_children(value, enumerate(value))
+        elif type(value) is tuple:
+            # Tuples cannot be modified in-place, so deduplicate a list copy instead
+            elements = list(value)
+            content = self._deduplicate_children(elements, enumerate(value))
+            value = tuple(elements)
+        else:
+            return value, None
+        if content is None:
+            return value, None
+        key = (type(value), content)
+        return self._containers.setdefault(key, value), key
+
+    def _deduplicate_children(
+        self, value: t.Any, items: Iterable[tuple[t.Any, t.Any]]
+    ) -> tuple[tuple[t.Any, t.Hashable], ...] | None:
+        self.visited += 1
+        content: list[tuple[t.Any, t.Hashable]] | None = []
+        for index, child in list(items):
+            child, child_key = self.deduplicate(child)
+            value[index] = child
+            if child_key is None:
+                content = None
+            elif content is not None:
+                content.append((index, child_key))
+        return None if content is None else tuple(content)
+
+    @property
+    def unique(self) -> int:
+        return len(self._containers)
+
+
+def deduplicate_plugin_info(
+    plugin_info: Mapping[str, Mapping[str, MutableMapping[str, t.Any]]],
+) -> None:
+    """
+    Let equal parts of normalized plugin records, like options that come from the same
+    documentation fragment, or description lists, share a single object.
+
+    The plugin records are modified in-place. The shared parts must not be modified
+    afterwards.
+
+    :arg plugin_info: Mapping of plugin type to a mapping of plugin name to normalized
+        plugin record.
+    """
+    flog = mlog.fields(func="deduplicate_plugin_info")
+    deduplicator = _Deduplicator()
+    for plugins in plugin_info.values():
+        for plugin_record in plugins.values():
+            for key, value in plugin_record.items():
+                plugin_record[key] = deduplicator.deduplicate(value)[0]
+    flog.fields(visited=deduplicator.visited, unique=deduplicator.unique).debug(
+        "Deduplicated plugin records"
+    )
+
+
+class PluginCatalogueEntry:
+    """
+    Basic information on one plugin, as collected by ``PluginCatalogue``.
+    """
+
+    __slots__ = (
+        "plugin_type",
+        "plugin_name",
+        "collection_name",
+        "short_name",
+        "info",
+        "callback_type",
+        "env_vars",
+    )
+
+    plugin_type: str
+    plugin_name: str
+    collection_name: str
+    short_name: str
+    info: BasicPluginInfo
+    #: The callback type for callback plugins with documentation, ``None`` otherwise.
+    callback_type: str | None
+    #: Environment variables referenced by the plugin's options, together with the
+    #: options' descriptions.
+    env_vars: tuple[tuple[str, list[str] | None], ...]
+
+    def __init__(
+        self,
+        plugin_type: str,
+        plugin_name: str,
+        info: BasicPluginInfo,
+        *,
+        callback_type: str | None = None,
+        env_vars: tuple[tuple[str, list[str] | None], ...] = (),
+    ):
+        namespace, collection, short_name = get_fqcn_parts(plugin_name)
+        self.plugin_type = plugin_type
+        self.plugin_name = plugin_name
+        # There are many plugins per collection, so share the collection name strings
+        self.collection_name = sys.intern(f"{namespace}.{collection}")
+        self.short_name = short_name
+        self.info = info
+        self.callback_type = callback_type
+        self.env_vars = env_vars
+
+    @classmethod
+    def from_plugin_record(
+        cls, plugin_type: str, plugin_name: str, plugin_record: Mapping[str, t.Any]
+    ) -> PluginCatalogueEntry:
+        callback_type = None
+        if plugin_type == "callback" and "doc" in plugin_record:
+            callback_type = plugin_record["doc"].get("type") or None
+        return cls(
+            plugin_type,
+            plugin_name,
+            BasicPluginInfo.from_doc(plugin_record, plugin_type),
+            callback_type=callback_type,
+            env_vars=find_plugin_env_vars(plugin_record),
+        )
+
+
+class PluginCatalogue:
+    """
+    Index of all plugins, built with a single pass over the plugin information.
+
+    The views returned by the properties are computed from the index on first access.
+    """
+
+    entries: Mapping[tuple[str, str], PluginCatalogueEntry]
+
+    def __init__(self, entries: Mapping[tuple[str, str], PluginCatalogueEntry]):
+        self.entries = entries
+        self._plugin_contents: (
+            defaultdict[str, defaultdict[str, dict[str, BasicPluginInfo]]] | None
+        ) = None
+        self._callback_plugin_contents: (
+            defaultdict[str, defaultdict[str, dict[str, BasicPluginInfo]]] | None
+        ) = None
+        self._collection_contents: (
+            defaultdict[str, dict[str, Mapping[str, BasicPluginInfo]]] | None
+        ) = None
+
+    @classmethod
+    def create(
+        cls,
+        plugin_info: Mapping[str, Mapping[str, t.Any]],
+        nonfatal_errors: Mapping[str, Mapping[str, t.Any]],
+    ) -> PluginCatalogue:
+        """
+        Create a catalogue from plugin information.
+
+        :arg plugin_info: Mapping of plugin type to a mapping of plugin name to plugin record.
+        :arg nonfatal_errors: mapping of plugin type to plugin name to list of error messages.
+            Plugins that only appear here are added with empty information.
+        """
+        entries: dict[tuple[str, str], PluginCatalogueEntry] = {}
+        for plugin_type, plugin_dict in plugin_info.items():
+            for plugin_name, plugin_record in plugin_dict.items():
+                entries[(plugin_type, plugin_name)] = (
+                    PluginCatalogueEntry.from_plugin_record(
+                        plugin_type, plugin_name, plugin_record
+                    )
+                )
+
+        # Some plugins won't have an entry in the plugin_info because documentation failed to
+        # parse. Those should be documented in the nonfatal_errors information. They are added
+        # after all other plugins so that the order of the plugins in plugin_info is kept.
+        for plugin_type, plugin_list in nonfatal_errors.items():
+            for plugin_name in plugin_list:
+                if (plugin_type, plugin_name) not in entries:
+                    entries[(plugin_type, plugin_name)] = PluginCatalogueEntry(
+                        plugin_type, plugin_name, BasicPluginInfo.empty()
+                    )
+
+        return cls(entries)
+
+    @property
+    def plugin_contents(
+        self,
+    ) -> defaultdict[str, defaultdict[str, dict[str, BasicPluginInfo]]]:
+        """
+        The collections with their plugins for every plugin type.
+
+        See ``get_plugin_contents()``.
+        """
+        if self._plugin_contents is None:
+            plugin_contents: defaultdict[
+                str, defaultdict[str, dict[str, BasicPluginInfo]]
+            ]
+            plugin_contents = defaultdict(lambda: defaultdict(dict))
+            for entry in self.entries.values():
+                plugin_contents[entry.plugin_type][entry.collection_name][
+                    entry.short_name
+                ] = entry.info
+            self._plugin_contents = plugin_contents
+        return self._plugin_contents
+
+    @property
+    def callback_plugin_contents(
+        self,
+    ) -> defaultdict[str, defaultdict[str, dict[str, BasicPluginInfo]]]:
+        """
+        The collections with their plugins for every callback plugin type.
+
+        See ``get_callback_plugin_contents()``.
+        """
+        if self._callback_plugin_contents is None:
+            callback_plugin_contents: defaultdict[
+                str, defaultdict[str, dict[str, BasicPluginInfo]]
+            ]
+            callback_plugin_contents = defaultdict(lambda: defaultdict(dict))
+            for entry in self.entries.values():
+                if entry.callback_type:
+                    callback_plugin_contents[entry.callback_type][
+                        entry.collection_name
+                    ][entry.short_name] = entry.info
+            self._callback_plugin_contents = callback_plugin_contents
+        return self._callback_plugin_contents
+
+    @property
+    def collection_contents(
+        self,
+    ) -> defaultdict[str, dict[str, Mapping[str, BasicPluginInfo]]]:
+        """
+        The plugins which are in each collection.
+
+        See ``get_collection_contents()``.
+        """
+        if self._collection_contents is None:
+            self._collection_contents = get_collection_contents(self.plugin_contents)
+        return self._collection_contents
+
+    def get_deprecated_plugins(self) -> dict[str, dict[str, BasicPluginInfo]]:
+        """
+        Return a mapping of plugin type to a mapping of plugin FQCN to basic plugin
+        information for all deprecated plugins.
+        """
+        result: dict[str, dict[str, BasicPluginInfo]] = {}
+        for entry in self.entries.values():
+            if entry.info.deprecation:
+                result.setdefault(entry.plugin_type, {})[entry.plugin_name] = entry.info
+        return result
+
+    def get_env_vars(
+        self,
+    ) -> Generator[tuple[str, str, Sequence[tuple[str, list[str] | None]]], None, None]:
+        """
+        Yield plugin type, plugin name, and referenced environment variables for every plugin.
+
+        The result can be passed to ``env_variables.collect_environment_variables()``.
+        """
+        for entry in self.entries.values():
+            yield entry.plugin_type, entry.plugin_name, entry.env_vars
+
+
 def get_plugin_contents(
     plugin_info: Mapping[str, Mapping[str, t.Any]], nonfatal_errors: PluginErrorsRT
 ) -> defaultdict[str, defaultdict[str, dict[str, BasicPluginInfo]]]:
@@ -26,6 +26,8 @@ class DocsAppContext(CoreAppContext):
     indexes: p.StrictBool = True
     use_html_blobs: p.StrictBool = False
     add_antsibull_docs_version: p.StrictBool = True
+    cache_dir: t.Optional[str] = None
+    copy_mode: t.Literal["copy", "link"] = "copy"
 
     collection_url: dict[str, str] = {
         "*": DEFAULT_COLLECTION_URL_TRANSFORM,
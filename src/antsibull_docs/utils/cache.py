@@ -0,0 +1,132 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Simple persistent cache for JSON-serializable results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import typing as t
+
+from antsibull_core.logging import get_module_logger
+
+mlog = get_module_logger(__name__)
+
+
+def compute_cache_key(*parts: t.Any) -> str:
+    """
+    Compute a cache key from JSON-serializable parts.
+    """
+    data = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str | os.PathLike[str]) -> str | None:
+    """
+    Compute the SHA-256 digest of a file's content.
+
+    Returns ``None`` if the file does not exist.
+    """
+    sha256 = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                sha256.update(chunk)
+    except FileNotFoundError:
+        return None
+    return sha256.hexdigest()
+
+
+def hash_files(root: str | os.PathLike[str], paths: t.Iterable[str]) -> str:
+    """
+    Compute a digest of the names and contents of files below ``root``.
+
+    :arg root: The base directory.
+    :arg paths: Paths of files and directories relative to ``root``. Directories are
+        processed recursively. Paths that do not exist are ignored.
+    """
+    entries: list[tuple[str, str | None]] = []
+    for path in sorted(paths):
+        full_path = os.path.join(root, path)
+        if not os.path.isdir(full_path):
+            if os.path.exists(full_path):
+                entries.append((path, hash_file(full_path)))
+            continue
+        for dirpath, dirnames, filenames in os.walk(full_path):
+            dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+            for filename in sorted(filenames):
+                file_path = os.path.join(dirpath, filename)
+                relpath = os.path.relpath(file_path, root).replace(os.sep, "/")
+                entries.append((relpath, hash_file(file_path)))
+    return compute_cache_key(entries)
+
+
+class ResultCache:
+    """
+    Persistent cache that stores JSON-serializable values in a directory.
+
+    Every value is stored in its own file, so the cache can be used from multiple
+    processes at the same time. Values are written atomically.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], name: str):
+        """
+        :arg directory: The base cache directory.
+        :arg name: Name of the subdirectory used for this kind of cached values.
+        """
+        self.directory = os.path.join(directory, name)
+
+    @classmethod
+    def create(
+        cls, directory: str | os.PathLike[str] | None, name: str
+    ) -> ResultCache | None:
+        """
+        Create a cache if ``directory`` is provided, otherwise return ``None``.
+        """
+        if directory is None:
+            return None
+        return cls(os.path.expanduser(directory), name)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> t.Any | None:
+        """
+        Retrieve a cached value. Returns ``None`` if the value is not cached.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exc:
+            flog = mlog.fields(func="ResultCache.get")
+            flog.warning(f"Ignoring invalid cache entry {path!r}: {exc}")
+            return None
+
+    def set(self, key: str, value: t.Any) -> None:
+        """
+        Store a value in the cache. Errors while writing are logged and ignored.
+        """
+        path = self._get_path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, mode=0o755, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(json.dumps(value).encode("utf-8"))
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as exc:
+            flog = mlog.fields(func="ResultCache.set")
+            flog.warning(f"Cannot write cache entry {path!r}: {exc}")
@@ -11,6 +11,7 @@ import contextlib
 import json
 import os
 import shutil
+import subprocess
 import typing as t
 
 from antsibull_core.logging import get_module_logger
@@ -26,11 +27,154 @@ from ..lint_helpers import load_collection_info
 mlog = get_module_logger(__name__)
 
 
+def _list_git_ignored_files(directory: str) -> list[str] | None:
+    """
+    List all files and directories ignored by Git in a directory.
+
+    Directories are listed with a trailing slash. Returns ``None`` in case of errors.
+    """
+    try:
+        result = subprocess.check_output(
+            [
+                "git",
+                "ls-files",
+                "-z",
+                "--others",
+                "--ignored",
+                "--exclude-standard",
+                "--directory",
+            ],
+            cwd=directory,
+            stderr=subprocess.PIPE,
+        ).strip(b"\x00")
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return None
+    if result == b"":
+        return []
+    return [path.decode("utf-8") for path in result.split(b"\x00")]
+
+
+def _is_internal_link(directory: str, link: str) -> bool:
+    if os.path.isabs(link):
+        return False
+    normpath = os.path.normpath(os.path.join(directory, link))
+    return not (normpath == ".." or normpath.startswith(".." + os.sep))
+
+
+def _has_mismatching_layout(source_path: str, namespace: str, name: str) -> bool:
+    """
+    Check whether the collection is stored in an ``ansible_collections`` tree
+    under a different name.
+
+    Ansible resolves symbolic links for some directories. For such a collection,
+    these would be attributed to the wrong collection.
+    """
+    parts = os.path.realpath(source_path).split(os.sep)
+    return (
+        len(parts) >= 3
+        and parts[-3] == "ansible_collections"
+        and (parts[-2], parts[-1]) != (namespace, name)
+    )
+
+
+class _CollectionLinker:
+    """
+    Populate a collection directory with symbolic links to the collection's source.
+
+    Directories that do not contain files ignored by Git are linked as a whole.
+    Directories containing such files are created, and their content is processed
+    recursively, so that ignored files are left out as with ``GitCopier``. Regular
+    files in these directories are copied, and symbolic links that stay inside the
+    collection are recreated, so that plugin filenames reported by ansible-doc look
+    the same as for a copied collection.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        dest: str,
+        *,
+        ignored: list[str],
+        log_debug: t.Callable[[str], None] | None = None,
+    ):
+        self.source = source
+        self.dest = dest
+        self._log_debug = log_debug
+        self.skip: set[str] = {".git"}
+        self.expand: set[str] = set()
+        for path in ignored:
+            path = path.rstrip("/")
+            basename = os.path.basename(path)
+            # Python byte code is ignored by ansible-doc anyway
+            if basename == "__pycache__" or basename.endswith((".pyc", ".pyo")):
+                continue
+            self.skip.add(path)
+        for path in self.skip:
+            if not os.path.lexists(os.path.join(source, path)):
+                continue
+            directory = os.path.dirname(path)
+            while directory not in self.expand:
+                self.expand.add(directory)
+                if not directory:
+                    break
+                directory = os.path.dirname(directory)
+
+    def _do_log_debug(self, msg: str, *args: t.Any) -> None:
+        if self._log_debug:
+            self._log_debug(msg, *args)
+
+    def _link_entry(self, directory: str, entry: os.DirEntry) -> None:
+        relative_path = os.path.join(directory, entry.name)
+        full_dest = os.path.join(self.dest, relative_path)
+        if entry.is_symlink():
+            link = os.readlink(entry.path)
+            if _is_internal_link(directory, link):
+                os.symlink(link, full_dest)
+                return
+            real_source = os.path.realpath(entry.path)
+            if os.path.isdir(real_source):
+                os.symlink(real_source, full_dest, target_is_directory=True)
+            else:
+                shutil.copy2(real_source, full_dest)
+        elif entry.is_dir(follow_symlinks=False):
+            if relative_path in self.expand:
+                self._link_directory(relative_path)
+            else:
+                os.symlink(entry.path, full_dest, target_is_directory=True)
+        else:
+            shutil.copy2(entry.path, full_dest)
+
+    def _link_directory(self, directory: str) -> None:
+        os.mkdir(os.path.join(self.dest, directory), mode=0o700)
+        with os.scandir(os.path.join(self.source, directory)) as entries:
+            for entry in entries:
+                if os.path.join(directory, entry.name) not in self.skip:
+                    self._link_entry(directory, entry)
+
+    def link(self) -> None:
+        if "" not in self.expand:
+            self._do_log_debug("Linking {!r} to {!r}", self.dest, self.source)
+            os.symlink(self.source, self.dest, target_is_directory=True)
+            return
+        self._do_log_debug("Linking content of {!r} into {!r}", self.source, self.dest)
+        self._link_directory("")
+
+
 class CollectionCopier:
+    """
+    Provide a temporary ``ansible_collections`` tree with copies of collections.
+
+    If ``link`` is ``True``, collections are not copied, but the tree is populated
+    with symbolic links to the collections' sources where possible. It falls back
+    to copying if symbolic links cannot be created, or if Ansible would attribute
+    resolved paths to another collection.
+    """
+
     dir: str | None
 
-    def __init__(self):
+    def __init__(self, *, link: bool = False):
         self.dir = None
+        self.link = link
 
     def __enter__(self):
         if self.dir is not None:
@@ -67,8 +211,55 @@ class CollectionCopier:
         os.makedirs(collection_container_dir, exist_ok=True)
 
         collection_dir = os.path.join(collection_container_dir, name)
+        if self.link and self._link_collection(
+            collection_source_path, collection_dir, namespace, name, vcs
+        ):
+            return
         copier.copy(collection_source_path, collection_dir)
 
+    @staticmethod
+    def _link_collection(
+        collection_source_path: str,
+        collection_dir: str,
+        namespace: str,
+        name: str,
+        vcs: str,
+    ) -> bool:
+        flog = mlog.fields(
+            func="CollectionCopier._link_collection",
+            collection_source_path=collection_source_path,
+            namespace=namespace,
+            name=name,
+        )
+        if _has_mismatching_layout(collection_source_path, namespace, name):
+            flog.notice("Collection is stored under a different name, copying it")
+            return False
+
+        ignored: list[str] = []
+        if vcs == "git":
+            git_ignored = _list_git_ignored_files(collection_source_path)
+            if git_ignored is None:
+                flog.notice("Cannot list files ignored by Git, copying collection")
+                return False
+            ignored = git_ignored
+
+        linker = _CollectionLinker(
+            os.path.realpath(collection_source_path),
+            collection_dir,
+            ignored=ignored,
+            log_debug=flog.debug,
+        )
+        try:
+            linker.link()
+        except OSError as exc:
+            flog.notice("Cannot link collection, copying it: {}", exc)
+            if os.path.islink(collection_dir):
+                os.unlink(collection_dir)
+            else:
+                shutil.rmtree(collection_dir, ignore_errors=True)
+            return False
+        return True
+
     def __exit__(self, type_, value, traceback_):
         self_dir = self.dir
         if self_dir is None:
@@ -106,7 +297,15 @@ def load_collection_infos(
     *,
     path_to_collection: str,
     copy_dependencies: bool = True,
+    link_collections: bool = False,
 ) -> t.Generator[tuple[str, str, list[str], list[CollectionLoadError]]]:
+    """
+    Provide a temporary ``ansible_collections`` tree with the collection at
+    ``path_to_collection`` and, if ``copy_dependencies`` is ``True``, its dependencies.
+
+    If ``link_collections`` is ``True``, the tree is populated with symbolic links
+    instead of copies where possible.
+    """
     flog = mlog.fields(func="load_collection_infos")
     flog.notice("Begin loading collection infos")
 
@@ -125,7 +324,7 @@ def load_collection_infos(
     dependencies = sorted(dependencies)
     errors = []
     flog.notice("Start copying collections")
-    with CollectionCopier() as copier:
+    with CollectionCopier(link=link_collections) as copier:
         # Copy collection
         flog.notice("Copying {}.{}", namespace, name)
         copier.add_collection(path_to_collection, namespace, name)
@@ -9,13 +9,19 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import os
 import typing as t
 from collections.abc import Mapping, MutableMapping, Sequence
 
+from antsibull_core.logging import get_module_logger
 from antsibull_core.venv import FakeVenvRunner
 
-from ..augment_docs import augment_docs
+import antsibull_docs
+
+from .. import app_context
+from ..augment_docs import augment_seealso
 from ..docs_parsing import AnsibleCollectionMetadata
+from ..docs_parsing.fast_extractor import UnsupportedPluginError, extract_plugin_info
 from ..docs_parsing.parsing import get_ansible_plugin_info
 from ..docs_parsing.routing import (
     CollectionRoutingT,
@@ -24,16 +30,21 @@ from ..docs_parsing.routing import (
 )
 from ..process_docs import (
     PluginErrorsRT,
+    deduplicate_plugin_info,
     get_collection_contents,
     get_plugin_contents,
     normalize_all_plugin_info,
 )
 from ..write_docs import BasicPluginInfo
 from ..write_docs.plugins import (
+    guess_relative_filename,
     has_broken_docs,
 )
+from .cache import ResultCache, compute_cache_key
 from .collection_copier import CollectionLoadError, load_collection_infos
 
+mlog = get_module_logger(__name__)
+
 ValidCollectionRefs = t.Literal["self", "dependent", "all"]
 
 
@@ -49,58 +60,77 @@ def _get_fqcn_collection_prefix(fqcn: str) -> str:
     return _get_fqcn_collection_name(fqcn) + "."
 
 
-class NameCollection:
-    def _collect_role_option_names(
-        self,
-        plugin: tuple[str, str],
-        options: dict[str, t.Any],
-        entrypoint: str,
-        path_prefixes: list[str],
-    ) -> None:
-        for opt, data in sorted(options.items()):
-            names = [opt]
-            if isinstance(data.get("aliases"), Sequence):
-                names.extend(data["aliases"])
-            paths = [
-                f"{path_prefix}{name}"
-                for name in names
-                for path_prefix in path_prefixes
-            ]
-            for path in paths:
-                self._option_names[
-                    (*plugin, f"{entrypoint}{_ROLE_ENTRYPOINT_SEPARATOR}{path}")
-                ] = data["type"]
-            if "options" in data:
-                self._collect_role_option_names(
-                    plugin,
-                    data["options"],
-                    entrypoint,
-                    [f"{path}{_NAME_SEPARATOR}" for path in paths],
-                )
+class _OptionNode:
+    """
+    Node of an option trie.
 
-    def _collect_option_names(
-        self,
-        plugin: tuple[str, str],
-        options: dict[str, t.Any],
-        path_prefixes: list[str],
-    ) -> None:
+    An option and all its aliases share the same node, so that suboptions are only
+    stored once no matter how many aliases their parents have.
+    """
+
+    __slots__ = ("type", "children")
+
+    def __init__(self, type_: str | None = None):
+        self.type = type_
+        self.children: dict[str, _OptionNode] | None = None
+
+    def add_options(self, options: Mapping[str, t.Any], suboptions_key: str) -> None:
+        if self.children is None:
+            self.children = {}
         for opt, data in sorted(options.items()):
-            names = [opt]
+            node = _OptionNode(data["type"])
+            self.children[opt] = node
             if isinstance(data.get("aliases"), Sequence):
-                names.extend(data["aliases"])
-            paths = [
-                f"{path_prefix}{name}"
-                for name in names
-                for path_prefix in path_prefixes
-            ]
-            for path in paths:
-                self._option_names[(*plugin, path)] = data["type"]
-            if "suboptions" in data:
-                self._collect_option_names(
-                    plugin,
-                    data["suboptions"],
-                    [f"{path}{_NAME_SEPARATOR}" for path in paths],
-                )
+                for alias in data["aliases"]:
+                    self.children[alias] = node
+            if suboptions_key in data:
+                node.add_options(data[suboptions_key], suboptions_key)
+
+    def lookup(self, path: str) -> _OptionNode | None:
+        node: _OptionNode | None = self
+        for name in path.split(_NAME_SEPARATOR):
+            if node is None or node.children is None:
+                return None
+            node = node.children.get(name)
+        return node
+
+    def dump(self) -> list[t.Any]:
+        """
+        Serialize the trie as JSON-compatible data.
+        """
+        children: dict[int, tuple[list[str], _OptionNode]] = {}
+        for name, child in (self.children or {}).items():
+            children.setdefault(id(child), ([], child))[0].append(name)
+        return [
+            self.type,
+            [[names, child.dump()] for names, child in children.values()],
+        ]
+
+    @classmethod
+    def load(cls, data: Sequence[t.Any]) -> _OptionNode:
+        """
+        Restore a trie serialized with ``dump()``.
+        """
+        type_, children = data
+        node = cls(type_)
+        if children:
+            node.children = {}
+            for names, child_data in children:
+                child = cls.load(child_data)
+                for name in names:
+                    node.children[name] = child
+        return node
+
+
+def _split_option_lookup(option_name: str) -> tuple[str | None, str]:
+    entrypoint, sep, path = option_name.partition(_ROLE_ENTRYPOINT_SEPARATOR)
+    if not sep:
+        return None, option_name
+    return entrypoint, path
+
+
+class NameCollection:
+    _fingerprint: str | None
 
     def _collect_return_value_names(
         self, plugin: tuple[str, str], return_values: dict[str, t.Any], path_prefix: str
@@ -114,6 +144,7 @@ class NameCollection:
                 )
 
     def _collect_collection(self, collection_name_or_fqcn: str):
+        self._fingerprint = None
         self._collection_prefixes.add(
             _get_fqcn_collection_prefix(collection_name_or_fqcn)
         )
@@ -121,20 +152,96 @@ class NameCollection:
     def _collect_plugin(
         self, plugin_record: dict[str, t.Any], plugin_fqcn: str, plugin_type: str
     ):
+        self._fingerprint = None
         plugin = (plugin_fqcn, plugin_type)
         self._plugins.add(plugin)
         self._collection_prefixes.add(_get_fqcn_collection_prefix(plugin_fqcn))
         if "doc" in plugin_record and "options" in plugin_record["doc"]:
-            self._collect_option_names(plugin, plugin_record["doc"]["options"], [""])
+            root = _OptionNode()
+            root.add_options(plugin_record["doc"]["options"], "suboptions")
+            self._option_tries[(*plugin, None)] = root
         if "return" in plugin_record:
             self._collect_return_value_names(plugin, plugin_record["return"], "")
         if "entry_points" in plugin_record:
             for entry_point, data in sorted(plugin_record["entry_points"].items()):
                 self._role_entrypoints.add((plugin_fqcn, entry_point))
                 if "options" in data:
-                    self._collect_role_option_names(
-                        plugin, data["options"], entry_point, [""]
-                    )
+                    root = _OptionNode()
+                    root.add_options(data["options"], "options")
+                    self._option_tries[(*plugin, entry_point)] = root
+
+    def _dump_collection(self, collection_name: str) -> dict[str, t.Any]:
+        """
+        Serialize the names of all plugins of a collection as JSON-compatible data.
+        """
+        prefix = _get_fqcn_collection_prefix(collection_name)
+        return {
+            "plugins": sorted(
+                list(plugin) for plugin in self._plugins if plugin[0].startswith(prefix)
+            ),
+            "role_entrypoints": sorted(
+                list(entrypoint)
+                for entrypoint in self._role_entrypoints
+                if entrypoint[0].startswith(prefix)
+            ),
+            "option_tries": [
+                [*key, value.dump()]
+                for key, value in sorted(
+                    self._option_tries.items(),
+                    key=lambda entry: (entry[0][0], entry[0][1], entry[0][2] or ""),
+                )
+                if key[0].startswith(prefix)
+            ],
+            "return_value_names": sorted(
+                [*key, value]
+                for key, value in self._return_value_names.items()
+                if key[0].startswith(prefix)
+            ),
+        }
+
+    def _load_collection(self, collection_name: str, data: Mapping[str, t.Any]):
+        """
+        Add names of a collection serialized with ``_dump_collection()``.
+        """
+        self._collect_collection(collection_name)
+        self._plugins.update(
+            (plugin_fqcn, plugin_type) for plugin_fqcn, plugin_type in data["plugins"]
+        )
+        self._role_entrypoints.update(
+            (plugin_fqcn, entrypoint)
+            for plugin_fqcn, entrypoint in data["role_entrypoints"]
+        )
+        for plugin_fqcn, plugin_type, entrypoint, value in data["option_tries"]:
+            self._option_tries[(plugin_fqcn, plugin_type, entrypoint)] = (
+                _OptionNode.load(value)
+            )
+        for plugin_fqcn, plugin_type, name, value in data["return_value_names"]:
+            self._return_value_names[(plugin_fqcn, plugin_type, name)] = value
+
+    def _remove_collection(self, collection_name: str):
+        """
+        Remove the names of all plugins of a collection.
+        """
+        self._fingerprint = None
+        prefix = _get_fqcn_collection_prefix(collection_name)
+        self._plugins.difference_update(
+            [plugin for plugin in self._plugins if plugin[0].startswith(prefix)]
+        )
+        self._role_entrypoints.difference_update(
+            [
+                entrypoint
+                for entrypoint in self._role_entrypoints
+                if entrypoint[0].startswith(prefix)
+            ]
+        )
+        for key in [key for key in self._option_tries if key[0].startswith(prefix)]:
+            del self._option_tries[key]
+        for rv_key in [
+            rv_key
+            for rv_key in self._return_value_names
+            if rv_key[0].startswith(prefix)
+        ]:
+            del self._return_value_names[rv_key]
 
     def _resolve_plugin_fqcn(self, plugin_fqcn: str, plugin_type: str) -> str:
         try:
@@ -160,20 +267,66 @@ class NameCollection:
         self._plugins: set[tuple[str, str]] = set()
         self._role_entrypoints: set[tuple[str, str]] = set()
         self._collection_prefixes: set[str] = set()
-        self._option_names: dict[tuple[str, str, str], str] = {}
+        self._option_tries: dict[tuple[str, str, str | None], _OptionNode] = {}
         self._return_value_names: dict[tuple[str, str, str], str] = {}
         self._collection_routing: CollectionRoutingT = collection_routing
         self._routing_table: dict[tuple[str, str], str] = {}
+        self._fingerprint = None
+
+    def _set_collection_routing(self, collection_routing: CollectionRoutingT):
+        self._fingerprint = None
+        self._collection_routing = collection_routing
+        self._routing_table.clear()
+
+    def get_fingerprint(self) -> str:
+        """
+        Return a hash of all names in this collection, for use in cache keys.
+        """
+        if self._fingerprint is None:
+            self._fingerprint = compute_cache_key(
+                sorted(self._collection_prefixes),
+                sorted(self._plugins),
+                sorted(self._role_entrypoints),
+                [
+                    [*key, value.dump()]
+                    for key, value in sorted(
+                        self._option_tries.items(),
+                        key=lambda entry: (
+                            entry[0][0],
+                            entry[0][1],
+                            entry[0][2] or "",
+                        ),
+                    )
+                ],
+                sorted(
+                    [*key, value] for key, value in self._return_value_names.items()
+                ),
+                {
+                    plugin_type: {
+                        plugin_fqcn: routing["redirect"]
+                        for plugin_fqcn, routing in plugins.items()
+                        if "redirect" in routing
+                    }
+                    for plugin_type, plugins in self._collection_routing.items()
+                },
+            )
+        return self._fingerprint
 
     def get_option_type(
         self, plugin_fqcn: str, plugin_type: str, option_name: str
     ) -> str | None:
-        key = (
-            self._resolve_plugin_fqcn(plugin_fqcn, plugin_type),
-            plugin_type,
-            option_name,
+        entrypoint, path = _split_option_lookup(option_name)
+        root = self._option_tries.get(
+            (
+                self._resolve_plugin_fqcn(plugin_fqcn, plugin_type),
+                plugin_type,
+                entrypoint,
+            )
         )
-        return self._option_names.get(key)
+        if root is None:
+            return None
+        node = root.lookup(path)
+        return node.type if node is not None else None
 
     def get_return_value_type(
         self, plugin_fqcn: str, plugin_type: str, return_value_name: str
@@ -255,6 +408,94 @@ def _collect_names_impl(
     return name_collection
 
 
+def _get_names_cache_key(
+    collection_name: str,
+    collection_version: str,
+    ansible_core_version: str | None,
+) -> str:
+    return compute_cache_key(
+        collection_name,
+        collection_version,
+        ansible_core_version,
+        antsibull_docs.__version__,
+    )
+
+
+class _NamesCache:
+    """
+    Persistent cache of name tables of collections, keyed by collection name and version.
+    """
+
+    def __init__(self, cache: ResultCache, collection_name: str):
+        self.cache = cache
+        self.collection_name = collection_name
+        self.cached: dict[str, Mapping[str, t.Any]] = {}
+
+    def _get_key(
+        self,
+        collection_name: str,
+        collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+    ) -> str | None:
+        if collection_name == self.collection_name:
+            # The collection that is linted is always loaded
+            return None
+        version = collection_metadata[collection_name].version
+        if version is None:
+            return None
+        core_meta = collection_metadata.get("ansible.builtin")
+        return _get_names_cache_key(
+            collection_name, version, core_meta.version if core_meta else None
+        )
+
+    def load(
+        self, collection_metadata: Mapping[str, AnsibleCollectionMetadata]
+    ) -> list[str]:
+        """
+        Load name tables for all collections from the cache, and return the names
+        of the collections that were found.
+        """
+        for collection_name in collection_metadata:
+            key = self._get_key(collection_name, collection_metadata)
+            if key is None:
+                continue
+            data = self.cache.get(key)
+            if data is not None:
+                self.cached[collection_name] = data
+        return sorted(self.cached)
+
+    def store(
+        self,
+        name_collection: NameCollection,
+        collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+        collections: list[str] | None,
+    ) -> None:
+        """
+        Store the name tables of all collections that were not loaded from the cache.
+        """
+        for collection_name in collection_metadata:
+            if collection_name in self.cached:
+                continue
+            if collections is not None and collection_name not in collections:
+                continue
+            key = self._get_key(collection_name, collection_metadata)
+            if key is not None:
+                self.cache.set(
+                    key,
+                    name_collection._dump_collection(  # pylint: disable=protected-access
+                        collection_name
+                    ),
+                )
+
+    def apply(self, name_collection: NameCollection) -> None:
+        """
+        Add the cached name tables to a name collection.
+        """
+        for collection_name, data in self.cached.items():
+            name_collection._load_collection(  # pylint: disable=protected-access
+                collection_name, data
+            )
+
+
 def collect_names(
     *,
     collection_name: str,
@@ -263,11 +504,20 @@ def collect_names(
     validate_collections_refs: ValidCollectionRefs = "self",
 ) -> tuple[
     NameCollection,
-    Mapping[str, MutableMapping[str, t.Any]],
+    MutableMapping[str, MutableMapping[str, t.Any]],
     PluginErrorsRT,
     Mapping[str, dict[str, Mapping[str, BasicPluginInfo]]],
     Mapping[str, AnsibleCollectionMetadata],
 ]:
+    """
+    Load the documentation of a collection and the collections it references,
+    and collect the names of their plugins, options, return values and role entrypoints.
+
+    If the ``cache_dir`` option is set and ``validate_collections_refs`` is not ``self``,
+    the names of other collections with a version are cached there. ansible-doc is
+    then only run for collections whose names are not cached yet. Plugin records of
+    these collections are not part of the returned data.
+    """
     # Compile a list of collections that the collection depends on, and make
     # sure that ansible.builtin is on it
     collections = list(dependencies)
@@ -275,6 +525,13 @@ def collect_names(
     collections.append("ansible.builtin")
     collections = sorted(set(collections))
 
+    app_ctx = app_context.app_ctx.get()
+    names_cache: _NamesCache | None = None
+    if validate_collections_refs != "self":
+        cache = ResultCache.create(app_ctx.cache_dir, "collection-names")
+        if cache is not None:
+            names_cache = _NamesCache(cache, collection_name)
+
     # Load collection docs
     venv = FakeVenvRunner()
     plugin_info, collection_metadata = asyncio.run(
@@ -287,6 +544,7 @@ def collect_names(
                 else collections if validate_collections_refs == "dependent" else None
             ),
             fetch_all_installed=validate_collections_refs == "all",
+            exclude_collections=names_cache.load if names_cache else None,
         )
     )
 
@@ -295,25 +553,35 @@ def collect_names(
     # Process data
     remove_redirect_duplicates(plugin_info, collection_routing)
     new_plugin_info, nonfatal_errors = asyncio.run(
-        normalize_all_plugin_info(plugin_info)
+        normalize_all_plugin_info(
+            plugin_info, collection_routing, release_plugin_info=True
+        )
     )
-    augment_docs(new_plugin_info, collection_routing)
+    augment_seealso(new_plugin_info)
     # More processing
     plugin_contents = get_plugin_contents(new_plugin_info, nonfatal_errors)
     collection_to_plugin_info = get_collection_contents(plugin_contents)
     for collection in collection_metadata:
         collection_to_plugin_info[collection]  # pylint:disable=pointless-statement
     # Collect all option and return value names
-    return (
-        _collect_names_impl(
-            new_plugin_info,
-            collection_to_plugin_info,
-            collection_name,
-            collections,
+    name_collection = _collect_names_impl(
+        new_plugin_info,
+        collection_to_plugin_info,
+        collection_name,
+        collections,
+        collection_metadata,
+        validate_collections_refs,
+        collection_routing,
+    )
+    if names_cache:
+        names_cache.store(
+            name_collection,
             collection_metadata,
-            validate_collections_refs,
-            collection_routing,
-        ),
+            None if validate_collections_refs == "all" else collections,
+        )
+        names_cache.apply(name_collection)
+    return (
+        name_collection,
         new_plugin_info,
         nonfatal_errors,
         collection_to_plugin_info,
@@ -326,10 +594,12 @@ def load_name_collection(
     *,
     path_to_collection: str,
     validate_collections_refs: ValidCollectionRefs = "self",
+    link_collections: bool = False,
 ) -> t.Generator[tuple[NameCollection, list[CollectionLoadError]]]:
     with load_collection_infos(
         path_to_collection=path_to_collection,
         copy_dependencies=validate_collections_refs != "all",
+        link_collections=link_collections,
     ) as (
         collection_name,
         collections_dir,
@@ -346,9 +616,238 @@ def load_name_collection(
         yield name_collection, errors
 
 
+def _get_plugin_files(
+    *,
+    collection_name: str,
+    new_plugin_info: Mapping[str, Mapping[str, t.Any]],
+    collection_to_plugin_info: Mapping[
+        str, Mapping[str, Mapping[str, BasicPluginInfo]]
+    ],
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+) -> dict[str, tuple[str, str]]:
+    result: dict[str, tuple[str, str]] = {}
+    for plugin_type, plugins_dict in collection_to_plugin_info[collection_name].items():
+        for plugin_short_name in plugins_dict:
+            plugin_name = f"{collection_name}.{plugin_short_name}"
+            filename = guess_relative_filename(
+                new_plugin_info[plugin_type].get(plugin_name) or {},
+                plugin_short_name,
+                plugin_type,
+                collection_name,
+                collection_metadata[collection_name],
+            )
+            if plugin_type == "role":
+                filename = os.path.dirname(filename)
+            else:
+                # Documentation can also be in a sidecar file
+                filename = os.path.splitext(filename)[0]
+            filename = os.path.normpath(filename).replace(os.sep, "/")
+            result[filename] = (plugin_type, plugin_name)
+    return result
+
+
+def find_changed_plugins(
+    changed_files: t.Iterable[str],
+    *,
+    collection_name: str,
+    new_plugin_info: Mapping[str, Mapping[str, t.Any]],
+    collection_to_plugin_info: Mapping[
+        str, Mapping[str, Mapping[str, BasicPluginInfo]]
+    ],
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+) -> set[tuple[str, str]] | None:
+    """
+    Given changed files of a collection (relative to its root, with ``/`` as path
+    separator), determine the plugins (tuples of plugin type and FQCN) whose
+    documentation might have changed.
+
+    Returns ``None`` if a file cannot be attributed to a known plugin, for example for
+    doc fragments or new plugins.
+    """
+    plugin_files = _get_plugin_files(
+        collection_name=collection_name,
+        new_plugin_info=new_plugin_info,
+        collection_to_plugin_info=collection_to_plugin_info,
+        collection_metadata=collection_metadata,
+    )
+    changed_plugins: set[tuple[str, str]] = set()
+    for path in changed_files:
+        parts = path.split("/")
+        if parts[0] == "roles":
+            key = "/".join(parts[:3])
+        else:
+            key = os.path.splitext(path)[0]
+        plugin = plugin_files.get(key)
+        if plugin is None:
+            # Doc fragments, new plugins, ...
+            return None
+        changed_plugins.add(plugin)
+    return changed_plugins
+
+
+def _load_plugin_info(
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+    collection_name: str,
+    collections_dir: str | None,
+    extract_plugins: t.Collection[tuple[str, str]] | None,
+) -> tuple[MutableMapping[str, MutableMapping[str, t.Any]], bool]:
+    """
+    Load the plugin information of a collection. If ``extract_plugins`` is provided,
+    try to extract only the documentation of these plugins without ansible-doc first.
+
+    The second component of the return value is ``False`` if only the plugins in
+    ``extract_plugins`` have been loaded.
+    """
+    if extract_plugins is not None:
+        try:
+            return extract_plugin_info(extract_plugins, collection_metadata), False
+        except UnsupportedPluginError as exc:
+            flog = mlog.fields(func="_load_plugin_info")
+            flog.notice(f"Cannot extract documentation without ansible-doc: {exc}")
+    venv = FakeVenvRunner()
+    plugin_info, dummy_ = asyncio.run(
+        get_ansible_plugin_info(
+            venv, collections_dir, collection_names=[collection_name]
+        )
+    )
+    return plugin_info, True
+
+
+def reload_collection_plugin_info(
+    *,
+    new_plugin_info: MutableMapping[str, MutableMapping[str, t.Any]],
+    nonfatal_errors: PluginErrorsRT,
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+    collection_name: str,
+    collections_dir: str | None,
+    changed_plugins: t.Collection[tuple[str, str]] | None = None,
+    fast_extraction: bool = False,
+) -> CollectionRoutingT:
+    """
+    Reload the documentation of the collection ``collection_name`` after it has been
+    modified, and update ``new_plugin_info`` and ``nonfatal_errors`` in-place.
+
+    The data of all other collections is kept. ansible-doc has no way to extract the
+    documentation of a single plugin in the metadata dump format, so the documentation
+    of all plugins of the collection is extracted again. Only the plugins in
+    ``changed_plugins`` (tuples of plugin type and FQCN) and plugins that have been added
+    or removed are normalized again. If ``changed_plugins`` is ``None``, all plugins of
+    the collection are normalized again.
+
+    If ``fast_extraction`` is ``True`` and ``changed_plugins`` is provided, the
+    documentation of the changed plugins is extracted directly from the plugin files
+    instead of calling ansible-doc, if that is possible without changing the result.
+
+    Returns the new collection routing information.
+    """
+    prefix = _get_fqcn_collection_prefix(collection_name)
+
+    # Load collection docs
+    plugin_info, complete = _load_plugin_info(
+        collection_metadata,
+        collection_name,
+        collections_dir,
+        changed_plugins if fast_extraction else None,
+    )
+    # Load routing information
+    collection_routing = asyncio.run(load_all_collection_routing(collection_metadata))
+    # Process data
+    remove_redirect_duplicates(plugin_info, collection_routing)
+
+    # Normalize changed and new plugins, and remove plugins that no longer exist
+    changed_plugin_info: dict[str, MutableMapping[str, t.Any]] = {}
+    for plugin_type, plugins in plugin_info.items():
+        old_plugins = new_plugin_info.setdefault(plugin_type, {})
+        known_plugins = {*old_plugins, *nonfatal_errors.get(plugin_type, {})}
+        changed_plugin_info[plugin_type] = {
+            plugin_name: plugin_data
+            for plugin_name, plugin_data in plugins.items()
+            if changed_plugins is None
+            or (plugin_type, plugin_name) in changed_plugins
+            or plugin_name not in known_plugins
+        }
+        for plugin_name in known_plugins:
+            if plugin_name.startswith(prefix) and (
+                (complete and plugin_name not in plugins)
+                or plugin_name in changed_plugin_info[plugin_type]
+            ):
+                old_plugins.pop(plugin_name, None)
+                nonfatal_errors[plugin_type].pop(plugin_name, None)
+    changed_new_plugin_info, changed_nonfatal_errors = asyncio.run(
+        normalize_all_plugin_info(
+            changed_plugin_info, collection_routing, release_plugin_info=True
+        )
+    )
+    for plugin_type, plugins in changed_new_plugin_info.items():
+        new_plugin_info[plugin_type].update(plugins)
+    for plugin_type, plugin_errors in changed_nonfatal_errors.items():
+        nonfatal_errors[plugin_type].update(plugin_errors)
+    # Filling in seealso entries needs all plugins
+    augment_seealso(new_plugin_info)
+    deduplicate_plugin_info(new_plugin_info)
+    return collection_routing
+
+
+def update_collection_names(
+    *,
+    name_collection: NameCollection,
+    new_plugin_info: MutableMapping[str, MutableMapping[str, t.Any]],
+    nonfatal_errors: PluginErrorsRT,
+    collection_metadata: Mapping[str, AnsibleCollectionMetadata],
+    collection_name: str,
+    collections_dir: str | None,
+    changed_plugins: t.Collection[tuple[str, str]] | None = None,
+    fast_extraction: bool = False,
+) -> Mapping[str, dict[str, Mapping[str, BasicPluginInfo]]]:
+    """
+    Reload the documentation of the collection ``collection_name`` after it has been
+    modified (see ``reload_collection_plugin_info()``), and update the data returned
+    by ``collect_names()`` in-place.
+
+    Returns the new mapping of collections to plugin information.
+    """
+    prefix = _get_fqcn_collection_prefix(collection_name)
+
+    collection_routing = reload_collection_plugin_info(
+        new_plugin_info=new_plugin_info,
+        nonfatal_errors=nonfatal_errors,
+        collection_metadata=collection_metadata,
+        collection_name=collection_name,
+        collections_dir=collections_dir,
+        changed_plugins=changed_plugins,
+        fast_extraction=fast_extraction,
+    )
+    name_collection._set_collection_routing(  # pylint: disable=protected-access
+        collection_routing
+    )
+
+    # More processing
+    plugin_contents = get_plugin_contents(new_plugin_info, nonfatal_errors)
+    collection_to_plugin_info = get_collection_contents(plugin_contents)
+    for collection in collection_metadata:
+        collection_to_plugin_info[collection]  # pylint:disable=pointless-statement
+
+    # Update names of the collection
+    name_collection._remove_collection(  # pylint: disable=protected-access
+        collection_name
+    )
+    for plugin_type, plugins_dict in collection_to_plugin_info[collection_name].items():
+        for plugin_short_name in plugins_dict:
+            plugin_name = f"{prefix}{plugin_short_name}"
+            plugin_record = new_plugin_info[plugin_type].get(plugin_name) or {}
+            if not has_broken_docs(plugin_record, plugin_type):
+                name_collection._collect_plugin(  # pylint: disable=protected-access
+                    plugin_record, plugin_name, plugin_type
+                )
+    return collection_to_plugin_info
+
+
 __all__ = (
     "NameCollection",
     "ValidCollectionRefs",
     "collect_names",
+    "find_changed_plugins",
     "load_name_collection",
+    "reload_collection_plugin_info",
+    "update_collection_names",
 )
@@ -0,0 +1,128 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Detect changed files by polling with stat().
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import typing as t
+
+_IGNORED_DIRECTORIES = frozenset(
+    [
+        ".git",
+        ".nox",
+        ".tox",
+        "__pycache__",
+    ]
+)
+
+_FileStateT = tuple[int, int, int]
+
+
+def is_ignored_in_collection(path: str) -> bool:
+    """
+    Ignore callback for ``FileWatcher`` that only watches the files of a collection which
+    affect its documentation.
+    """
+    parts = path.split("/")
+    if parts[0] in ("galaxy.yml", "MANIFEST.json", "meta", "plugins"):
+        return False
+    if parts[0] == "docs":
+        return len(parts) > 1 and parts[1] != "docsite"
+    if parts[0] == "roles":
+        return len(parts) > 2 and parts[2] != "meta"
+    return True
+
+
+class FileWatcher:
+    """
+    Watch a directory tree for changed, added and removed files.
+
+    This only uses ``os.scandir()`` and ``stat()``, so it works on every platform and
+    file system, without needing inotify or similar mechanisms.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        *,
+        ignore: t.Callable[[str], bool] | None = None,
+    ):
+        """
+        :arg root: The directory to watch.
+        :arg ignore: Optional callback that is called with paths relative to ``root``.
+            Files and directories for which it returns ``True`` are not watched.
+
+        All paths relative to ``root`` use ``/`` as the path separator.
+        """
+        self.root = root
+        self._ignore = ignore
+        self._state = self._scan()
+
+    def _scan_directory(
+        self, path: str, relpath: str, state: dict[str, _FileStateT]
+    ) -> None:
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            entry_relpath = f"{relpath}/{entry.name}" if relpath else entry.name
+            if self._ignore and self._ignore(entry_relpath):
+                continue
+            try:
+                if entry.is_dir():
+                    if entry.name not in _IGNORED_DIRECTORIES:
+                        self._scan_directory(entry.path, entry_relpath, state)
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            state[entry_relpath] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _scan(self) -> dict[str, _FileStateT]:
+        state: dict[str, _FileStateT] = {}
+        self._scan_directory(self.root, "", state)
+        return state
+
+    def poll(self) -> set[str]:
+        """
+        Return the paths (relative to the root) of all files that have been changed,
+        added or removed since the last call, resp. since the watcher was created.
+        """
+        old_state = self._state
+        self._state = new_state = self._scan()
+        changed = {
+            path
+            for path, file_state in new_state.items()
+            if old_state.get(path) != file_state
+        }
+        changed.update(path for path in old_state if path not in new_state)
+        return changed
+
+    def wait_for_changes(
+        self,
+        interval: float = 1.0,
+        *,
+        sleep: t.Callable[[float], t.Any] = time.sleep,
+    ) -> set[str]:
+        """
+        Poll every ``interval`` seconds until at least one file changed, and return the
+        changed files.
+
+        Once a change has been found, polling continues until the tree has been stable for
+        one interval, so that a batch of changes (for example by ``git checkout``) is
+        reported at once.
+        """
+        changed: set[str] = set()
+        while True:
+            sleep(interval)
+            new_changes = self.poll()
+            if changed and not new_changes:
+                return changed
+            changed.update(new_changes)
@@ -9,14 +9,19 @@ from __future__ import annotations
 
 import os
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
+from antsibull_core import app_context
 from antsibull_core.logging import get_module_logger
-from jinja2 import Template
+from jinja2 import Environment, Template
 
 import antsibull_docs
 
+from ..jinja2 import FilenameGenerator, OutputFormat
+from ..jinja2.environment import doc_environment
 from ..schemas.docs.base import DeprecationSchema, DocSchema
+from ..utils.collection_name_transformer import CollectionNameTransformer
 from ..utils.text import sanitize_whitespace as _sanitize_whitespace
 from .io import Output
 
@@ -24,6 +29,8 @@ mlog = get_module_logger(__name__)
 
 
 class BasicPluginInfo:
+    __slots__ = ("short_description", "deprecation")
+
     short_description: str
     deprecation: DeprecationSchema | None
 
@@ -93,6 +100,62 @@ def _render_template(
         raise RuntimeError(f"Error while rendering {_name}") from exc
 
 
+# Template environment used by worker processes of executors created by
+# create_template_executor(). It is set once per worker by _init_template_worker()
+# so that the templates are only compiled once per worker.
+_WORKER_ENVIRONMENT: Environment | None = None
+
+
+def _init_template_worker(
+    collection_url: CollectionNameTransformer,
+    collection_install: CollectionNameTransformer,
+    output_format: OutputFormat,
+    filename_generator: FilenameGenerator,
+    referable_envvars: set[str] | None,
+) -> None:
+    global _WORKER_ENVIRONMENT  # pylint:disable=global-statement
+    _WORKER_ENVIRONMENT = doc_environment(
+        collection_url=collection_url,
+        collection_install=collection_install,
+        referable_envvars=referable_envvars,
+        output_format=output_format,
+        filename_generator=filename_generator,
+    )
+
+
+def _get_worker_template(template_name: str) -> Template:
+    assert _WORKER_ENVIRONMENT is not None
+    return _WORKER_ENVIRONMENT.get_template(template_name)
+
+
+def create_template_executor(
+    *,
+    collection_url: CollectionNameTransformer,
+    collection_install: CollectionNameTransformer,
+    output_format: OutputFormat,
+    filename_generator: FilenameGenerator,
+    referable_envvars: set[str] | None = None,
+) -> ProcessPoolExecutor:
+    """
+    Create an executor whose worker processes render templates.
+
+    Every worker creates one template environment, which is shared by all pages rendered
+    in that worker. The caller must shut the executor down when done.
+    """
+    lib_ctx = app_context.lib_ctx.get()
+    return ProcessPoolExecutor(
+        max_workers=lib_ctx.process_max,
+        initializer=_init_template_worker,
+        initargs=(
+            collection_url,
+            collection_install,
+            output_format,
+            filename_generator,
+            referable_envvars,
+        ),
+    )
+
+
 def _get_collection_dir(
     output: Output,
     namespace: str,
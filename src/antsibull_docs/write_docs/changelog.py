@@ -10,7 +10,9 @@ from __future__ import annotations
 import asyncio
 import os
 from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
 
+import antsibull_changelog
 import asyncio_pool  # type: ignore[import]
 from antsibull_changelog.changes import load_changes
 from antsibull_changelog.config import ChangelogConfig, CollectionDetails, PathsConfig
@@ -18,24 +20,88 @@ from antsibull_changelog.rendering.changelog import (
     ChangelogGenerator,
     create_document_renderer,
 )
-from antsibull_core import app_context
 from antsibull_core.logging import get_module_logger
 
+from .. import app_context
 from ..docs_parsing import AnsibleCollectionMetadata
 from ..jinja2 import OutputFormat
 from ..rst_labels import get_collection_ref
+from ..utils.cache import ResultCache, compute_cache_key, hash_file
 from . import CollectionInfoT, _get_collection_dir
 from .io import Output
 
 mlog = get_module_logger(__name__)
 
 
+def _render_changelog(
+    collection_name: str,
+    collection_path: str,
+    collection_version: str | None,
+    flatmap: bool | None,
+    output_format: OutputFormat,
+) -> tuple[str, list[str]]:
+    """
+    Load and render a collection's changelog.
+
+    This is CPU bound and is run in a subprocess.
+
+    :returns: A tuple of the rendered changelog and a list of warnings.
+    """
+    paths = PathsConfig.force_collection(collection_path)
+
+    collection_details = CollectionDetails(paths)
+    collection_details.namespace, collection_details.name = collection_name.split(
+        ".", 1
+    )
+    collection_details.version = collection_version
+    collection_details.flatmap = flatmap
+
+    config = ChangelogConfig.default(paths, collection_details)
+    config.title = collection_name.title()
+    config.use_fqcn = True
+    config.mention_ancestor = True
+    config.flatmap = flatmap
+
+    changes = load_changes(config)
+
+    if not changes.has_release:
+        return f"The changelog of {collection_name} is empty.", []
+
+    generator = ChangelogGenerator(config, changes)
+
+    renderer = create_document_renderer(output_format.changelog_format)
+    generator.generate(renderer)
+
+    return renderer.render(), list(renderer.get_warnings())
+
+
+def _get_changelog_cache_key(
+    collection_name: str,
+    collection_metadata: AnsibleCollectionMetadata,
+    output_format: OutputFormat,
+) -> str:
+    changelog_hash = hash_file(
+        os.path.join(collection_metadata.path, "changelogs", "changelog.yaml")
+    )
+    return compute_cache_key(
+        collection_name,
+        collection_metadata.version,
+        changelog_hash,
+        collection_metadata.docs_config.flatmap,
+        output_format.output_format,
+        antsibull_changelog.__version__,
+    )
+
+
 async def write_changelog(
     output: Output,
     collection_name: str,
     collection_dir: str,
     collection_metadata: AnsibleCollectionMetadata,
     output_format: OutputFormat,
+    *,
+    executor: Executor | None = None,
+    cache: ResultCache | None = None,
 ):
     """
     Write a changelog for each collection.
@@ -44,39 +110,41 @@ async def write_changelog(
     :arg collection_dir: The destination directory to output the changelog into.
     :arg collection_metadata: Metadata for the collection.
     :arg output_format: The output format to use.
+    :kwarg executor: Executor to load and render the changelog in. If not provided, the
+        event loop's default executor is used.
+    :kwarg cache: If provided, rendered changelogs are cached in it, keyed by the collection's
+        version and the hash of ``changelogs/changelog.yaml``.
     """
     flog = mlog.fields(func="write_changelog")
     flog.debug("Enter")
 
-    try:
-        paths = PathsConfig.force_collection(collection_metadata.path)
-
-        collection_details = CollectionDetails(paths)
-        collection_details.namespace, collection_details.name = collection_name.split(
-            ".", 1
+    cache_key = None
+    cached = None
+    if cache is not None:
+        cache_key = _get_changelog_cache_key(
+            collection_name, collection_metadata, output_format
         )
-        collection_details.version = collection_metadata.version
-        collection_details.flatmap = collection_metadata.docs_config.flatmap
-
-        config = ChangelogConfig.default(paths, collection_details)
-        config.title = collection_name.title()
-        config.use_fqcn = True
-        config.mention_ancestor = True
-        config.flatmap = collection_metadata.docs_config.flatmap
-
-        changes = load_changes(config)
+        cached = cache.get(cache_key)
 
-        if not changes.has_release:
-            changelog_contents = f"The changelog of {collection_name} is empty."
+    try:
+        if cached is not None:
+            flog.debug(f"Using cached changelog for {collection_name}")
+            changelog_contents, warnings = cached
         else:
-            generator = ChangelogGenerator(config, changes)
-
-            renderer = create_document_renderer(output_format.changelog_format)
-            generator.generate(renderer)
-
-            changelog_contents = renderer.render()
-            for warning in renderer.get_warnings():
-                flog.warning(warning)
+            loop = asyncio.get_running_loop()
+            changelog_contents, warnings = await loop.run_in_executor(
+                executor,
+                _render_changelog,
+                collection_name,
+                collection_metadata.path,
+                collection_metadata.version,
+                collection_metadata.docs_config.flatmap,
+                output_format,
+            )
+            if cache is not None and cache_key is not None:
+                cache.set(cache_key, [changelog_contents, warnings])
+        for warning in warnings:
+            flog.warning(warning)
     except Exception as exc:  # pylint: disable=broad-exception-caught
         flog.warning(f"Error while processing changelog for {collection_name}: {exc}")
         changelog_contents = f"""
@@ -125,34 +193,41 @@ async def output_changelogs(
         collection_metadata = {}
 
     writers = []
+    app_ctx = app_context.app_ctx.get()
     lib_ctx = app_context.lib_ctx.get()
-
-    async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
-        for collection_name in collection_to_plugin_info:
-            metadata = collection_metadata[collection_name]
-            if not metadata.docs_config.changelog.write_changelog:
-                continue
-
-            namespace, collection = collection_name.split(".", 1)
-            collection_dir = _get_collection_dir(
-                output,
-                namespace,
-                collection,
-                squash_hierarchy=squash_hierarchy,
-                create_if_not_exists=True,
-            )
-            writers.append(
-                await pool.spawn(
-                    write_changelog(
-                        output,
-                        collection_name,
-                        collection_dir,
-                        collection_metadata[collection_name],
-                        output_format,
+    cache = ResultCache.create(app_ctx.cache_dir, "changelogs")
+
+    # Loading and rendering changelogs is CPU bound, so do it in subprocesses. The
+    # executor only starts them once the first changelog that is not cached is submitted.
+    with ProcessPoolExecutor(max_workers=lib_ctx.process_max) as executor:
+        async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
+            for collection_name in collection_to_plugin_info:
+                metadata = collection_metadata[collection_name]
+                if not metadata.docs_config.changelog.write_changelog:
+                    continue
+
+                namespace, collection = collection_name.split(".", 1)
+                collection_dir = _get_collection_dir(
+                    output,
+                    namespace,
+                    collection,
+                    squash_hierarchy=squash_hierarchy,
+                    create_if_not_exists=True,
+                )
+                writers.append(
+                    await pool.spawn(
+                        write_changelog(
+                            output,
+                            collection_name,
+                            collection_dir,
+                            collection_metadata[collection_name],
+                            output_format,
+                            executor=executor,
+                            cache=cache,
+                        )
                     )
                 )
-            )
 
-        await asyncio.gather(*writers)
+            await asyncio.gather(*writers)
 
     flog.debug("Leave")
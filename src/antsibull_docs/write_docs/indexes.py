@@ -10,7 +10,9 @@ from __future__ import annotations
 import asyncio
 import os
 import os.path
+import typing as t
 from collections.abc import Mapping
+from concurrent.futures import Executor
 
 import asyncio_pool  # type: ignore[import]
 from antsibull_core import app_context
@@ -22,20 +24,67 @@ from ..env_variables import EnvironmentVariableInfo
 from ..jinja2 import FilenameGenerator, OutputFormat
 from ..jinja2.environment import doc_environment, get_template_filename
 from ..utils.collection_name_transformer import CollectionNameTransformer
-from . import BasicPluginInfo, PluginCollectionInfoT, _render_template
+from . import (
+    BasicPluginInfo,
+    PluginCollectionInfoT,
+    _get_worker_template,
+    _render_template,
+)
 from .io import Output
 
 mlog = get_module_logger(__name__)
 
 
+def _render_template_in_worker(
+    template_name: str,
+    dest_filename: str,
+    add_version: bool,
+    kwargs: Mapping[str, t.Any],
+) -> str:
+    return _render_template(
+        _get_worker_template(template_name),
+        dest_filename,
+        add_version=add_version,
+        **kwargs,
+    )
+
+
+async def _render_index(
+    template: Template | str,
+    dest_filename: str,
+    executor: Executor | None,
+    /,
+    *,
+    add_version: bool,
+    **kwargs,
+) -> str:
+    if isinstance(template, Template):
+        return _render_template(
+            template, dest_filename, add_version=add_version, **kwargs
+        )
+    if executor is None:
+        raise ValueError(f"Need an executor to render template {template!r}")
+    # Rendering large lists is CPU bound, so do it in a worker
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        _render_template_in_worker,
+        template,
+        dest_filename,
+        add_version,
+        kwargs,
+    )
+
+
 async def write_callback_type_index(
     callback_type: str,
     per_collection_plugins: Mapping[str, Mapping[str, BasicPluginInfo]],
-    template: Template,
+    template: Template | str,
     output: Output,
     dest_filename: str,
     for_official_docsite: bool = False,
     add_version: bool = True,
+    executor: Executor | None = None,
 ) -> None:
     """
     Write an index page for each plugin type.
@@ -43,16 +92,20 @@ async def write_callback_type_index(
     :arg callback_type: The callback plugin type to write the index for.
     :arg per_collection_plugins: Mapping of collection_name to Mapping of plugin_name to
         short_description.
-    :arg template: A template to render the plugin index.
+    :arg template: A template to render the plugin index, or the name of a template to
+        render in ``executor``.
     :arg dest_filename: The destination filename.
     :kwarg for_official_docsite: Default False.  Set to True to use wording specific for the
         official docsite on docs.ansible.com.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg executor: An executor created by :func:`create_template_executor`. Must be
+        provided if ``template`` is a template name.
     """
-    index_contents = _render_template(
+    index_contents = await _render_index(
         template,
         dest_filename,
+        executor,
         callback_type=callback_type,
         per_collection_plugins=per_collection_plugins,
         for_official_docsite=for_official_docsite,
@@ -67,11 +120,12 @@ async def write_plugin_type_index(
     per_collection_plugins: Mapping[str, Mapping[str, BasicPluginInfo]],
     # pylint:disable-next=unused-argument
     collection_metadata: Mapping[str, AnsibleCollectionMetadata],
-    template: Template,
+    template: Template | str,
     output: Output,
     dest_filename: str,
     for_official_docsite: bool = False,
     add_version: bool = True,
+    executor: Executor | None = None,
 ) -> None:
     """
     Write an index page for each plugin type.
@@ -80,16 +134,20 @@ async def write_plugin_type_index(
     :arg per_collection_plugins: Mapping of collection_name to Mapping of plugin_name to
         short_description.
     :arg collection_metadata: Dictionary mapping collection names to collection metadata objects.
-    :arg template: A template to render the plugin index.
+    :arg template: A template to render the plugin index, or the name of a template to
+        render in ``executor``.
     :arg dest_filename: The destination filename.
     :kwarg for_official_docsite: Default False.  Set to True to use wording specific for the
         official docsite on docs.ansible.com.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg executor: An executor created by :func:`create_template_executor`. Must be
+        provided if ``template`` is a template name.
     """
-    index_contents = _render_template(
+    index_contents = await _render_index(
         template,
         dest_filename,
+        executor,
         plugin_type=plugin_type,
         per_collection_plugins=per_collection_plugins,
         for_official_docsite=for_official_docsite,
@@ -109,6 +167,7 @@ async def output_callback_indexes(
     for_official_docsite: bool = False,
     referable_envvars: set[str] | None = None,
     add_version: bool = True,
+    executor: Executor | None = None,
 ) -> None:
     """
     Generate top-level callback plugin index pages for all callback plugins of a type in all
@@ -123,21 +182,25 @@ async def output_callback_indexes(
     :kwarg output_format: The output format to use.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg executor: Optional executor created by :func:`create_template_executor`. If
+        provided, the pages are rendered in its worker processes.
     """
     flog = mlog.fields(func="output_callback_indexes")
     flog.debug("Enter")
 
-    env = doc_environment(
-        collection_url=collection_url,
-        collection_install=collection_install,
-        referable_envvars=referable_envvars,
-        output_format=output_format,
-        filename_generator=filename_generator,
-    )
     # Get the templates
-    plugin_list_tmpl = env.get_template(
-        get_template_filename("list_of_callback_plugins", output_format)
+    plugin_list_tmpl: Template | str = get_template_filename(
+        "list_of_callback_plugins", output_format
     )
+    if executor is None:
+        env = doc_environment(
+            collection_url=collection_url,
+            collection_install=collection_install,
+            referable_envvars=referable_envvars,
+            output_format=output_format,
+            filename_generator=filename_generator,
+        )
+        plugin_list_tmpl = env.get_template(plugin_list_tmpl)
 
     collection_toplevel = "collections"
     output.ensure_directory(collection_toplevel)
@@ -160,6 +223,7 @@ async def output_callback_indexes(
                         filename,
                         for_official_docsite=for_official_docsite,
                         add_version=add_version,
+                        executor=executor,
                     )
                 )
             )
@@ -180,6 +244,7 @@ async def output_plugin_indexes(
     for_official_docsite: bool = False,
     referable_envvars: set[str] | None = None,
     add_version: bool = True,
+    executor: Executor | None = None,
 ) -> None:
     """
     Generate top-level plugin index pages for all plugins of a type in all collections.
@@ -194,21 +259,25 @@ async def output_plugin_indexes(
     :kwarg output_format: The output format to use.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg executor: Optional executor created by :func:`create_template_executor`. If
+        provided, the pages are rendered in its worker processes.
     """
     flog = mlog.fields(func="output_plugin_indexes")
     flog.debug("Enter")
 
-    env = doc_environment(
-        collection_url=collection_url,
-        collection_install=collection_install,
-        referable_envvars=referable_envvars,
-        output_format=output_format,
-        filename_generator=filename_generator,
-    )
     # Get the templates
-    plugin_list_tmpl = env.get_template(
-        get_template_filename("list_of_plugins", output_format)
+    plugin_list_tmpl: Template | str = get_template_filename(
+        "list_of_plugins", output_format
     )
+    if executor is None:
+        env = doc_environment(
+            collection_url=collection_url,
+            collection_install=collection_install,
+            referable_envvars=referable_envvars,
+            output_format=output_format,
+            filename_generator=filename_generator,
+        )
+        plugin_list_tmpl = env.get_template(plugin_list_tmpl)
 
     collection_toplevel = "collections"
     output.ensure_directory(collection_toplevel)
@@ -232,6 +301,7 @@ async def output_plugin_indexes(
                         filename,
                         for_official_docsite=for_official_docsite,
                         add_version=add_version,
+                        executor=executor,
                     )
                 )
             )
@@ -249,6 +319,7 @@ async def output_environment_variables(
     squash_hierarchy: bool = False,
     referable_envvars: set[str] | None = None,
     add_version: bool = True,
+    executor: Executor | None = None,
 ) -> None:
     """
     Write environment variable Generate collection-level index pages for the collections.
@@ -262,6 +333,8 @@ async def output_environment_variables(
     :kwarg output_format: The output format to use.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg executor: Optional executor created by :func:`create_template_executor`. If
+        provided, the pages are rendered in its worker processes.
     """
     flog = mlog.fields(func="write_environment_variables")
     flog.debug("Enter")
@@ -271,24 +344,27 @@ async def output_environment_variables(
     else:
         collection_toplevel = "."
 
-    env = doc_environment(
-        referable_envvars=referable_envvars,
-        output_format=output_format,
-        filename_generator=filename_generator,
-    )
     # Get the templates
-    env_var_list_tmpl = env.get_template(
-        get_template_filename("list_of_env_variables", output_format)
+    env_var_list_tmpl: Template | str = get_template_filename(
+        "list_of_env_variables", output_format
     )
+    if executor is None:
+        env = doc_environment(
+            referable_envvars=referable_envvars,
+            output_format=output_format,
+            filename_generator=filename_generator,
+        )
+        env_var_list_tmpl = env.get_template(env_var_list_tmpl)
 
     output.ensure_directory(collection_toplevel)
 
     index_file = os.path.join(
         collection_toplevel, f"environment_variables{output_format.output_extension}"
     )
-    index_contents = _render_template(
+    index_contents = await _render_index(
         env_var_list_tmpl,
         index_file,
+        executor,
         env_variables=env_variables,
         add_version=add_version,
     )
@@ -309,6 +385,8 @@ async def output_deprecation_index(
     for_official_docsite: bool = False,
     referable_envvars: set[str] | None = None,
     add_version: bool = True,
+    deprecated_plugin_info: Mapping[str, Mapping[str, BasicPluginInfo]] | None = None,
+    executor: Executor | None = None,
 ) -> None:
     """
     Generate top-level deprecation index page.
@@ -323,18 +401,15 @@ async def output_deprecation_index(
     :kwarg output_format: The output format to use.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg deprecated_plugin_info: Optional mapping of plugin_type to Mapping of plugin FQCN
+        to basic plugin information of the deprecated plugins. Will be computed from
+        ``plugin_info`` if not provided.
+    :kwarg executor: Optional executor created by :func:`create_template_executor`. If
+        provided, the pages are rendered in its worker processes.
     """
     flog = mlog.fields(func="output_deprecation_index")
     flog.debug("Enter")
 
-    env = doc_environment(
-        collection_url=collection_url,
-        collection_install=collection_install,
-        referable_envvars=referable_envvars,
-        output_format=output_format,
-        filename_generator=filename_generator,
-    )
-
     collection_toplevel = "collections"
     output.ensure_directory(collection_toplevel)
     filename = os.path.join(
@@ -342,22 +417,33 @@ async def output_deprecation_index(
         f"deprecations{output_format.output_extension}",
     )
 
-    deprecated_plugin_info = {
-        plugin_type: {
-            f"{collection_name}.{plugin_name}": plugin_info
-            for collection_name, plugins in per_collection_plugins.items()
-            for plugin_name, plugin_info in plugins.items()
-            if plugin_info.deprecation
+    if deprecated_plugin_info is None:
+        deprecated_plugin_info = {
+            plugin_type: {
+                f"{collection_name}.{plugin_name}": plugin_info
+                for collection_name, plugins in per_collection_plugins.items()
+                for plugin_name, plugin_info in plugins.items()
+                if plugin_info.deprecation
+            }
+            for plugin_type, per_collection_plugins in plugin_info.items()
         }
-        for plugin_type, per_collection_plugins in plugin_info.items()
-    }
 
-    template = env.get_template(
-        get_template_filename("list_of_deprecations", output_format)
+    template: Template | str = get_template_filename(
+        "list_of_deprecations", output_format
     )
-    index_contents = _render_template(
+    if executor is None:
+        env = doc_environment(
+            collection_url=collection_url,
+            collection_install=collection_install,
+            referable_envvars=referable_envvars,
+            output_format=output_format,
+            filename_generator=filename_generator,
+        )
+        template = env.get_template(template)
+    index_contents = await _render_index(
         template,
         filename,
+        executor,
         deprecated_collection_infos={
             collection_name: collection_metadata
             for collection_name, collection_metadata in collection_metadata.items()
@@ -10,9 +10,14 @@ from __future__ import annotations
 import fnmatch
 import os
 import shutil
+import stat
+import sys
+import tempfile
 import typing as t
 from collections import defaultdict
-from threading import Lock
+from collections.abc import Mapping
+from threading import Lock, local
+from types import MappingProxyType
 
 from antsibull_core import app_context
 from antsibull_core.logging import get_module_logger
@@ -22,30 +27,122 @@ from antsibull_fileutils.io import write_file as _write_file
 if t.TYPE_CHECKING:
     from _typeshed import StrOrBytesPath
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
 mlog = get_module_logger(__name__)
 
+#: How files are copied into the output tree.
+#:
+#: ``copy``: copy the content of the file.
+#:
+#: ``link``: try to create a copy-on-write clone (reflink) of the file. If that is not
+#: supported, try to create a hardlink. If that is not possible either, copy the content.
+CopyMode = t.Literal["copy", "link"]
+
+# ioctl request code for FICLONE from linux/fs.h; fcntl.FICLONE exists since Python 3.12
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+
+def _reflink(source_path: StrOrBytesPath, dest_path: StrOrBytesPath) -> bool:
+    """
+    Try to create ``dest_path`` as a copy-on-write clone of ``source_path``.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    with open(source_path, "rb") as f_in, open(dest_path, "wb") as f_out:
+        try:
+            fcntl.ioctl(f_out.fileno(), _FICLONE, f_in.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def _link_file(source_path: StrOrBytesPath, dest_path: StrOrBytesPath) -> bool:
+    """
+    Try to replace ``dest_path`` by a reflink or a hardlink of ``source_path``.
+
+    The link is created under a temporary name in the destination directory and then
+    moved into place, so an existing destination file is never written to.
+
+    :return: ``True`` if a reflink or hardlink was created.
+    """
+    dest_dir = os.fsdecode(os.path.dirname(dest_path)) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=dest_dir, prefix=".antsibull-")
+    os.close(fd)
+    try:
+        if _reflink(source_path, tmp_path):
+            # mkstemp() creates the file with mode 0600; use the source's mode instead
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(source_path).st_mode))
+        else:
+            os.unlink(tmp_path)
+            try:
+                os.link(source_path, tmp_path)
+            except OSError:
+                # Not possible for whatever reason; the caller falls back to copying
+                return False
+        os.replace(tmp_path, dest_path)
+        return True
+    finally:
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _has_same_content(
+    source_path: StrOrBytesPath, dest_path: StrOrBytesPath, file_check_content: int
+) -> bool:
+    """
+    Check whether ``dest_path`` exists and has the same content as ``source_path``.
+
+    Only files up to ``file_check_content`` bytes are compared.
+    """
+    try:
+        stat_d = os.stat(dest_path)
+        stat_s = os.stat(source_path)
+    except FileNotFoundError:
+        return False
+    if (stat_d.st_dev, stat_d.st_ino) == (stat_s.st_dev, stat_s.st_ino):
+        # dest_path is a hardlink to source_path
+        return True
+    if stat_d.st_size != stat_s.st_size or stat_d.st_size > file_check_content:
+        return False
+    with open(source_path, "rb") as f_s, open(dest_path, "rb") as f_d:
+        return f_s.read() == f_d.read()
+
 
 class Output:
     """
     Thread-safe class that allows to create directories and copy/write files into the output tree.
     """
 
-    def __init__(self, root: StrOrBytesPath):
+    def __init__(self, root: StrOrBytesPath, *, copy_mode: CopyMode = "copy"):
         """
         Create Output object.
 
         ``root`` is assumed to be an existing directory the user can write to.
+
+        ``copy_mode`` determines how ``copy_file()`` copies files; see ``CopyMode``.
         """
         self.root = root
+        self.copy_mode = copy_mode
+        # Directories (as normalized full paths) that are known to exist. Adding to
+        # and testing membership of a set is atomic, so no lock is needed; in the
+        # worst case two threads both call os.makedirs() for the same directory.
+        self._known_directories: set[str | bytes] = set()
 
     def ensure_directory(self, directory: StrOrBytesPath, /) -> None:
         """
         Ensure that the directory (relative to our root) exists.
         """
-        path = os.path.join(self.root, directory)  # type: ignore
+        path = os.path.normpath(os.path.join(self.root, directory))  # type: ignore
+        if path in self._known_directories:
+            return
         # This is dangerous but the code that takes dest_dir from the user checks
         # permissions on it to make it as safe as possible.
         os.makedirs(path, mode=0o755, exist_ok=True)
+        self._known_directories.add(path)
 
     async def write_file(self, filename: StrOrBytesPath, /, content: str) -> None:
         """
@@ -66,9 +163,27 @@ class Output:
         """
         Copy the given ``source_path`` (relative to CWD) to the ``dest_path``
         (relative to our root).
+
+        If ``copy_mode`` is ``link``, the destination is replaced by a reflink or hardlink
+        of the source if possible. If ``check_content`` is ``True`` and the destination is
+        already a hardlink of the source, or has the same content (and is not larger than
+        the ``file_check_content`` setting), it is left alone. The destination file is never
+        written to in place in this mode, so a hardlink created by a previous run cannot
+        accidentally modify the source file.
         """
         src_path = os.path.join(self.root, dest_path)  # type: ignore
         lib_ctx = app_context.lib_ctx.get()
+        if self.copy_mode == "link":
+            if check_content and _has_same_content(
+                source_path, src_path, lib_ctx.file_check_content
+            ):
+                return
+            if _link_file(source_path, src_path):
+                return
+            # Make sure to not write into a hardlink of another file
+            if os.path.lexists(src_path):
+                os.unlink(src_path)
+            check_content = False
         await _copy_file(
             source_path,
             src_path,
@@ -78,12 +193,47 @@ class Output:
         )
 
 
-class TrackingOutput(Output):
+class _TrackingShard:
+    """
+    Registration data collected by a single thread.
+
+    Only the owning thread modifies the shard. It holds ``lock`` while doing so, which
+    is uncontended except while the shards are merged.
+    """
+
+    __slots__ = ("lock", "directories", "files", "patterns")
+
     lock: Lock
     directories: set[str]
     files: defaultdict[str, set[str]]
     patterns: defaultdict[str, set[str]]
 
+    def __init__(self):
+        self.lock = Lock()
+        self.directories = set()
+        self.files = defaultdict(set)
+        self.patterns = defaultdict(set)
+
+
+class TrackingOutput(Output):
+    """
+    Output that keeps track of all files and directories written to, so that
+    superfluous files and directories can be removed afterwards.
+
+    Every thread registers files, directories and patterns in its own shard, so
+    registration does not need to take a shared lock. The shards are merged when the
+    registration data is needed, for example by ``cleanup()``. The ``directories``,
+    ``files``, and ``patterns`` properties return read-only snapshots of the merged data.
+
+    Files copied with ``copy_mode`` ``link`` are registered like regular copies.
+    ``cleanup()`` only ever unlinks files in the output tree, so removing a
+    superfluous hardlink never affects its source.
+    """
+
+    lock: Lock
+    _shards: list[_TrackingShard]
+    _local: local
+
     @staticmethod
     def _normalize_directory(directory: StrOrBytesPath) -> str:
         norm_dir_or_bytes = os.path.normpath(directory)
@@ -105,12 +255,64 @@ class TrackingOutput(Output):
             else norm_fn_or_bytes
         )
 
-    def __init__(self, root: StrOrBytesPath):
-        super().__init__(root=root)
-        self.directories = {""}
-        self.files = defaultdict(set)
-        self.patterns = defaultdict(set)
+    def __init__(self, root: StrOrBytesPath, *, copy_mode: CopyMode = "copy"):
+        super().__init__(root=root, copy_mode=copy_mode)
         self.lock = Lock()
+        self._local = local()
+        self._shards = []
+        shard = self._get_shard()
+        with shard.lock:
+            shard.directories.add("")
+
+    def _get_shard(self) -> _TrackingShard:
+        shard: _TrackingShard | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _TrackingShard()
+            self._local.shard = shard
+            # The lock is only taken once per thread
+            with self.lock:
+                self._shards.append(shard)
+        return shard
+
+    def _merge_shards(self) -> _TrackingShard:
+        result = _TrackingShard()
+        with self.lock:
+            shards = list(self._shards)
+        for shard in shards:
+            with shard.lock:
+                result.directories.update(shard.directories)
+                for directory, files in shard.files.items():
+                    result.files[directory].update(files)
+                for directory, patterns in shard.patterns.items():
+                    result.patterns[directory].update(patterns)
+        return result
+
+    @staticmethod
+    def _freeze(data: Mapping[str, set[str]]) -> Mapping[str, frozenset[str]]:
+        return MappingProxyType(
+            {directory: frozenset(values) for directory, values in data.items()}
+        )
+
+    @property
+    def directories(self) -> frozenset[str]:
+        """
+        Read-only snapshot of all directories registered so far.
+        """
+        return frozenset(self._merge_shards().directories)
+
+    @property
+    def files(self) -> Mapping[str, frozenset[str]]:
+        """
+        Read-only snapshot of all files registered so far, grouped by directory.
+        """
+        return self._freeze(self._merge_shards().files)
+
+    @property
+    def patterns(self) -> Mapping[str, frozenset[str]]:
+        """
+        Read-only snapshot of all patterns registered so far, grouped by directory.
+        """
+        return self._freeze(self._merge_shards().patterns)
 
     def ensure_directory(self, directory: StrOrBytesPath, /) -> None:
         super().ensure_directory(directory)
@@ -124,16 +326,18 @@ class TrackingOutput(Output):
             )
             if norm_directory == prev_directory:
                 break
-        with self.lock:
-            self.directories.update(directories)
+        shard = self._get_shard()
+        with shard.lock:
+            shard.directories.update(directories)
 
     def _register_file(self, filename: StrOrBytesPath, /) -> None:
         filename_dir, filename_name = os.path.split(filename)
         directory = self._normalize_directory(filename_dir)
         norm_filename = self._normalize_filename(filename_name)
-        with self.lock:
-            self.directories.add(directory)
-            self.files[directory].add(norm_filename)
+        shard = self._get_shard()
+        with shard.lock:
+            shard.directories.add(directory)
+            shard.files[directory].add(norm_filename)
 
     async def write_file(self, filename: StrOrBytesPath, /, content: str) -> None:
         await super().write_file(filename, content=content)
@@ -141,8 +345,9 @@ class TrackingOutput(Output):
 
     def register_pattern(self, directory: StrOrBytesPath, pattern: str, /) -> None:
         norm_directory = self._normalize_directory(directory)
-        with self.lock:
-            self.patterns[norm_directory].add(pattern)
+        shard = self._get_shard()
+        with shard.lock:
+            shard.patterns[norm_directory].add(pattern)
 
     async def copy_file(
         self,
@@ -190,43 +395,82 @@ class TrackingOutput(Output):
         flog = mlog.fields(func="TrackingOutput.cleanup")
         flog.notice("Begin")
 
-        with self.lock:
-            flog.notice("Collecting files and directories to delete")
-            directories_to_prune: set[str] = set()
-            files_to_prune: set[str] = set()
-            root_dir = os.path.join(self.root, root)  # type: ignore
-            for dirpath, dirnames, filenames in os.walk(root_dir):
-                rel_dirpath = os.path.relpath(dirpath, self.root)  # type: ignore
-                directory = self._normalize_directory(rel_dirpath)
-                flog.notice(f"Processing {directory}")
-                if directory not in self.directories:
-                    # Stop iteration
-                    flog.notice("Unknown directory")
-                    dirnames.clear()
-                    if cleanup != "similar-files":
-                        directories_to_prune.add(directory)
-                    continue
-
-                expected_filenames = self.files[directory]
-                superfluous_filenames = [
-                    filename
-                    for filename in filenames
-                    if filename not in expected_filenames
-                ]
-                if (
-                    cleanup != "everything"
-                    and directory in self.patterns
-                    and superfluous_filenames
-                ):
-                    superfluous_filenames = self._limit_by_patterns(
-                        superfluous_filenames, self.patterns[directory]
-                    )
-
-                flog.notice(f"Found {len(superfluous_filenames)} superfluous file(s)")
-                for filename in superfluous_filenames:
-                    files_to_prune.add(os.path.join(directory, filename))
+        flog.notice("Merging registered files and directories")
+        registered = self._merge_shards()
+
+        flog.notice("Collecting files and directories to delete")
+        directories_to_prune: set[str] = set()
+        files_to_prune: set[str] = set()
+        root_dir = os.path.join(self.root, root)  # type: ignore
+        for dirpath, dirnames, filenames in os.walk(root_dir):
+            rel_dirpath = os.path.relpath(dirpath, self.root)  # type: ignore
+            directory = self._normalize_directory(rel_dirpath)
+            flog.notice(f"Processing {directory}")
+            if directory not in registered.directories:
+                # Stop iteration
+                flog.notice("Unknown directory")
+                dirnames.clear()
+                if cleanup != "similar-files":
+                    directories_to_prune.add(directory)
+                continue
+
+            expected_filenames = registered.files[directory]
+            superfluous_filenames = [
+                filename for filename in filenames if filename not in expected_filenames
+            ]
+            if (
+                cleanup != "everything"
+                and directory in registered.patterns
+                and superfluous_filenames
+            ):
+                superfluous_filenames = self._limit_by_patterns(
+                    superfluous_filenames, registered.patterns[directory]
+                )
+
+            flog.notice(f"Found {len(superfluous_filenames)} superfluous file(s)")
+            for filename in superfluous_filenames:
+                files_to_prune.add(os.path.join(directory, filename))
 
         flog.notice("Doing actual delete")
         self._delete(directories_to_prune, files_to_prune)
 
         flog.notice("Done")
+
+
+class MemoryOutput(Output):
+    """
+    Output that keeps all written files in memory instead of writing them to disk.
+
+    Copied files are not read; only their source paths are remembered. All paths are
+    normalized and use ``/`` as the path separator.
+    """
+
+    files: dict[str, str]
+    copied_files: dict[str, str]
+
+    @staticmethod
+    def _normalize_filename(filename: StrOrBytesPath) -> str:
+        return os.fsdecode(os.path.normpath(filename)).replace(os.sep, "/")
+
+    def __init__(self):
+        super().__init__(root="")
+        self.files = {}
+        self.copied_files = {}
+
+    def ensure_directory(self, directory: StrOrBytesPath, /) -> None:
+        pass
+
+    async def write_file(self, filename: StrOrBytesPath, /, content: str) -> None:
+        self.files[self._normalize_filename(filename)] = content
+
+    async def copy_file(
+        self,
+        source_path: StrOrBytesPath,
+        dest_path: StrOrBytesPath,
+        /,
+        *,
+        check_content: bool = True,
+    ) -> None:
+        self.copied_files[self._normalize_filename(dest_path)] = os.fsdecode(
+            source_path
+        )
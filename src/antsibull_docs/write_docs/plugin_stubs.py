@@ -11,23 +11,30 @@ import asyncio
 import os
 import os.path
 import typing as t
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Executor
 
 import asyncio_pool  # type: ignore[import]
 from antsibull_core import app_context
 from antsibull_core.logging import get_module_logger
-from jinja2 import Template
+from jinja2 import Environment, Template
 
 from ..collection_links import CollectionLinks
 from ..docs_parsing import AnsibleCollectionMetadata
 from ..jinja2 import FilenameGenerator, OutputFormat
 from ..jinja2.environment import doc_environment, get_template_filename
 from ..utils.collection_name_transformer import CollectionNameTransformer
-from . import _get_collection_dir, _render_template
+from . import _get_collection_dir, _get_worker_template, _render_template
 from .io import Output
 
 mlog = get_module_logger(__name__)
 
+#: Maps stub kinds to the names of their templates.
+_STUB_TEMPLATES = {
+    "redirect": "plugin-redirect",
+    "tombstone": "plugin-tombstone",
+}
+
 
 async def write_stub_rst(
     collection_name: str,
@@ -73,38 +80,24 @@ async def write_stub_rst(
     namespace, collection = collection_name.split(".")
     plugin_name = ".".join((collection_name, plugin_short_name))
 
-    if "tombstone" in routing_data:
-        plugin_contents = _render_template(
-            tombstone_tmpl,
-            plugin_name + "_" + plugin_type,
-            plugin_type=plugin_type,
-            plugin_name=plugin_name,
-            collection=collection_name,
-            collection_version=collection_meta.version,
-            collection_links=collection_links.links,
-            collection_communication=collection_links.communication,
-            collection_deprecation_info=collection_meta.deprecation_info,
-            tombstone=routing_data["tombstone"],
-            for_official_docsite=for_official_docsite,
-            add_version=add_version,
-        )
-    else:  # 'redirect' in routing_data
-        plugin_contents = _render_template(
-            redirect_tmpl,
-            plugin_name + "_" + plugin_type,
-            collection=collection_name,
-            collection_version=collection_meta.version,
-            collection_links=collection_links.links,
-            collection_communication=collection_links.communication,
-            collection_deprecation_info=collection_meta.deprecation_info,
-            plugin_type=plugin_type,
-            plugin_name=plugin_name,
-            redirect=routing_data["redirect"],
-            redirect_is_symlink=routing_data.get("redirect_is_symlink") or False,
-            deprecation=routing_data.get("deprecation"),
-            for_official_docsite=for_official_docsite,
-            add_version=add_version,
-        )
+    templates = {
+        get_template_filename(
+            _STUB_TEMPLATES["redirect"], output_format
+        ): redirect_tmpl,
+        get_template_filename(
+            _STUB_TEMPLATES["tombstone"], output_format
+        ): tombstone_tmpl,
+    }
+    [plugin_contents] = create_stubs_rst(
+        templates.__getitem__,
+        collection_name,
+        collection_meta,
+        collection_links,
+        [(plugin_type, plugin_short_name, routing_data)],
+        output_format,
+        for_official_docsite=for_official_docsite,
+        add_version=add_version,
+    )
 
     if path_override is not None:
         plugin_file = path_override
@@ -127,6 +120,163 @@ async def write_stub_rst(
     flog.debug("Leave")
 
 
+def create_stubs_rst(
+    get_template: Callable[[str], Template],
+    collection_name: str,
+    collection_meta: AnsibleCollectionMetadata,
+    collection_links: CollectionLinks,
+    stubs: Sequence[tuple[str, str, Mapping[str, t.Any]]],
+    output_format: OutputFormat,
+    for_official_docsite: bool = False,
+    add_version: bool = True,
+) -> list[str]:
+    """
+    Create the rst pages for all plugin stubs of one collection.
+
+    :arg get_template: Function that returns the template for a template filename.
+    :arg collection_name: Dotted colection name.
+    :arg collection_meta: Collection metadata object.
+    :arg collection_links: Collection links object.
+    :arg stubs: Sequence of tuples of plugin type, short plugin name, and routing data
+        record of the plugin stubs.
+    :arg output_format: The output format to use.
+    :kwarg for_official_docsite: Default False.  Set to True to use wording specific for the
+        official docsite on docs.ansible.com.
+    :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
+        the generated files.
+    :returns: The rst pages, in the same order as ``stubs``.
+    """
+    templates = {
+        kind: get_template(get_template_filename(template_name, output_format))
+        for kind, template_name in _STUB_TEMPLATES.items()
+    }
+    # The collection specific variables are the same for all stubs
+    collection_vars: dict[str, t.Any] = {
+        "collection": collection_name,
+        "collection_version": collection_meta.version,
+        "collection_links": collection_links.links,
+        "collection_communication": collection_links.communication,
+        "collection_deprecation_info": collection_meta.deprecation_info,
+        "for_official_docsite": for_official_docsite,
+    }
+
+    result = []
+    for plugin_type, plugin_short_name, routing_data in stubs:
+        plugin_name = ".".join((collection_name, plugin_short_name))
+        if "tombstone" in routing_data:
+            kind = "tombstone"
+            stub_vars: dict[str, t.Any] = {"tombstone": routing_data["tombstone"]}
+        else:  # 'redirect' in routing_data
+            kind = "redirect"
+            stub_vars = {
+                "redirect": routing_data["redirect"],
+                "redirect_is_symlink": routing_data.get("redirect_is_symlink") or False,
+                "deprecation": routing_data.get("deprecation"),
+            }
+        result.append(
+            _render_template(
+                templates[kind],
+                plugin_name + "_" + plugin_type,
+                plugin_type=plugin_type,
+                plugin_name=plugin_name,
+                add_version=add_version,
+                **collection_vars,
+                **stub_vars,
+            )
+        )
+    return result
+
+
+def _create_stubs_rst_in_worker(*args) -> list[str]:
+    return create_stubs_rst(_get_worker_template, *args)
+
+
+async def write_collection_stubs_rst(
+    collection_name: str,
+    collection_meta: AnsibleCollectionMetadata,
+    collection_links: CollectionLinks,
+    plugins_by_type: Mapping[str, Mapping[str, Mapping[str, t.Any]]],
+    output: Output,
+    output_format: OutputFormat,
+    filename_generator: FilenameGenerator,
+    env: Environment | None = None,
+    executor: Executor | None = None,
+    squash_hierarchy: bool = False,
+    for_official_docsite: bool = False,
+    add_version: bool = True,
+) -> None:
+    """
+    Write the rst pages for all plugin stubs of one collection.
+
+    The pages are rendered in one batch, either in ``env`` or in a worker of ``executor``.
+
+    :arg collection_name: Dotted colection name.
+    :arg collection_meta: Collection metadata object.
+    :arg collection_links: Collection links object.
+    :arg plugins_by_type: Mapping of plugin_type to Mapping of plugin_name to routing
+        information.
+    :arg output: Output helper for writing output.
+    :kwarg env: The template environment to render the pages in. Must be provided if
+        ``executor`` is not.
+    :kwarg executor: An executor created by :func:`create_template_executor` to render the
+        pages in.
+    :kwarg squash_hierarchy: If set to ``True``, no directory hierarchy will be used.
+        Undefined behavior if documentation for multiple collections are created.
+    :kwarg for_official_docsite: Default False.  Set to True to use wording specific for the
+        official docsite on docs.ansible.com.
+    :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
+        the generated files.
+    """
+    flog = mlog.fields(func="write_collection_stubs_rst")
+    flog.debug("Enter")
+
+    stubs = [
+        (plugin_type, plugin_short_name, routing_data)
+        for plugin_type, plugins in plugins_by_type.items()
+        for plugin_short_name, routing_data in plugins.items()
+    ]
+    args = (
+        collection_name,
+        collection_meta,
+        collection_links,
+        stubs,
+        output_format,
+        for_official_docsite,
+        add_version,
+    )
+    if executor is not None:
+        # Rendering is CPU bound, so do it in a worker
+        loop = asyncio.get_running_loop()
+        stub_contents = await loop.run_in_executor(
+            executor, _create_stubs_rst_in_worker, *args
+        )
+    elif env is not None:
+        stub_contents = create_stubs_rst(env.get_template, *args)
+    else:
+        raise ValueError("Either env or executor must be provided")
+
+    namespace, collection = collection_name.split(".")
+    collection_dir = _get_collection_dir(
+        output,
+        namespace,
+        collection,
+        squash_hierarchy=squash_hierarchy,
+        create_if_not_exists=True,
+    )
+    for (plugin_type, plugin_short_name, dummy), plugin_contents in zip(
+        stubs, stub_contents
+    ):
+        plugin_file = os.path.join(
+            collection_dir,
+            filename_generator.plugin_filename(
+                f"{collection_name}.{plugin_short_name}", plugin_type, output_format
+            ),
+        )
+        await output.write_file(plugin_file, plugin_contents)
+
+    flog.debug("Leave")
+
+
 async def output_all_plugin_stub_rst(
     stubs_info: Mapping[str, Mapping[str, Mapping[str, t.Any]]],
     output: Output,
@@ -140,10 +290,13 @@ async def output_all_plugin_stub_rst(
     for_official_docsite: bool = False,
     referable_envvars: set[str] | None = None,
     add_version: bool = True,
+    executor: Executor | None = None,
 ) -> None:
     """
     Output rst files for each plugin stub.
 
+    The stubs of every collection are rendered in one batch.
+
     :arg stubs_info: Mapping of collection_name to Mapping of plugin_type to Mapping
         of plugin_name to routing information.
     :arg output: Output helper for writing output.
@@ -158,49 +311,42 @@ async def output_all_plugin_stub_rst(
     :kwarg output_format: The output format to use.
     :kwarg add_version: If set to ``False``, will not insert antsibull-docs' version into
         the generated files.
+    :kwarg executor: Optional executor created by :func:`create_template_executor`. If
+        provided, the pages are rendered in its worker processes.
     """
-    # Setup the jinja environment
-    env = doc_environment(
-        collection_url=collection_url,
-        collection_install=collection_install,
-        referable_envvars=referable_envvars,
-        output_format=output_format,
-        filename_generator=filename_generator,
-    )
-    # Get the templates
-    redirect_tmpl = env.get_template(
-        get_template_filename("plugin-redirect", output_format)
-    )
-    tombstone_tmpl = env.get_template(
-        get_template_filename("plugin-tombstone", output_format)
-    )
+    env = None
+    if executor is None:
+        # Setup the jinja environment
+        env = doc_environment(
+            collection_url=collection_url,
+            collection_install=collection_install,
+            referable_envvars=referable_envvars,
+            output_format=output_format,
+            filename_generator=filename_generator,
+        )
 
     writers = []
     lib_ctx = app_context.lib_ctx.get()
     async with asyncio_pool.AioPool(size=lib_ctx.thread_max) as pool:
         for collection_name, plugins_by_type in stubs_info.items():
-            for plugin_type, plugins in plugins_by_type.items():
-                for plugin_short_name, routing_data in plugins.items():
-                    writers.append(
-                        await pool.spawn(
-                            write_stub_rst(
-                                collection_name,
-                                collection_metadata[collection_name],
-                                link_data[collection_name],
-                                plugin_short_name,
-                                plugin_type,
-                                routing_data,
-                                redirect_tmpl,
-                                tombstone_tmpl,
-                                output,
-                                output_format,
-                                filename_generator,
-                                squash_hierarchy=squash_hierarchy,
-                                for_official_docsite=for_official_docsite,
-                                add_version=add_version,
-                            )
-                        )
+            writers.append(
+                await pool.spawn(
+                    write_collection_stubs_rst(
+                        collection_name,
+                        collection_metadata[collection_name],
+                        link_data[collection_name],
+                        plugins_by_type,
+                        output,
+                        output_format,
+                        filename_generator,
+                        env=env,
+                        executor=executor,
+                        squash_hierarchy=squash_hierarchy,
+                        for_official_docsite=for_official_docsite,
+                        add_version=add_version,
                     )
+                )
+            )
 
-        # Write docs for each plugin
+        # Write docs for each collection
         await asyncio.gather(*writers)
@@ -241,6 +241,7 @@ def create_plugin_rst(
                 plugin_type=plugin_type,
                 plugin_name=plugin_name,
                 entry_points=plugin_record["entry_points"],
+                rst_labels=plugin_record["rst_labels"],
                 nonfatal_errors=nonfatal_errors,
                 edit_on_github_url=edit_on_github_url,
                 collection_links=collection_links.links,
@@ -263,6 +264,7 @@ def create_plugin_rst(
                 examples=plugin_record["examples"],
                 examples_format=plugin_record["examples_format"],
                 returndocs=plugin_record["return"],
+                rst_labels=plugin_record["rst_labels"],
                 nonfatal_errors=nonfatal_errors,
                 edit_on_github_url=edit_on_github_url,
                 collection_links=collection_links.links,
@@ -9,6 +9,7 @@ Add roles for semantic markup and general formatting.
 
 from __future__ import annotations
 
+import functools
 import json
 import typing as t
 
@@ -80,24 +81,111 @@ def _create_ref(ref: str, title: str) -> addnodes.pending_xref:
 
 
 def _create_ref_or_not(
-    create_ref: t.Callable[[str | None, str | None, str | None, str], str | None],
-    plugin_fqcn: str | None,
-    plugin_type: str | None,
-    entrypoint: str | None,
-    ref_parameter: str,
-    text: str,
+    ref: str | None, text: str
 ) -> nodes.inline | addnodes.pending_xref:
     # When successfully resolving *internal* references, Sphinx does **NOT**
     # use the node we provide, but simply extracts the text and creates a new
     # node. Thus we use nodes.inline so that the result is the same no matter
     # whether the reference was internal, not resolved, or external
     # (intersphinx).
-    ref = create_ref(plugin_fqcn, plugin_type, entrypoint, ref_parameter)
     if ref is None:
         return nodes.inline(text, text)
     return _create_ref(ref, text)
 
 
+# Generated plugin pages contain many identical references to options and return
+# values, so the results of parsing them are cached per process.
+_PARSE_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_option(text: str) -> tuple[str, str | None, str | None]:
+    """
+    Given the contents of :ansopt:`...` with escaping removed, return the option name,
+    the option value, and the reference target.
+    """
+    plugin_fqcn, plugin_type, entrypoint, option_link, option, value = parse_option(
+        text, "", "", require_plugin=False
+    )
+    ref = _create_option_reference(plugin_fqcn, plugin_type, entrypoint, option_link)
+    return option, value, ref
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_option_ref(target: str) -> str | None:
+    """
+    Given the target of :ansoptref:`... <...>`, return the reference target.
+    """
+    plugin_fqcn, plugin_type, entrypoint, option_link, _option = parse_option_ref(
+        target
+    )
+    return _create_option_reference(plugin_fqcn, plugin_type, entrypoint, option_link)
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_return_value(text: str) -> tuple[str, str | None, str | None]:
+    """
+    Given the contents of :ansretval:`...` with escaping removed, return the return value
+    name, the return value's value, and the reference target.
+    """
+    plugin_fqcn, plugin_type, entrypoint, rv_link, rv, value = parse_return_value(
+        text, "", "", require_plugin=False
+    )
+    ref = _create_return_value_reference(plugin_fqcn, plugin_type, entrypoint, rv_link)
+    return rv, value, ref
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_return_value_ref(target: str) -> str | None:
+    """
+    Given the target of :ansretvalref:`... <...>`, return the reference target.
+    """
+    plugin_fqcn, plugin_type, entrypoint, rv_link, _rv = parse_return_value_ref(target)
+    return _create_return_value_reference(plugin_fqcn, plugin_type, entrypoint, rv_link)
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_plugin(target: str) -> tuple[str, str]:
+    """
+    Given the target of :ansplugin:`...`, return the plugin FQCN and the reference target.
+    """
+    plugin_fqcn, plugin_type, entrypoint = parse_plugin_name(target)
+    return plugin_fqcn, get_plugin_ref(plugin_fqcn, plugin_type, entrypoint)
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_collection(target: str) -> tuple[str, str]:
+    """
+    Given the target of :anscollection:`...`, return the collection name and the
+    reference target.
+    """
+    collection_name, what = parse_collection_name(target)
+    return collection_name, get_collection_ref(collection_name, what)
+
+
+_PARSE_CACHES = (
+    _parse_option,
+    _parse_option_ref,
+    _parse_return_value,
+    _parse_return_value_ref,
+    _parse_plugin,
+    _parse_collection,
+)
+
+
+def get_parse_cache_stats() -> tuple[int, int]:
+    """
+    Return the number of hits and misses of the role parsing caches of this process.
+    """
+    hits = 0
+    misses = 0
+    for cache in _PARSE_CACHES:
+        info = cache.cache_info()
+        hits += info.hits
+        misses += info.misses
+    return hits, misses
+
+
 def _create_error(rawtext: str, text: str, error: str) -> tuple[list[t.Any], list[str]]:
     content = nodes.strong(text, error, classes=["error"])
     logger.error(
@@ -124,9 +212,7 @@ def option_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     """
     classes = []
     try:
-        plugin_fqcn, plugin_type, entrypoint, option_link, option, value = parse_option(
-            unescape(text), "", "", require_plugin=False
-        )
+        option, value, ref = _parse_option(unescape(text))
     except ValueError as exc:
         return _create_error(rawtext, text, str(exc))
     if value is None:
@@ -135,14 +221,7 @@ def option_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     else:
         text = f"{option}={value}"
         classes.append("ansible-option-value")
-    content = _create_ref_or_not(
-        _create_option_reference,
-        plugin_fqcn,
-        plugin_type,
-        entrypoint,
-        option_link,
-        text,
-    )
+    content = _create_ref_or_not(ref, text)
     if value is None:
         content = nodes.strong(rawtext, "", content)
     return [nodes.literal(rawtext, "", content, classes=classes)], []
@@ -166,12 +245,9 @@ def option_ref_role(name, rawtext, text, lineno, inliner, options={}, content=[]
     """
     try:
         target, title = extract_explicit_title(text, require_title=True)
-        plugin_fqcn, plugin_type, entrypoint, option_link, _option = parse_option_ref(
-            target
-        )
+        ref = _parse_option_ref(target)
     except ValueError as exc:
         return _create_error(rawtext, text, str(exc))
-    ref = _create_option_reference(plugin_fqcn, plugin_type, entrypoint, option_link)
     return [_create_ref(ref, title)], []
 
 
@@ -212,23 +288,14 @@ def return_value_role(name, rawtext, text, lineno, inliner, options={}, content=
     """
     classes = ["ansible-return-value"]
     try:
-        plugin_fqcn, plugin_type, entrypoint, rv_link, rv, value = parse_return_value(
-            unescape(text), "", "", require_plugin=False
-        )
+        rv, value, ref = _parse_return_value(unescape(text))
     except ValueError as exc:
         return _create_error(rawtext, text, str(exc))
     if value is None:
         text = f"{rv}"
     else:
         text = f"{rv}={value}"
-    content = _create_ref_or_not(
-        _create_return_value_reference,
-        plugin_fqcn,
-        plugin_type,
-        entrypoint,
-        rv_link,
-        text,
-    )
+    content = _create_ref_or_not(ref, text)
     return [nodes.literal(rawtext, "", content, classes=classes)], []
 
 
@@ -250,12 +317,9 @@ def return_value_ref_role(name, rawtext, text, lineno, inliner, options={}, cont
     """
     try:
         target, title = extract_explicit_title(text, require_title=True)
-        plugin_fqcn, plugin_type, entrypoint, rv_link, _rv = parse_return_value_ref(
-            target
-        )
+        ref = _parse_return_value_ref(target)
     except ValueError as exc:
         return _create_error(rawtext, text, str(exc))
-    ref = _create_return_value_reference(plugin_fqcn, plugin_type, entrypoint, rv_link)
     return [_create_ref(ref, title)], []
 
 
@@ -326,7 +390,7 @@ def plugin_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     target, title = extract_explicit_title(text)
 
     try:
-        plugin_fqcn, plugin_type, entrypoint = parse_plugin_name(target)
+        plugin_fqcn, ref = _parse_plugin(target)
     except ValueError as exc:
         return _create_error(rawtext, text, str(exc))
 
@@ -342,7 +406,7 @@ def plugin_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     refnode = addnodes.pending_xref(
         plugin_fqcn, nodes.inline(rawtext, title), **options
     )
-    refnode["reftarget"] = get_plugin_ref(plugin_fqcn, plugin_type, entrypoint)
+    refnode["reftarget"] = ref
 
     return [refnode], []
 
@@ -366,7 +430,7 @@ def collection_role(name, rawtext, text, lineno, inliner, options={}, content=[]
     target, title = extract_explicit_title(text)
 
     try:
-        collection_name, what = parse_collection_name(target)
+        collection_name, ref = _parse_collection(target)
     except ValueError as exc:
         return _create_error(rawtext, text, str(exc))
 
@@ -382,7 +446,7 @@ def collection_role(name, rawtext, text, lineno, inliner, options={}, content=[]
     refnode = addnodes.pending_xref(
         collection_name, nodes.inline(rawtext, title), **options
     )
-    refnode["reftarget"] = get_collection_ref(collection_name, what)
+    refnode["reftarget"] = ref
 
     return [refnode], []
 
@@ -556,9 +620,78 @@ for _extra_role, _kwargs in _EXTRA_ROLES.items():
     ROLES[_extra_role] = _create_extra_role(_extra_role, **_kwargs)
 
 
+# Cache statistics of this process at the time the last document was read
+_last_parse_cache_stats = (0, 0)
+
+
+def _get_env_parse_cache_stats(env) -> dict[str, tuple[int, int]]:
+    # Maps document names to the cache hits and misses while reading that document
+    if not hasattr(env, "antsibull_parse_cache_stats"):
+        env.antsibull_parse_cache_stats = {}
+    return env.antsibull_parse_cache_stats
+
+
+# pylint:disable-next=unused-argument
+def _reset_parse_cache_stats(app, env, docnames):
+    global _last_parse_cache_stats  # pylint:disable=global-statement
+    _last_parse_cache_stats = get_parse_cache_stats()
+    env.antsibull_parse_cache_stats = {}
+
+
+# pylint:disable-next=unused-argument
+def _purge_parse_cache_stats(app, env, docname):
+    _get_env_parse_cache_stats(env).pop(docname, None)
+
+
+# pylint:disable-next=unused-argument
+def _merge_parse_cache_stats(app, env, docnames, other):
+    stats = _get_env_parse_cache_stats(env)
+    other_stats = _get_env_parse_cache_stats(other)
+    for docname in docnames:
+        if docname in other_stats:
+            stats[docname] = other_stats[docname]
+
+
+# pylint:disable-next=unused-argument
+def _record_parse_cache_stats(app, doctree):
+    global _last_parse_cache_stats  # pylint:disable=global-statement
+    hits, misses = get_parse_cache_stats()
+    last_hits, last_misses = _last_parse_cache_stats
+    _last_parse_cache_stats = (hits, misses)
+    _get_env_parse_cache_stats(app.env)[app.env.docname] = (
+        hits - last_hits,
+        misses - last_misses,
+    )
+
+
+def _report_parse_cache_stats(app, exc):
+    """
+    Report the cache hits of the documents read in this build on 'build-finished'.
+    """
+    if exc is not None:
+        return
+    stats = _get_env_parse_cache_stats(app.env).values()
+    hits = sum(doc_hits for doc_hits, _ in stats)
+    lookups = hits + sum(doc_misses for _, doc_misses in stats)
+    if lookups:
+        logger.info(
+            f"antsibull semantic markup: {hits} of {lookups} role lookups"
+            f" were cached ({hits / lookups:.1%})"
+        )
+
+
 def setup_roles(app):
     """
     Setup roles for a Sphinx app object.
     """
     for name, role in ROLES.items():
         app.add_role(name, role)
+
+    # Collect statistics of the role parsing caches. Since documents can be read in
+    # parallel by several worker processes, they are stored per document in the
+    # environment.
+    app.connect("env-before-read-docs", _reset_parse_cache_stats)
+    app.connect("env-purge-doc", _purge_parse_cache_stats)
+    app.connect("env-merge-info", _merge_parse_cache_stats)
+    app.connect("doctree-read", _record_parse_cache_stats)
+    app.connect("build-finished", _report_parse_cache_stats)
@@ -7,6 +7,7 @@
 
 from __future__ import annotations
 
+import re
 import typing as t
 
 import pydantic as p
@@ -46,8 +47,67 @@ class PostprocessorNameRef(p.BaseModel):
     name: str
 
 
-Postprocessor = t.Union[PostprocessorCLI, PostprocessorNameRef]
-NonRefPostprocessor = t.Union[PostprocessorCLI]
+def _validate_regex(value: str) -> str:
+    try:
+        re.compile(value)
+    except re.error as exc:
+        raise ValueError(f"Invalid regular expression {value!r}: {exc}") from exc
+    return value
+
+
+Regex = t.Annotated[str, p.AfterValidator(_validate_regex)]
+
+
+class LineFilterSubstitute(p.BaseModel):
+    model_config = p.ConfigDict(frozen=True, extra="forbid", validate_default=True)
+
+    # Replace all matches of this regular expression in every line
+    substitute: Regex
+    # Replacement; can reference groups with \1, \g<name>, ...
+    replacement: str = ""
+
+
+class LineFilterDelete(p.BaseModel):
+    model_config = p.ConfigDict(frozen=True, extra="forbid", validate_default=True)
+
+    # Remove all lines matching this regular expression
+    delete_matching: Regex
+
+
+class LineFilterKeep(p.BaseModel):
+    model_config = p.ConfigDict(frozen=True, extra="forbid", validate_default=True)
+
+    # Remove all lines not matching this regular expression
+    keep_matching: Regex
+
+
+LineFilter = t.Union[LineFilterSubstitute, LineFilterDelete, LineFilterKeep]
+
+
+class PostprocessorLineFilters(p.BaseModel):
+    model_config = p.ConfigDict(frozen=True, extra="forbid", validate_default=True)
+
+    # Apply these filters in order, in-process
+    line_filters: list[LineFilter]
+
+
+class PostprocessorPython(p.BaseModel):
+    model_config = p.ConfigDict(frozen=True, extra="forbid", validate_default=True)
+
+    # Python callable of the form 'module:function' that is called in-process
+    # with the input as a string, and returns the output as a string
+    python: str = p.Field(pattern=r"^[A-Za-z_][\w.]*:[A-Za-z_][\w.]*$")
+
+
+Postprocessor = t.Union[
+    PostprocessorCLI,
+    PostprocessorLineFilters,
+    PostprocessorPython,
+    PostprocessorNameRef,
+]
+NonRefPostprocessor = t.Union[
+    PostprocessorCLI, PostprocessorLineFilters, PostprocessorPython
+]
 
 
 InventoryVariables = p.RootModel[dict[str, t.Any]]
@@ -74,6 +134,10 @@ class AnsibleOutputTemplate(p.BaseModel):
     skip_last_lines: t.Optional[int] = None
     postprocessors: t.Optional[list[Postprocessor]] = None
     inventory: t.Optional[YAMLInventory] = None
+    # Number of parallel slots occupied while running ansible-playbook
+    weight: t.Optional[p.PositiveInt] = None
+    # Do not run any other ansible-playbook at the same time
+    exclusive: t.Optional[bool] = None
 
     @p.field_validator("env", mode="before")
     @classmethod
@@ -124,4 +188,6 @@ def combine(
         skip_last_lines=_coalesce(data.skip_last_lines, template.skip_last_lines),
         postprocessors=_coalesce(data.postprocessors, template.postprocessors),
         inventory=_coalesce(data.inventory, template.inventory),
+        weight=_coalesce(data.weight, template.weight),
+        exclusive=_coalesce(data.exclusive, template.exclusive),
     )
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+"""
+Compare the time normalize_plugin_info() needs to validate the plugin records of the
+functional tests with validating every field separately.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "units"))
+
+# pylint: disable-next=wrong-import-position
+from test_process_docs import (  # noqa: E402
+    _load_functional_test_dumps,
+    _normalize_combined,
+    _normalize_fields_separately,
+    _normalize_records,
+)
+
+records = _load_functional_test_dumps()
+
+
+def measure(normalize) -> float:
+    durations = []
+    for dummy in range(5):
+        copies = copy.deepcopy(records)
+        start = time.perf_counter()
+        _normalize_records(normalize, copies)
+        durations.append(time.perf_counter() - start)
+    return min(durations) * 1e6 / len(records)
+
+
+combined_time = measure(_normalize_combined)
+separately_time = measure(_normalize_fields_separately)
+print(
+    f"{len(records)} plugin records: combined {combined_time:.1f} us/record;"
+    f" separately {separately_time:.1f} us/record"
+)
@@ -4,20 +4,39 @@
 
 from __future__ import annotations
 
+import asyncio
 import io
 import os
 import subprocess
+import sys
 import typing as t
 from contextlib import contextmanager, redirect_stdout
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from unittest import mock
 
+import pydantic
 import pytest
 from utils import change_cwd
 
-from antsibull_docs.ansible_output.process import _compose_error
+from antsibull_docs.ansible_output.load import Block, Environment
+from antsibull_docs.ansible_output.process import (
+    BlockTimings,
+    ReplacementCache,
+    _apply_postprocessor,
+    _compose_error,
+    _hash_python_postprocessor,
+    _load_python_postprocessor,
+)
 from antsibull_docs.cli.antsibull_docs import run
+from antsibull_docs.cli.doc_commands.ansible_output import _schedule, find_blocks
+from antsibull_docs.utils.cache import ResultCache
+from sphinx_antsibull_ext.schemas.ansible_output_data import (
+    NonRefPostprocessor,
+    Postprocessor,
+    PostprocessorCLI,
+    PostprocessorPython,
+)
 
 
 @dataclass
@@ -1581,3 +1600,511 @@ def test_ansible_output_replace(
     else:
         assert is_stat_equal(old_stat, new_stat)
     assert rst_path.read_text() == rst_new_content
+
+
+CACHED_RST_CONTENT = """
+.. ansible-output-data::
+
+    playbook: |-
+      - hosts: localhost
+        tasks:
+          - ansible.builtin.debug:
+              msg: {message}
+
+.. code-block:: ansible-output
+
+    ok: {message}
+"""
+
+
+def test_ansible_output_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    module_path = (
+        tmp_path / "collections/ansible_collections/foo/bar/plugins/modules/mod.py"
+    )
+    module_path.parent.mkdir(parents=True)
+    module_path.write_text("# Version 1\n")
+    monkeypatch.setenv("ANSIBLE_COLLECTIONS_PATH", str(tmp_path / "collections"))
+    monkeypatch.setenv("SOME_CI_RUN_ID", "1")
+    config_file = tmp_path / "antsibull.cfg"
+    config_file.write_text(f'cache_dir = "{tmp_path / "cache"}"\n')
+    rst_path = tmp_path / "test.rst"
+
+    commands: list[list[str]] = []
+
+    async def execute(
+        command: list[str],
+        *,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        stdin: str | None = None,
+    ) -> str:
+        commands.append(command)
+        if command == ["ansible-playbook", "--version"]:
+            return "ansible-playbook [core 2.19.0]\n"
+        assert cwd is not None
+        message = (cwd / "playbook.yml").read_text().rsplit(" ", 1)[1]
+        return f"\nok: {message}\n"
+
+    def check(*args: str) -> int:
+        command = [
+            "antsibull-docs",
+            "--config-file",
+            str(config_file),
+            "ansible-output",
+            "--check",
+            "--no-force-color",
+            *args,
+            "test.rst",
+        ]
+        commands.clear()
+        with change_cwd(tmp_path):
+            with redirect_stdout(io.StringIO()):
+                with mock.patch(
+                    "antsibull_docs.ansible_output.process._execute", execute
+                ):
+                    return run(command)
+
+    playbook_command = ["ansible-playbook", "playbook.yml"]
+    version_command = ["ansible-playbook", "--version"]
+    rst_path.write_text(CACHED_RST_CONTENT.format(message="foo"))
+    assert check() == 0
+    assert commands == [version_command, playbook_command]
+
+    # The result is now cached
+    assert check() == 0
+    assert commands == [version_command]
+
+    # --force runs ansible-playbook again
+    assert check("--force") == 0
+    assert commands == [version_command, playbook_command]
+
+    # Changing the playbook runs ansible-playbook again
+    rst_path.write_text(CACHED_RST_CONTENT.format(message="bar"))
+    assert check() == 0
+    assert commands == [version_command, playbook_command]
+    assert check() == 0
+    assert commands == [version_command]
+
+    # Environment variables that do not configure Ansible are ignored
+    monkeypatch.setenv("SOME_CI_RUN_ID", "2")
+    assert check() == 0
+    assert commands == [version_command]
+
+    # Changing Ansible's configuration runs ansible-playbook again
+    monkeypatch.setenv("ANSIBLE_STDOUT_CALLBACK", "community.general.yaml")
+    assert check() == 0
+    assert commands == [version_command, playbook_command]
+
+    # Changing a collection in the collection search path runs ansible-playbook again
+    module_path.write_text("# Version 2\n")
+    assert check() == 0
+    assert commands == [version_command, playbook_command]
+    assert check() == 0
+    assert commands == [version_command]
+
+
+def test_ansible_output_cache_key_python_postprocessor(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    (tmp_path / "test.rst").write_text(CACHED_RST_CONTENT.format(message="foo"))
+    with change_cwd(tmp_path):
+        errors, blocks = find_blocks(
+            ["test.rst"], environment=Environment(env={}, global_postprocessors={})
+        )
+    assert not errors
+    block = replace(
+        blocks[0],
+        merged_postprocessors=[
+            PostprocessorPython(python="antsibull_test_postprocessor:process")
+        ],
+    )
+    cache = ReplacementCache(
+        ResultCache(tmp_path / "cache", "ansible-output"), ansible_version="2.19.0"
+    )
+
+    def get_key(source: str) -> str:
+        # Every run of antsibull-docs starts with empty in-memory caches
+        _load_python_postprocessor.cache_clear()
+        _hash_python_postprocessor.cache_clear()
+        sys.modules.pop("antsibull_test_postprocessor", None)
+        (tmp_path / "antsibull_test_postprocessor.py").write_text(source)
+        return cache.get_key(block, "- hosts: localhost")
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    try:
+        key = get_key("def process(value):\n    return value\n")
+        assert get_key("def process(value):\n    return value\n") == key
+        assert get_key("def process(value):\n    return value.upper()\n") != key
+    finally:
+        _load_python_postprocessor.cache_clear()
+        _hash_python_postprocessor.cache_clear()
+        sys.modules.pop("antsibull_test_postprocessor", None)
+
+
+def test_find_blocks_order(tmp_path: Path):
+    for path in ("b/z.rst", "b/a.rst", "a.rst", "c/broken.rst", "c/x.txt"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(CACHED_RST_CONTENT.format(message=path))
+    (tmp_path / "c" / "broken.rst").write_text(
+        ".. ansible-output-data::\n\n    foo: bar\n"
+    )
+    (tmp_path / "single.rst").write_text(CACHED_RST_CONTENT.format(message="single"))
+
+    environment = Environment(env={}, global_postprocessors={})
+    with change_cwd(tmp_path):
+        errors, blocks = find_blocks(
+            ["single.rst", ".", "missing"], environment=environment
+        )
+    assert [block.id for block in blocks] == [
+        "single.rst-1",
+        "a.rst-1",
+        "single.rst-1",
+        "b/a.rst-1",
+        "b/z.rst-1",
+    ]
+    playbook_sources = []
+    for block in blocks:
+        assert block.data.playbook is not None
+        playbook_sources.append(block.data.playbook.split()[-1])
+    assert playbook_sources == [
+        "single",
+        "a.rst",
+        "single",
+        "b/a.rst",
+        "b/z.rst",
+    ]
+    assert [error.path for error in errors] == [
+        Path("missing"),
+        Path("c") / "broken.rst",
+    ]
+
+
+SCHEDULED_RST_CONTENT = """
+.. ansible-output-meta::
+
+    actions:
+      - name: set-template
+        template:
+          weight: 2
+          playbook: |-
+            - hosts: localhost
+
+.. ansible-output-data::
+
+    playbook: null
+    env:
+      NAME: heavy
+
+.. code-block:: ansible-output
+
+.. ansible-output-data::
+
+    playbook: null
+    env:
+      NAME: exclusive
+    exclusive: true
+
+.. code-block:: ansible-output
+
+.. ansible-output-data::
+
+    playbook: null
+    env:
+      NAME: light-1
+    weight: 1
+
+.. code-block:: ansible-output
+
+.. ansible-output-data::
+
+    playbook: null
+    env:
+      NAME: light-2
+    weight: 1
+
+.. code-block:: ansible-output
+
+.. ansible-output-data::
+
+    playbook: null
+    env:
+      NAME: unknown
+    weight: 1
+
+.. code-block:: ansible-output
+"""
+
+
+def test_ansible_output_schedule(tmp_path: Path):
+    (tmp_path / "test.rst").write_text(SCHEDULED_RST_CONTENT)
+    with change_cwd(tmp_path):
+        errors, blocks = find_blocks(
+            ["test.rst"], environment=Environment(env={}, global_postprocessors={})
+        )
+    assert errors == []
+    names = {block.id: block.merged_env["NAME"] for block in blocks}
+    assert [(block.data.weight, block.data.exclusive) for block in blocks] == [
+        (2, None),
+        (2, True),
+        (1, None),
+        (1, None),
+        (1, None),
+    ]
+
+    timings = BlockTimings()
+    for block, duration in zip(blocks, [3.0, 2.0, 1.0, 4.0]):
+        timings.record(block, duration)
+    timings.durations.pop(blocks[-1].id, None)
+
+    starts: list[tuple[str, int]] = []
+    load = 0
+
+    async def run(block: Block) -> str:
+        nonlocal load
+        name = names[block.id]
+        weight = 3 if block.data.exclusive else (block.data.weight or 1)
+        load += weight
+        starts.append((name, load))
+        await asyncio.sleep(0.1 if name == "light-2" else 0.01)
+        load -= weight
+        return name
+
+    results = asyncio.run(_schedule(blocks, parallelism=3, timings=timings, run=run))
+    assert results == [names[block.id] for block in blocks]
+    # Unknown durations first, then longest first; the load never exceeds the
+    # parallelism, and exclusive blocks run alone
+    assert starts == [
+        ("unknown", 1),
+        ("light-2", 2),
+        ("heavy", 3),
+        ("exclusive", 3),
+        ("light-1", 1),
+    ]
+
+
+def test_ansible_output_timings(tmp_path: Path):
+    config_file = tmp_path / "antsibull.cfg"
+    config_file.write_text(f'cache_dir = "{tmp_path / "cache"}"\n')
+    (tmp_path / "test.rst").write_text(CACHED_RST_CONTENT.format(message="foo"))
+
+    async def execute(
+        command: list[str],
+        *,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        stdin: str | None = None,
+    ) -> str:
+        if command == ["ansible-playbook", "--version"]:
+            return "ansible-playbook [core 2.19.0]\n"
+        return "\nok: foo\n"
+
+    def check() -> str:
+        command = [
+            "antsibull-docs",
+            "--config-file",
+            str(config_file),
+            "ansible-output",
+            "--check",
+            "--no-force-color",
+            "--timings",
+            "test.rst",
+        ]
+        stdout = io.StringIO()
+        with change_cwd(tmp_path):
+            with redirect_stdout(stdout):
+                with mock.patch(
+                    "antsibull_docs.ansible_output.process._execute", execute
+                ):
+                    assert run(command) == 0
+        return stdout.getvalue()
+
+    output = check()
+    assert "Timings:" in output
+    assert "s test.rst:4\n" in output
+    timings_dir = tmp_path / "cache" / "ansible-output-timings"
+    assert len(list(timings_dir.glob("*/*.json"))) == 1
+
+    # The second run uses the cached result
+    output = check()
+    assert "s test.rst:4\n" not in output
+    assert "1 code block not run" in output
+
+
+POSTPROCESSOR_INPUT = [
+    "TASK [Show result] ***",
+    "ok: [localhost] => {",
+    '    "result": "/tmp/ansible-12345/foo"',
+    "}",
+    "",
+    "changed: [localhost]",
+]
+
+
+@pytest.mark.parametrize(
+    "postprocessor, script",
+    [
+        (
+            {
+                "line_filters": [
+                    {"delete_matching": "^TASK "},
+                    {"substitute": r"/tmp/ansible-\d+/", "replacement": "/tmp/"},
+                    {
+                        "substitute": r"^(ok|changed): \[(\w+)\]",
+                        "replacement": r"\2 \1",
+                    },
+                ],
+            },
+            "import re, sys\n"
+            "for line in sys.stdin.read().split('\\n')[:-1]:\n"
+            "    if re.search('^TASK ', line):\n"
+            "        continue\n"
+            "    line = re.sub(r'/tmp/ansible-\\d+/', '/tmp/', line)\n"
+            "    line = re.sub(r'^(ok|changed): \\[(\\w+)\\]', r'\\2 \\1', line)\n"
+            "    print(line)\n",
+        ),
+        (
+            {"line_filters": [{"keep_matching": "result"}]},
+            "import sys\n"
+            "for line in sys.stdin:\n"
+            "    if 'result' in line:\n"
+            "        sys.stdout.write(line)\n",
+        ),
+        (
+            {"python": "textwrap:dedent"},
+            "import sys, textwrap\n"
+            "sys.stdout.write(textwrap.dedent(sys.stdin.read()))\n",
+        ),
+    ],
+)
+def test_ansible_output_in_process_postprocessors(postprocessor, script):
+    in_process = pydantic.TypeAdapter(Postprocessor).validate_python(postprocessor)
+    command = PostprocessorCLI(command=[sys.executable, "-c", script])
+
+    async def apply(postprocessor: NonRefPostprocessor) -> list[str]:
+        return await _apply_postprocessor(
+            POSTPROCESSOR_INPUT,
+            block_id="test",
+            env=dict(os.environ),
+            postprocessor=postprocessor,
+        )
+
+    assert asyncio.run(apply(in_process)) == asyncio.run(apply(command))
+
+
+@pytest.mark.parametrize(
+    "postprocessor, message",
+    [
+        ({"line_filters": [{"substitute": "("}]}, "Invalid regular expression"),
+        ({"python": "textwrap"}, "String should match pattern"),
+    ],
+)
+def test_ansible_output_in_process_postprocessors_invalid(postprocessor, message):
+    with pytest.raises(pydantic.ValidationError, match=message):
+        pydantic.TypeAdapter(Postprocessor).validate_python(postprocessor)
+
+
+@pytest.mark.parametrize(
+    "reference, message",
+    [
+        ("does_not_exist:foo", "Cannot load Python postprocessor"),
+        ("textwrap:does_not_exist", "Cannot load Python postprocessor"),
+        ("textwrap:__doc__", "is not callable"),
+        ("textwrap:wrap", "returned <class 'list'> instead of a string"),
+    ],
+)
+def test_ansible_output_python_postprocessor_errors(reference, message):
+    with pytest.raises(ValueError, match=message):
+        asyncio.run(
+            _apply_postprocessor(
+                POSTPROCESSOR_INPUT,
+                block_id="test",
+                env={},
+                postprocessor=PostprocessorPython(python=reference),
+            )
+        )
+
+
+WORKSPACE_RST_CONTENT = """
+.. ansible-output-data::
+
+    playbook: "- hosts: localhost"
+    env:
+      NAME: a
+
+.. code-block:: ansible-output
+
+    ok
+
+.. ansible-output-data::
+
+    playbook: "- hosts: localhost"
+    env:
+      NAME: b
+      ANSIBLE_LOCAL_TEMP: /tmp/foo
+    inventory:
+      all:
+        hosts:
+          localhost: {}
+
+.. code-block:: ansible-output
+
+    ok
+
+.. ansible-output-data::
+
+    playbook: "- hosts: localhost"
+    env:
+      NAME: a
+
+.. code-block:: ansible-output
+
+    ok
+"""
+
+
+def test_ansible_output_reuse_workspaces(tmp_path: Path):
+    config_file = tmp_path / "antsibull.cfg"
+    config_file.write_text("process_max = 1\n")
+    (tmp_path / "test.rst").write_text(WORKSPACE_RST_CONTENT)
+
+    calls: list[tuple[Path, dict[str, str], list[str]]] = []
+
+    async def execute(
+        command: list[str],
+        *,
+        cwd: Path | None = None,
+        env: dict[str, str] | None = None,
+        stdin: str | None = None,
+    ) -> str:
+        assert cwd is not None and env is not None
+        calls.append((cwd, env, sorted(entry.name for entry in cwd.iterdir())))
+        # Leave some state behind that must be removed before the next block
+        (cwd / "retry").write_text("")
+        # (this fails if the directory is not emptied before it is reused)
+        (cwd / "local-tmp" / "ansible-tmp").mkdir()
+        return "\nok\n"
+
+    command = [
+        "antsibull-docs",
+        "--config-file",
+        str(config_file),
+        "ansible-output",
+        "--check",
+        "--reuse-workspaces",
+        "test.rst",
+    ]
+    with change_cwd(tmp_path):
+        with redirect_stdout(io.StringIO()):
+            with mock.patch("antsibull_docs.ansible_output.process._execute", execute):
+                assert run(command) == 0
+
+    assert len(calls) == 3
+    (cwd_a, env_a, files_a), (cwd_b, env_b, files_b), (cwd_c, env_c, files_c) = calls
+    assert cwd_a == cwd_c != cwd_b
+    assert env_a == env_c
+    assert env_a["ANSIBLE_LOCAL_TEMP"] == str(cwd_a / "local-tmp")
+    assert "ANSIBLE_CACHE_PLUGIN_CONNECTION" not in env_a
+    assert env_b["ANSIBLE_LOCAL_TEMP"] == "/tmp/foo"
+    assert files_a == files_c == ["local-tmp", "playbook.yml"]
+    assert files_b == ["inventory.yaml", "local-tmp", "playbook.yml"]
+    assert not cwd_a.parent.exists()
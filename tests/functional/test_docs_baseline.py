@@ -6,7 +6,8 @@ from __future__ import annotations
 
 import io
 import os
-from contextlib import redirect_stdout
+from contextlib import nullcontext, redirect_stdout
+from unittest import mock
 
 import pytest
 from ansible_doc_caching import ansible_doc_cache
@@ -150,3 +151,57 @@ def test_baseline(arguments: list[str], directory: str, tmp_path) -> None:
     source = scan_directories(os.path.join(tests_root, directory))
     dest = scan_directories(str(output_dir))
     compare_directories(source, dest)
+
+
+@pytest.mark.parametrize(
+    "arguments, directory",
+    [TEST_CASES[1], TEST_CASES[5]],
+)
+def test_baseline_cached(arguments: list[str], directory: str, tmp_path) -> None:
+    tests_root = os.path.join("tests", "functional")
+
+    config_file = tmp_path / "antsibull.cfg"
+    with open(config_file, "w", encoding="utf-8") as f:
+        f.write("doc_parsing_backend = ansible-core-2.13\n")
+        f.write(f'cache_dir = "{tmp_path / "cache"}"\n')
+
+    os.environ.pop("ANSIBLE_COLLECTIONS_PATHS", None)
+    os.environ["ANSIBLE_COLLECTIONS_PATH"] = os.path.join(tests_root, "collections")
+    source = scan_directories(os.path.join(tests_root, directory))
+
+    # Build twice; the second build uses the cached results of the first one
+    for run_index in range(2):
+        output_dir = tmp_path / f"output-{run_index}"
+        os.mkdir(output_dir, mode=0o700)
+        command = (
+            ["antsibull-docs", "--config-file", str(config_file)]
+            + arguments
+            + [
+                "--dest-dir",
+                str(output_dir),
+            ]
+        )
+        # The second build must not render any changelog
+        render_changelog = (
+            mock.patch(
+                "antsibull_docs.write_docs.changelog._render_changelog",
+                side_effect=AssertionError("changelog not cached"),
+            )
+            if run_index > 0
+            else nullcontext()
+        )
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            with ansible_doc_cache():
+                with replace_antsibull_version():
+                    with render_changelog as render:
+                        rc = run(command)
+        print(stdout.getvalue())
+        assert rc == 0
+        if render is not None:
+            render.assert_not_called()
+
+        dest = scan_directories(str(output_dir))
+        compare_directories(source, dest)
+
+    assert os.listdir(tmp_path / "cache" / "changelogs")
@@ -7,14 +7,17 @@ from __future__ import annotations
 import io
 import json
 import os
+import shutil
 import typing as t
 from contextlib import redirect_stdout
+from unittest import mock
 
 import pytest
 from ansible_doc_caching import ansible_doc_cache
 from utils import change_cwd, update_environment
 
 from antsibull_docs.cli.antsibull_docs import run
+from antsibull_docs.utils.file_watcher import FileWatcher
 
 
 def write_file(path, content):
@@ -196,6 +199,85 @@ Foo ``bar`.
     ]
 
 
+def test_docsite_linting_cached(tmp_path_factory):
+    dir = tmp_path_factory.mktemp("foo.bar")
+    write_file(
+        dir / "galaxy.yml",
+        b"""
+namespace: foo
+name: bar
+""",
+    )
+    docsite_dir = dir / "docs" / "docsite"
+    docsite_rst_dir = docsite_dir / "rst"
+    os.makedirs(docsite_rst_dir)
+    write_file(
+        docsite_dir / "extra-docs.yml",
+        b"""
+sections:
+  - title: Foo
+    toctree:
+      - bar
+      - baz
+      - foo
+""",
+    )
+    for name in ("bar", "baz", "foo"):
+        write_file(
+            docsite_rst_dir / f"{name}.rst",
+            f"""
+.. _ansible_collections.foo.bar.docsite.{name}:
+
+{name.title()}
+===
+
+.. toctree::
+
+  does-not-exist
+""".encode("utf-8"),
+        )
+    cache_dir = dir / "cache"
+    config_file = dir / "antsibull.cfg"
+    write_file(config_file, f"cache_dir = {json.dumps(str(cache_dir))}\n".encode())
+
+    def lint():
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            rc = run(
+                [
+                    "antsibull-docs",
+                    "--config-file",
+                    str(config_file),
+                    "lint-collection-docs",
+                    str(dir),
+                ]
+            )
+        assert rc == 3
+        return stdout.getvalue().splitlines()
+
+    expected = [
+        f"{docsite_rst_dir / name}.rst:9:0:"
+        " Toctree entry 'does-not-exist' does not reference an existing file"
+        for name in ("bar", "baz", "foo")
+    ]
+    assert lint() == expected
+    assert len(list((cache_dir / "extra-docs-lint").glob("*/*.json"))) == 3
+    assert lint() == expected
+
+    # Changing a file's content invalidates its cached result
+    write_file(
+        docsite_rst_dir / "baz.rst",
+        b"""
+.. _ansible_collections.foo.bar.docsite.baz:
+
+Baz
+===
+""",
+    )
+    assert lint() == [expected[0], expected[2]]
+    assert len(list((cache_dir / "extra-docs-lint").glob("*/*.json"))) == 4
+
+
 TEST_CASES: list[
     tuple[
         str,
@@ -4293,12 +4375,14 @@ TEST_CASES: list[
 ]
 
 
+@pytest.mark.parametrize("link_collections", [False, True])
 @pytest.mark.parametrize(
     "id, namespace, name, parameters, environment, rc, errors",
     TEST_CASES,
     ids=[entry[0] for entry in TEST_CASES],
 )
 def test_lint_collection_plugin_docs(
+    link_collections: bool,
     id: int,
     namespace: str,
     name: str,
@@ -4325,6 +4409,8 @@ def test_lint_collection_plugin_docs(
         ".",
         *parameters,
     ]
+    if link_collections:
+        command.append("--link-collections")
 
     stdout = io.StringIO()
     with change_cwd(collection_root):
@@ -4351,3 +4437,138 @@ def test_lint_collection_plugin_docs(
             with open(f"lint-{id}-errors.json", "w", encoding="utf-8") as f:
                 f.write(stdout_value)
         assert actual_errors == errors
+
+
+CACHED_TEST_CASES = [
+    entry
+    for entry in TEST_CASES
+    if entry[0] in ("ns.col2-dependent", "ns.col2-dependent-disallow")
+]
+
+
+@pytest.mark.parametrize(
+    "id, namespace, name, parameters, environment, rc, errors",
+    CACHED_TEST_CASES,
+    ids=[entry[0] for entry in CACHED_TEST_CASES],
+)
+def test_lint_collection_plugin_docs_cached(
+    id: int,
+    namespace: str,
+    name: str,
+    parameters: tuple[str, ...],
+    environment: dict[str, str | None],
+    rc: int,
+    errors: list[str] | dict[str, t.Any],
+    tmp_path,
+) -> None:
+    tests_root = os.path.dirname(__file__)
+    collection_root = os.path.join(
+        tests_root, "collections", "ansible_collections", namespace, name
+    )
+
+    cache_dir = tmp_path / "cache"
+    config_file = tmp_path / "antsibull.cfg"
+    with open(config_file, "w", encoding="utf-8") as f:
+        f.write("doc_parsing_backend = ansible-core-2.13\n")
+        f.write(f"cache_dir = {json.dumps(str(cache_dir))}\n")
+
+    command = [
+        "antsibull-docs",
+        "--config-file",
+        str(config_file),
+        "lint-collection-docs",
+        ".",
+        *parameters,
+    ]
+
+    # The first run fills the cache, the second one uses it
+    for _ in range(2):
+        stdout = io.StringIO()
+        with change_cwd(collection_root):
+            with redirect_stdout(stdout):
+                with ansible_doc_cache():
+                    with update_environment(environment):
+                        actual_rc = run(command)
+
+        stdout_value = stdout.getvalue()
+        print(stdout_value)
+        assert actual_rc == rc
+        if isinstance(errors, list):
+            assert stdout_value.splitlines() == errors
+        else:
+            assert json.loads(stdout_value) == errors
+
+    assert list((cache_dir / "collection-names").glob("*/*.json"))
+
+
+def test_lint_collection_docs_watch(tmp_path) -> None:
+    tests_root = os.path.dirname(__file__)
+    collection_root = tmp_path / "ansible_collections" / "ns" / "col2"
+    shutil.copytree(
+        os.path.join(tests_root, "collections", "ansible_collections", "ns", "col2"),
+        collection_root,
+    )
+
+    config_file = tmp_path / "antsibull.cfg"
+    with open(config_file, "w", encoding="utf-8") as f:
+        f.write("doc_parsing_backend = ansible-core-2.13\n")
+
+    command = [
+        "antsibull-docs",
+        "--config-file",
+        str(config_file),
+        "lint-collection-docs",
+        ".",
+        "--plugin-docs",
+        "--validate-collection-refs",
+        "self",
+        "--no-disallow-unknown-collection-refs",
+        "--check-extra-docs-refs",
+    ]
+
+    def lint(*args: str) -> tuple[int, list[str]]:
+        stdout = io.StringIO()
+        with change_cwd(collection_root):
+            with redirect_stdout(stdout):
+                with ansible_doc_cache():
+                    rc = run([*command, *args])
+        return rc, stdout.getvalue().splitlines()
+
+    rc, initial = lint()
+    assert rc == 3
+
+    guide = collection_root / "docs" / "docsite" / "rst" / "filter_guide.rst"
+    module = collection_root / "plugins" / "modules" / "foo.py"
+    toctree_error = (
+        "docs/docsite/rst/filter_guide.rst:19:0:"
+        " Toctree entry 'does-not-exist' does not reference an existing file"
+    )
+
+    def add_toctree():
+        with open(guide, "a", encoding="utf-8") as f:
+            f.write("\n.. toctree::\n\n  does-not-exist\n")
+
+    def touch_module():
+        with open(module, "a", encoding="utf-8") as f:
+            f.write("\n# Comment\n")
+
+    def stop():
+        raise KeyboardInterrupt
+
+    steps = iter([add_toctree, touch_module, stop])
+    real_poll = FileWatcher.poll
+
+    def wait_for_changes(self, interval: float = 1.0) -> set[str]:
+        next(steps)()
+        return real_poll(self)
+
+    with mock.patch.object(FileWatcher, "wait_for_changes", wait_for_changes):
+        # The cached ansible-doc output does not exactly match the module's sources
+        rc, output = lint("--watch", "--no-fast-docs-extraction")
+
+    assert rc == 3
+    updated = output[len(initial) :]
+    assert output[: len(initial)] == initial
+    assert len(updated) == 2 * (len(initial) + 1)
+    assert updated[: len(initial) + 1] == updated[len(initial) + 1 :]
+    assert sorted(updated[: len(initial) + 1]) == sorted([*initial, toctree_error])
@@ -0,0 +1,184 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import threading
+import time
+import typing as t
+import urllib.error
+import urllib.request
+from contextlib import redirect_stdout
+from unittest import mock
+
+import pytest
+from ansible_doc_caching import ansible_doc_cache
+from utils import replace_antsibull_version
+
+from antsibull_docs.cli.antsibull_docs import run
+
+pytest.importorskip("ansible")
+
+
+BASELINE_PAGES = [
+    "collections/index.rst",
+    "collections/index_module.rst",
+    "collections/ns2/col/index.rst",
+    "collections/ns2/col/foo_module.rst",
+    "collections/ns2/col/foo_role.rst",
+    "collections/ns2/col/foo_redirect_module.rst",
+    "collections/ns2/col/changelog.rst",
+    "collections/ns2/flatcol/foo_module.rst",
+]
+
+
+_ResponseT = tuple[int, t.Optional[str], t.Optional[str]]
+
+
+def _serve(
+    tmp_path,
+    collections_path: str,
+    collections: list[str],
+    client: t.Callable[[t.Callable[[str], _ResponseT]], None],
+    *args: str,
+) -> None:
+    config_file = tmp_path / "antsibull.cfg"
+    with open(config_file, "w", encoding="utf-8") as f:
+        f.write("doc_parsing_backend = ansible-core-2.13\n")
+
+    def serve_forever(httpd, *args, **kwargs):
+        host, port = httpd.server_address[:2]
+
+        def get(path: str) -> _ResponseT:
+            try:
+                with urllib.request.urlopen(f"http://{host}:{port}/{path}") as response:
+                    return (
+                        response.status,
+                        response.headers["Content-Type"],
+                        response.read().decode("utf-8"),
+                    )
+            except urllib.error.HTTPError as exc:
+                return exc.code, None, None
+
+        thread = threading.Thread(target=client, args=(get,))
+        thread.start()
+        httpd.timeout = 0.1
+        while thread.is_alive():
+            httpd.handle_request()
+        thread.join()
+
+    command = [
+        "antsibull-docs",
+        "--config-file",
+        str(config_file),
+        "serve",
+        *collections,
+        "--port",
+        "0",
+        *args,
+    ]
+    os.environ.pop("ANSIBLE_COLLECTIONS_PATHS", None)
+    os.environ["ANSIBLE_COLLECTIONS_PATH"] = collections_path
+    stdout = io.StringIO()
+    with redirect_stdout(stdout):
+        with ansible_doc_cache():
+            with replace_antsibull_version():
+                with mock.patch("http.server.HTTPServer.serve_forever", serve_forever):
+                    rc = run(command)
+    print(stdout.getvalue())
+    assert rc == 0
+    assert "Serving documentation on http://127.0.0.1:" in stdout.getvalue()
+
+
+def test_serve(tmp_path) -> None:
+    paths = [
+        *BASELINE_PAGES,
+        "collections/ns2/col/foo_module.html",
+        "collections/ns2/col/does_not_exist_module.rst",
+        "",
+    ]
+    responses: dict[str, _ResponseT] = {}
+
+    def client(get: t.Callable[[str], _ResponseT]) -> None:
+        for path in paths:
+            responses[path] = get(path)
+
+    _serve(
+        tmp_path,
+        os.path.join("tests", "functional", "collections"),
+        ["ns.col1", "ns.col2", "ns2.col", "ns2.flatcol"],
+        client,
+        "--no-watch",
+    )
+
+    # The pages are identical to the ones written by the collection subcommand
+    for path in BASELINE_PAGES:
+        with open(
+            os.path.join("tests", "functional", "baseline-simplified-rst", path),
+            encoding="utf-8",
+        ) as f:
+            expected = f.read()
+        assert responses[path] == (200, "text/plain; charset=utf-8", expected)
+
+    status, content_type, content = responses["collections/ns2/col/foo_module.html"]
+    assert status == 200
+    assert content_type == "text/html; charset=utf-8"
+    assert content is not None
+    assert "<h1" in content
+    assert 'href="foo2_module.html"' in content
+
+    assert responses["collections/ns2/col/does_not_exist_module.rst"][0] == 404
+
+    status, content_type, content = responses[""]
+    assert status == 200
+    assert content is not None
+    assert 'href="collections/ns2/col/foo_module.html"' in content
+    assert 'href="collections/ns2/col/foo_module.rst"' in content
+
+
+def test_serve_watch(tmp_path) -> None:
+    tests_root = os.path.join("tests", "functional")
+    collections_path = tmp_path / "collections"
+    collection_root = collections_path / "ansible_collections" / "ns2" / "col"
+    shutil.copytree(
+        os.path.join(tests_root, "collections", "ansible_collections", "ns2", "col"),
+        collection_root,
+    )
+    module = collection_root / "plugins" / "modules" / "foo.py"
+    page = "collections/ns2/col/foo_module.rst"
+
+    contents: list[t.Optional[str]] = []
+
+    def client(get: t.Callable[[str], _ResponseT]) -> None:
+        contents.append(get(page)[2])
+        content = module.read_text(encoding="utf-8")
+        module.write_text(
+            content.replace(
+                "short_description: Do some foo", "short_description: Frobnicate"
+            ),
+            encoding="utf-8",
+        )
+        for dummy in range(100):
+            time.sleep(0.1)
+            new_content = get(page)[2]
+            if new_content != contents[0]:
+                break
+        contents.append(new_content)
+
+    _serve(
+        tmp_path,
+        str(collections_path),
+        ["ns2.col"],
+        client,
+        "--watch-interval",
+        "0.05",
+    )
+
+    assert contents[0] is not None
+    assert "Frobnicate" not in contents[0]
+    assert contents[1] is not None
+    assert "Frobnicate" in contents[1]
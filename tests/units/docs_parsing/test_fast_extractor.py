@@ -0,0 +1,311 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from antsibull_docs.collection_config import CollectionConfig
+from antsibull_docs.docs_parsing import AnsibleCollectionMetadata
+from antsibull_docs.docs_parsing.fast_extractor import (
+    UnsupportedPluginError,
+    extract_plugin_info,
+)
+
+FILES = {
+    "builtin/plugins/doc_fragments/files.py": '''
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+  mode:
+    description: The mode.
+    type: raw
+"""
+''',
+    "foo/bar/plugins/doc_fragments/frag.py": '''
+class ModuleDocFragment(object):
+    DOCUMENTATION = r"""
+options:
+  frag:
+    description: From the fragment.
+    type: str
+    version_added: 0.5.0
+notes:
+  - Fragment note.
+requirements:
+  - zzz
+"""
+
+    OTHER = r"""
+attributes:
+  check_mode:
+    description: Check mode.
+    support: full
+"""
+''',
+    "foo/bar/plugins/modules/mod.py": '''
+DOCUMENTATION = r"""
+module: mod
+short_description: A module
+version_added: 1.0.0
+description: A module.
+author: Someone
+requirements:
+  - aaa
+deprecated:
+  removed_in: 3.0.0
+  why: Old.
+  alternative: Nothing.
+extends_documentation_fragment:
+  - foo.bar.frag
+  - foo.bar.frag.other
+  - files
+options:
+  opt:
+    description: An option.
+    type: dict
+    version_added: 1.1.0
+    suboptions:
+      sub:
+        description: A suboption.
+        type: str
+        default: 2020-01-02
+"""
+
+EXAMPLES = """
+- foo.bar.mod:
+    opt: {}
+"""
+
+RETURN = """
+value:
+  description: A value.
+  returned: success
+  type: dict
+  version_added: 1.2.0
+  contains:
+    sub:
+      description: A sub-value.
+      returned: success
+      type: str
+      version_added: 1.3.0
+"""
+''',
+    "foo/bar/plugins/action/mod.py": "",
+    "foo/bar/plugins/modules/win.ps1": "",
+    "foo/bar/plugins/modules/win.yml": """
+DOCUMENTATION:
+  module: win
+  short_description: A Windows module
+  description: A Windows module.
+  author: Someone
+EXAMPLES: ""
+""",
+    "foo/bar/plugins/lookup/lookup.py": """
+DOCUMENTATION = {
+    "name": "lookup",
+    "short_description": "A lookup",
+    "options": {
+        "opt": {
+            "description": "An option.",
+            "env": [
+                {"name": "FOO", "deprecated": {"why": "x", "version": "2.0.0"}},
+            ],
+        },
+    },
+}
+""",
+    "foo/bar/roles/role/meta/main.yml": """
+argument_specs:
+  main:
+    short_description: A role
+  other:
+""",
+    "foo/bar/plugins/modules/missing_fragment.py": '''
+DOCUMENTATION = """
+module: missing_fragment
+extends_documentation_fragment: foo.bar.does_not_exist
+"""
+''',
+    "foo/bar/plugins/modules/other_collection.py": '''
+DOCUMENTATION = """
+module: other_collection
+extends_documentation_fragment: other.collection.frag
+"""
+''',
+    "foo/bar/plugins/modules/computed.py": """
+DOCUMENTATION = "module: computed" + ""
+""",
+    "foo/bar/plugins/modules/tagged.py": '''
+DOCUMENTATION = """
+module: tagged
+short_description: !unsafe foo
+"""
+''',
+    "foo/bar/plugins/modules/redirected.py": '''
+DOCUMENTATION = """
+module: redirected
+"""
+''',
+    "foo/bar/meta/runtime.yml": """
+plugin_routing:
+  modules:
+    redirected:
+      redirect: foo.bar.mod
+""",
+}
+
+
+@pytest.fixture
+def collection_metadata(tmp_path):
+    for path, content in FILES.items():
+        full_path = tmp_path / path
+        os.makedirs(full_path.parent, exist_ok=True)
+        full_path.write_text(content)
+    return {
+        "ansible.builtin": AnsibleCollectionMetadata(
+            str(tmp_path / "builtin"), CollectionConfig()
+        ),
+        "foo.bar": AnsibleCollectionMetadata(
+            str(tmp_path / "foo" / "bar"), CollectionConfig()
+        ),
+    }
+
+
+def test_extract_plugin_info(collection_metadata, tmp_path):
+    path = str(tmp_path / "foo" / "bar")
+    result = extract_plugin_info(
+        [
+            ("module", "foo.bar.mod"),
+            ("module", "foo.bar.win"),
+            ("lookup", "foo.bar.lookup"),
+            ("role", "foo.bar.role"),
+        ],
+        collection_metadata,
+    )
+    assert result["module"]["foo.bar.mod"] == {
+        "doc": {
+            "module": "mod",
+            "short_description": "A module",
+            "version_added": "1.0.0",
+            "version_added_collection": "foo.bar",
+            "description": "A module.",
+            "author": "Someone",
+            "requirements": ["aaa", "zzz"],
+            "deprecated": {
+                "removed_in": "3.0.0",
+                "removed_from_collection": "foo.bar",
+                "why": "Old.",
+                "alternative": "Nothing.",
+            },
+            "notes": ["Fragment note."],
+            "options": {
+                "opt": {
+                    "description": "An option.",
+                    "type": "dict",
+                    "version_added": "1.1.0",
+                    "version_added_collection": "foo.bar",
+                    "suboptions": {
+                        "sub": {
+                            "description": "A suboption.",
+                            "type": "str",
+                            "default": "2020-01-02",
+                        },
+                    },
+                },
+                "frag": {
+                    "description": "From the fragment.",
+                    "type": "str",
+                    "version_added": "0.5.0",
+                    "version_added_collection": "foo.bar",
+                },
+                "mode": {
+                    "description": "The mode.",
+                    "type": "raw",
+                },
+            },
+            "attributes": {
+                "check_mode": {
+                    "description": "Check mode.",
+                    "support": "full",
+                },
+            },
+            "filename": os.path.join(path, "plugins", "modules", "mod.py"),
+            "collection": "foo.bar",
+            "plugin_name": "foo.bar.mod",
+            "has_action": True,
+        },
+        "examples": "\n- foo.bar.mod:\n    opt: {}\n",
+        "return": {
+            "value": {
+                "description": "A value.",
+                "returned": "success",
+                "type": "dict",
+                "version_added": "1.2.0",
+                "version_added_collection": "foo.bar",
+                "contains": {
+                    "sub": {
+                        "description": "A sub-value.",
+                        "returned": "success",
+                        "type": "str",
+                        "version_added": "1.3.0",
+                        "version_added_collection": "foo.bar",
+                    },
+                },
+            },
+        },
+        "metadata": None,
+    }
+
+    win = result["module"]["foo.bar.win"]
+    assert win["doc"]["filename"] == os.path.join(path, "plugins", "modules", "win.yml")
+    assert win["doc"]["has_action"] is False
+    assert win["examples"] == ""
+    assert win["return"] is None
+
+    lookup = result["lookup"]["foo.bar.lookup"]
+    assert lookup["doc"]["options"]["opt"]["env"] == [
+        {
+            "name": "FOO",
+            "deprecated": {
+                "why": "x",
+                "version": "2.0.0",
+                "collection_name": "foo.bar",
+            },
+        },
+    ]
+    assert "has_action" not in lookup["doc"]
+
+    assert result["role"]["foo.bar.role"] == {
+        "path": path,
+        "collection": "foo.bar",
+        "entry_points": {
+            "main": {"short_description": "A role"},
+            "other": {},
+        },
+    }
+
+
+@pytest.mark.parametrize(
+    "plugin_type, plugin_name, message",
+    [
+        ("filter", "foo.bar.mod", "Cannot extract filter plugins"),
+        ("module", "foo.bar.does_not_exist", "Cannot determine documentation file"),
+        ("module", "foo.bar.missing_fragment", "Unknown documentation fragment"),
+        ("module", "foo.bar.other_collection", "from an unknown collection"),
+        ("module", "foo.bar.computed", "neither a string nor a dictionary"),
+        ("module", "foo.bar.tagged", "Cannot parse YAML"),
+        ("module", "foo.bar.redirected", "is redirected or removed"),
+        ("module", "foo.bar.sub.mod", "Unsupported plugin name"),
+        ("module", "other.collection.mod", "Cannot extract plugins of"),
+        ("role", "foo.bar.does_not_exist", "has no argument spec"),
+    ],
+)
+def test_extract_plugin_info_unsupported(
+    collection_metadata, plugin_type, plugin_name, message
+):
+    with pytest.raises(UnsupportedPluginError, match=message):
+        extract_plugin_info([(plugin_type, plugin_name)], collection_metadata)
@@ -0,0 +1,124 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+import copy
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from sphinx_antsibull_ext import roles
+from sphinx_antsibull_ext.roles import (
+    _merge_parse_cache_stats,
+    _parse_collection,
+    _parse_option,
+    _parse_option_ref,
+    _parse_plugin,
+    _parse_return_value,
+    _parse_return_value_ref,
+    _purge_parse_cache_stats,
+    _record_parse_cache_stats,
+    _report_parse_cache_stats,
+    _reset_parse_cache_stats,
+    get_parse_cache_stats,
+)
+
+PARSE_DATA = [
+    (_parse_option, "foo.bar.baz#module:opt.sub=val"),
+    (_parse_option, "opt=val"),
+    (_parse_option, "opt"),
+    (_parse_option_ref, "foo.bar.baz#module:opt"),
+    (_parse_return_value, "foo.bar.baz#module:rv=1"),
+    (_parse_return_value, "rv"),
+    (_parse_return_value_ref, "foo.bar.baz#module:rv"),
+    (_parse_plugin, "foo.bar.baz#module"),
+    (_parse_collection, "foo.bar"),
+    (_parse_collection, "foo.bar#plugins"),
+]
+
+PARSE_ERROR_DATA = [
+    (_parse_option, "foo.bar#module:opt", "Invalid option name"),
+    (_parse_option_ref, "opt", "Cannot extract plugin name and type"),
+    (_parse_return_value, "foo.bar#module:rv", "Invalid return value name"),
+    (_parse_return_value_ref, "rv", "Cannot extract plugin name and type"),
+    (_parse_plugin, "foo.bar", "Cannot extract plugin name and type"),
+    (_parse_collection, "foo", "Does not contain collection name"),
+]
+
+
+@pytest.mark.parametrize("parse, text", PARSE_DATA)
+def test_parse_cache(parse, text):
+    parse.cache_clear()
+    expected = parse.__wrapped__(text)
+    assert parse(text) == expected
+    assert parse(text) == expected
+    info = parse.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+@pytest.mark.parametrize("parse, text, message", PARSE_ERROR_DATA)
+def test_parse_cache_errors(parse, text, message):
+    parse.cache_clear()
+    with pytest.raises(ValueError, match=message):
+        parse.__wrapped__(text)
+    # Errors are not cached, so they are raised every time
+    for dummy in range(2):
+        with pytest.raises(ValueError, match=message):
+            parse(text)
+    info = parse.cache_info()
+    assert (info.hits, info.misses) == (0, 2)
+
+
+def _read_doc(env, docname: str, targets: list[str]) -> None:
+    # Simulate reading a document that contains plugin references
+    env.docname = docname
+    for target in targets:
+        _parse_plugin(target)
+    _record_parse_cache_stats(SimpleNamespace(env=env), None)
+
+
+def test_parse_cache_stats():
+    app = SimpleNamespace(env=SimpleNamespace())
+    env = app.env
+    _parse_plugin.cache_clear()
+    _reset_parse_cache_stats(app, env, ["a", "b", "c"])
+
+    _read_doc(env, "a", ["foo.bar.a#module", "foo.bar.a#module"])
+
+    # Documents read in parallel are read in copies of the environment by worker
+    # processes, which continue with the caches of the main process
+    worker_envs = [(docnames, copy.deepcopy(env)) for docnames in (["b"], ["c"])]
+    _read_doc(worker_envs[0][1], "b", ["foo.bar.a#module", "foo.bar.b#module"])
+    _read_doc(worker_envs[1][1], "c", ["foo.bar.b#module"])
+    for docnames, worker_env in worker_envs:
+        _merge_parse_cache_stats(app, env, docnames, worker_env)
+
+    assert env.antsibull_parse_cache_stats == {
+        "a": (1, 1),
+        "b": (1, 1),
+        "c": (1, 0),
+    }
+    assert get_parse_cache_stats()[0] >= 3
+
+    with mock.patch.object(roles, "logger") as logger:
+        _report_parse_cache_stats(app, None)
+    logger.info.assert_called_once_with(
+        "antsibull semantic markup: 3 of 5 role lookups were cached (60.0%)"
+    )
+
+    # Purged documents no longer count
+    _purge_parse_cache_stats(app, env, "b")
+    assert env.antsibull_parse_cache_stats == {"a": (1, 1), "c": (1, 0)}
+    with mock.patch.object(roles, "logger") as logger:
+        _report_parse_cache_stats(app, None)
+    logger.info.assert_called_once_with(
+        "antsibull semantic markup: 2 of 3 role lookups were cached (66.7%)"
+    )
+
+    # Nothing is reported for failed builds
+    with mock.patch.object(roles, "logger") as logger:
+        _report_parse_cache_stats(app, Exception())
+    logger.info.assert_not_called()
@@ -0,0 +1,113 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import asyncio
+import copy
+
+from antsibull_docs.augment_docs import augment_docs, augment_seealso
+from antsibull_docs.process_docs import normalize_all_plugin_info
+from antsibull_docs.rst_labels import get_option_ref, get_return_value_ref
+
+PLUGIN_INFO = {
+    "module": {
+        "foo.bar.mod": {
+            "doc": {
+                "name": "mod",
+                "short_description": "A module",
+                "description": ["A module."],
+                "author": ["Someone"],
+                "attributes": {
+                    "check_mode": {
+                        "description": ["Check mode."],
+                        "support": "full",
+                    },
+                },
+                "options": {
+                    "opt": {
+                        "description": ["An option."],
+                        "type": "dict",
+                        "aliases": ["alias"],
+                        "suboptions": {
+                            "sub": {"description": ["A suboption."], "type": "str"},
+                        },
+                    },
+                },
+                "seealso": [
+                    {"module": "foo.bar.other"},
+                    {"module": "foo.bar.other", "description": "Keep this."},
+                ],
+            },
+            "examples": "",
+            "return": {
+                "value": {
+                    "description": ["A value."],
+                    "returned": "success",
+                    "type": "dict",
+                    "contains": {
+                        "sub": {
+                            "description": ["A sub-value."],
+                            "returned": "success",
+                            "type": "str",
+                        },
+                    },
+                },
+            },
+        },
+        "foo.bar.other": {
+            "doc": {
+                "name": "other",
+                "short_description": "Another module",
+                "description": ["Another module."],
+                "author": ["Someone"],
+            },
+            "examples": "",
+            "return": {},
+        },
+    },
+}
+
+COLLECTION_ROUTING = {
+    "module": {
+        "foo.bar.old_mod": {"redirect": "foo.bar.mod"},
+        "foo.bar.mod": {},
+    },
+}
+
+
+def test_augment_in_normalization_workers():
+    expected, expected_errors = asyncio.run(normalize_all_plugin_info(PLUGIN_INFO))
+    augment_docs(expected, COLLECTION_ROUTING)
+
+    result, errors = asyncio.run(
+        normalize_all_plugin_info(copy.deepcopy(PLUGIN_INFO), COLLECTION_ROUTING)
+    )
+    assert errors == expected_errors == {}
+    # See-also descriptions are filled in centrally
+    assert not result["module"]["foo.bar.mod"]["doc"]["seealso"][0]["description"]
+    augment_seealso(result)
+    assert result == expected
+
+    mod = result["module"]["foo.bar.mod"]
+    assert mod["doc"]["aliases"] == ["old_mod"]
+    assert mod["doc"]["seealso"][0]["description"] == "Another module."
+    assert mod["doc"]["seealso"][1]["description"] == "Keep this."
+    sub = mod["doc"]["options"]["opt"]["suboptions"]["sub"]
+    assert sub["full_key"] == ["opt", "sub"]
+    assert sub["full_keys"] == [["opt", "sub"], ["alias", "sub"]]
+    assert mod["return"]["value"]["contains"]["sub"]["full_key"] == ["value", "sub"]
+    assert mod["rst_labels"]["option"]["alias/sub"] == get_option_ref(
+        "foo.bar.mod", "module", None, ["alias", "sub"]
+    )
+    assert mod["rst_labels"]["option"]["opt/sub"] == get_option_ref(
+        "foo.bar.mod", "module", None, ["opt", "sub"]
+    )
+    assert mod["rst_labels"]["return_value"]["value/sub"] == get_return_value_ref(
+        "foo.bar.mod", "module", None, ["value", "sub"]
+    )
+    assert mod["rst_labels"]["attribute"] == {
+        "check_mode": "ansible_collections.foo.bar.mod_module__attribute-check_mode",
+    }
+    assert "rst_labels" not in sub
@@ -0,0 +1,450 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import glob
+import json
+import os
+import typing as t
+import weakref
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import pydantic
+import pytest
+from antsibull_core import app_context
+
+from antsibull_docs import process_docs
+from antsibull_docs.env_variables import (
+    collect_environment_variables,
+    collect_referenced_environment_variables,
+)
+from antsibull_docs.process_docs import (
+    PluginCatalogue,
+    _exc_to_string,
+    _fix_builtin_plugins,
+    _normalize_plugins,
+    deduplicate_plugin_info,
+    get_callback_plugin_contents,
+    get_collection_contents,
+    get_plugin_contents,
+    normalize_all_plugin_info,
+    normalize_plugin_info,
+)
+from antsibull_docs.schemas.docs import DOCS_SCHEMAS
+
+PLUGIN_INFO: dict[str, dict[str, t.Any]] = {
+    "module": {
+        "foo.bar.mod": {
+            "doc": {
+                "name": "mod",
+                "short_description": "A module",
+                "description": ["A module."],
+                "author": ["Someone"],
+                "deprecated": {
+                    "removed_in": "3.0.0",
+                    "removed_from_collection": "foo.bar",
+                    "why": "Old.",
+                    "alternative": "Nothing.",
+                },
+            },
+            "examples": "",
+            "return": {},
+        },
+        "foo.baz.mod": {
+            "doc": {
+                "name": "mod",
+                "short_description": "Another module",
+                "description": ["Another module."],
+                "author": ["Someone"],
+            },
+            "examples": "",
+            "return": {},
+        },
+    },
+    "callback": {
+        "foo.bar.cb": {
+            "doc": {
+                "name": "cb",
+                "short_description": "A callback",
+                "description": ["A callback."],
+                "author": ["Someone"],
+                "type": "stdout",
+                "options": {
+                    "opt": {
+                        "description": ["An option."],
+                        "env": [{"name": "FOO_OPT"}, {"name": "ANSIBLE_CORE"}],
+                        "type": "dict",
+                        "suboptions": {
+                            "sub": {
+                                "description": "A suboption.",
+                                "env": [{"name": "FOO_SUB"}],
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+NONFATAL_ERRORS = {
+    "module": {"foo.bar.broken": ["Cannot parse"]},
+    "lookup": {"foo.baz.lookup": ["Cannot parse"]},
+}
+
+ANSIBLE_CONFIG = {"CORE": {"env": [{"name": "ANSIBLE_CORE"}]}}
+
+
+def _simplify(contents):
+    return {
+        key: {
+            inner_key: {
+                name: (info.short_description, info.deprecation)
+                for name, info in plugins.items()
+            }
+            for inner_key, plugins in inner.items()
+        }
+        for key, inner in contents.items()
+    }
+
+
+def test_normalize_plugins_shutdown(monkeypatch):
+    executors: list[ProcessPoolExecutor] = []
+
+    class Executor(ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    async def normalize_first() -> tuple[str, str, t.Any]:
+        results = _normalize_plugins(PLUGIN_INFO, None, False)
+        try:
+            return await results.__anext__()
+        finally:
+            await results.aclose()
+
+    monkeypatch.setattr(process_docs, "ProcessPoolExecutor", Executor)
+    with app_context.lib_context(app_context.LibContext(process_max=1)):
+        plugin_type, plugin_name, result = asyncio.run(normalize_first())
+    assert plugin_name in PLUGIN_INFO[plugin_type]
+    assert not isinstance(result, Exception)
+    # The workers are stopped although not all results have been consumed
+    assert len(executors) == 1
+    with pytest.raises(RuntimeError):
+        executors[0].submit(print)
+
+
+def test_plugin_catalogue():
+    plugin_info, errors = asyncio.run(normalize_all_plugin_info(PLUGIN_INFO))
+    assert errors == {}
+    nonfatal_errors = defaultdict(lambda: defaultdict(list))
+    for plugin_type, errors in NONFATAL_ERRORS.items():
+        nonfatal_errors[plugin_type].update(errors)
+
+    catalogue = PluginCatalogue.create(plugin_info, nonfatal_errors)
+
+    plugin_contents = get_plugin_contents(plugin_info, nonfatal_errors)
+    assert _simplify(catalogue.plugin_contents) == _simplify(plugin_contents)
+    assert _simplify(catalogue.callback_plugin_contents) == _simplify(
+        get_callback_plugin_contents(plugin_info)
+    )
+    assert _simplify(catalogue.collection_contents) == _simplify(
+        get_collection_contents(plugin_contents)
+    )
+    assert (
+        catalogue.plugin_contents["module"]["foo.bar"]["broken"].short_description == ""
+    )
+    assert list(catalogue.callback_plugin_contents) == ["stdout"]
+
+    # Collection names are shared between the entries of a collection
+    entries = [
+        entry
+        for entry in catalogue.entries.values()
+        if entry.collection_name == "foo.bar"
+    ]
+    assert len(entries) == 3
+    assert all(entry.collection_name is entries[0].collection_name for entry in entries)
+
+    deprecated = catalogue.get_deprecated_plugins()
+    assert list(deprecated) == ["module"]
+    assert list(deprecated["module"]) == ["foo.bar.mod"]
+
+    env_vars, core_envs = collect_environment_variables(
+        catalogue.get_env_vars(), ANSIBLE_CONFIG
+    )
+    expected_env_vars, expected_core_envs = collect_referenced_environment_variables(
+        plugin_info, ANSIBLE_CONFIG
+    )
+    assert core_envs == expected_core_envs == {"ANSIBLE_CONFIG", "ANSIBLE_CORE"}
+    assert repr(env_vars) == repr(expected_env_vars)
+    assert sorted(env_vars) == ["FOO_OPT", "FOO_SUB"]
+    assert env_vars["FOO_SUB"].plugins == {"callback": ["foo.bar.cb"]}
+
+
+def test_plugin_catalogue_env_var_order():
+    def _plugin(name: str) -> dict:
+        return {
+            "doc": {
+                "name": name,
+                "short_description": f"The {name} plugin",
+                "description": [f"The {name} plugin."],
+                "author": ["Someone"],
+                "options": {
+                    "opt": {"description": ["An option."], "env": [{"name": "FOO"}]},
+                },
+            },
+            "examples": "",
+            "return": {},
+        }
+
+    plugin_info, errors = asyncio.run(
+        normalize_all_plugin_info(
+            {
+                "become": {"foo.bar.become": _plugin("become")},
+                "lookup": {"foo.bar.lookup": _plugin("lookup")},
+            }
+        )
+    )
+    assert errors == {}
+    # A plugin with a non-fatal error that also references the environment variable
+    nonfatal_errors = {"lookup": {"foo.bar.lookup": ["Cannot parse examples"]}}
+
+    catalogue = PluginCatalogue.create(plugin_info, nonfatal_errors)
+
+    env_vars, dummy = collect_environment_variables(catalogue.get_env_vars(), {})
+    expected_env_vars, dummy = collect_referenced_environment_variables(plugin_info, {})
+    assert repr(env_vars) == repr(expected_env_vars)
+    assert list(env_vars["FOO"].plugins) == ["become", "lookup"]
+
+
+def _create_synthetic_dump(count: int) -> dict:
+    return {
+        "module": {
+            f"foo.bar.mod{index}": {
+                "doc": {
+                    "name": f"mod{index}",
+                    "short_description": f"Module {index}",
+                    "description": [f"Module {index} does {i}." for i in range(5)],
+                    "author": ["Someone"],
+                    "options": {
+                        f"opt{i}": {
+                            "description": [f"Option {i} of module {index}." * 3],
+                            "type": "str",
+                            "default": f"value{i}",
+                        }
+                        for i in range(10)
+                    },
+                },
+                "examples": "- foo.bar.mod: {}\n" * 5,
+                "return": {},
+            }
+            for index in range(count)
+        },
+    }
+
+
+def test_normalize_all_plugin_info_releases_plugin_info():
+    plugin_info = _create_synthetic_dump(100)
+    # Sets can be pickled and referenced weakly, so they show which raw records are
+    # still alive
+    markers = {}
+    for plugin_name, plugin_record in plugin_info["module"].items():
+        plugin_record["marker"] = marker = {plugin_name}
+        markers[plugin_name] = weakref.ref(marker)
+    del plugin_record, marker
+
+    async def normalize() -> list[int]:
+        alive = []
+        async for dummy, dummy, result in _normalize_plugins(plugin_info, None, True):
+            assert not isinstance(result, Exception)
+            # Records that have been removed from plugin_info, but are still alive
+            alive.append(
+                sum(ref() is not None for ref in markers.values())
+                - len(plugin_info["module"])
+            )
+        return alive
+
+    with app_context.lib_context(app_context.LibContext(process_max=1)):
+        alive = asyncio.run(normalize())
+
+    assert plugin_info == {"module": {}}
+    assert len(alive) == 100
+    # Only the records handed to the workers (at most four per worker) are kept alive
+    # until they are normalized. The record of the plugin that has just been
+    # normalized can still be referenced by the executor for a short time.
+    assert max(alive) <= 5
+    assert all(ref() is None for ref in markers.values())
+
+    plugin_info = _create_synthetic_dump(10)
+    new_plugin_info, errors = asyncio.run(
+        normalize_all_plugin_info(plugin_info, release_plugin_info=True)
+    )
+    assert plugin_info == {"module": {}}
+    assert errors == {}
+    assert list(new_plugin_info["module"])[:2] == ["foo.bar.mod0", "foo.bar.mod1"]
+
+
+def test_deduplicate_plugin_info():
+    def create_option(default):
+        return {
+            "description": ["Shared option.", "From a fragment."],
+            "type": "raw",
+            "default": default,
+            "suboptions": {"sub": {"description": ["Shared option."]}},
+            "full_keys_rst": [("opt",), ("alias",)],
+        }
+
+    plugin_info = {
+        "module": {
+            f"foo.bar.{name}": {"doc": {"name": name, "options": options}}
+            for name, options in [
+                ("a", {"opt": create_option(1), "other": create_option(1.0)}),
+                ("b", {"opt": create_option(1), "other": create_option(True)}),
+                ("c", {"opt": create_option(-0.0), "other": create_option(0.0)}),
+            ]
+        },
+    }
+    expected = copy.deepcopy(plugin_info)
+
+    deduplicate_plugin_info(plugin_info)
+
+    assert plugin_info == expected
+    a, b, c = (
+        plugin_info["module"][f"foo.bar.{name}"]["doc"]["options"]
+        for name in ("a", "b", "c")
+    )
+    assert a["opt"] is b["opt"]
+    assert a["opt"]["description"] is c["other"]["description"]
+    assert a["opt"]["suboptions"] is c["opt"]["suboptions"]
+    assert a["opt"]["full_keys_rst"] is c["other"]["full_keys_rst"]
+    assert a["opt"]["full_keys_rst"][0] == ("opt",)
+    # Values that compare equal, but render differently, are not shared
+    assert a["opt"] is not a["other"]
+    assert b["opt"] is not b["other"]
+    assert c["opt"] is not c["other"]
+    assert repr(c["opt"]["default"]) == "-0.0"
+
+
+def test_deduplicate_plugin_info_after_augmentation():
+    def create_record(name):
+        return {
+            "doc": {
+                "name": name,
+                "short_description": "A module",
+                "description": ["A module."],
+                "author": ["Someone"],
+                "attributes": {
+                    "check_mode": {"description": ["Check mode."], "support": "full"},
+                },
+                "options": {
+                    "opt": {
+                        "description": ["Shared option."],
+                        "type": "dict",
+                        "aliases": ["alias"],
+                        "suboptions": {"sub": {"description": ["Suboption."]}},
+                    },
+                },
+            },
+            "examples": "",
+            "return": {
+                "value": {
+                    "description": ["Shared return value."],
+                    "returned": "success",
+                    "type": "str",
+                },
+            },
+        }
+
+    plugin_info, errors = asyncio.run(
+        normalize_all_plugin_info(
+            {"module": {f"foo.bar.{name}": create_record(name) for name in "ab"}},
+            {"module": {}},
+        )
+    )
+    assert errors == {}
+
+    deduplicate_plugin_info(plugin_info)
+
+    a, b = (plugin_info["module"][f"foo.bar.{name}"] for name in "ab")
+    # The labels of the plugins differ, but are not part of the entries
+    assert a["doc"]["options"] is b["doc"]["options"]
+    assert a["doc"]["attributes"] is b["doc"]["attributes"]
+    assert a["return"] is b["return"]
+    assert a["rst_labels"]["option"] == {
+        "alias": "ansible_collections.foo.bar.a_module__parameter-alias",
+        "alias/sub": "ansible_collections.foo.bar.a_module__parameter-alias/sub",
+        "opt": "ansible_collections.foo.bar.a_module__parameter-opt",
+        "opt/sub": "ansible_collections.foo.bar.a_module__parameter-opt/sub",
+    }
+    assert b["rst_labels"]["return_value"] == {
+        "value": "ansible_collections.foo.bar.b_module__return-value",
+    }
+    assert b["rst_labels"]["attribute"] == {
+        "check_mode": "ansible_collections.foo.bar.b_module__attribute-check_mode",
+    }
+
+
+def _load_functional_test_dumps() -> list[tuple[str, str, dict]]:
+    result = []
+    pattern = os.path.join(
+        os.path.dirname(__file__), "..", "functional", "ansible-doc-cache-*.json"
+    )
+    for filename in sorted(glob.glob(pattern)):
+        with open(filename, encoding="utf-8") as f:
+            data = json.load(f)
+        for plugin_type, plugins in data["all"].items():
+            if plugin_type == "role" or plugin_type not in DOCS_SCHEMAS:
+                continue
+            for plugin_name, plugin_record in plugins.items():
+                result.append((plugin_type, plugin_name, plugin_record))
+    return result
+
+
+def _normalize_fields_separately(plugin_type, plugin_name, plugin_record):
+    # This is how normalize_plugin_info() used to validate the fields
+    if plugin_name.startswith("ansible.builtin."):
+        _fix_builtin_plugins(plugin_name, plugin_type, plugin_record)
+    errors = []
+    new_info = {}
+    for field in ("doc", "examples", "return"):
+        schema = DOCS_SCHEMAS[plugin_type][field]
+        try:
+            field_model = schema.model_validate({field: plugin_record.get(field)})
+        except pydantic.ValidationError as e:
+            if field == "doc":
+                raise ValueError(_exc_to_string(e, schema.__name__))
+            errors.append(
+                f'Unable to normalize {new_info["doc"]["name"]}: {field}'
+                f" due to: {_exc_to_string(e, schema.__name__)}"
+            )
+            field_model = schema()
+        new_info.update(field_model.model_dump(by_alias=True))
+    return new_info, errors
+
+
+def _normalize_combined(plugin_type, plugin_name, plugin_record):
+    return normalize_plugin_info(plugin_name, plugin_type, plugin_record)
+
+
+def _normalize_records(normalize, records):
+    results = []
+    for plugin_type, plugin_name, plugin_record in records:
+        try:
+            results.append(normalize(plugin_type, plugin_name, plugin_record))
+        except ValueError as exc:
+            results.append(str(exc))
+    return results
+
+
+def test_normalize_plugin_info_combined_validation():
+    # Validating all fields at once gives the same results as validating them one by one
+    records = _load_functional_test_dumps()
+    assert records
+    combined = _normalize_records(_normalize_combined, copy.deepcopy(records))
+    separately = _normalize_records(_normalize_fields_separately, records)
+    assert json.dumps(combined) == json.dumps(separately)
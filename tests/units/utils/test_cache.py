@@ -0,0 +1,66 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+from antsibull_docs.utils.cache import (
+    ResultCache,
+    compute_cache_key,
+    hash_file,
+    hash_files,
+)
+
+
+def test_compute_cache_key():
+    assert compute_cache_key("a", 1, None) == compute_cache_key("a", 1, None)
+    assert compute_cache_key("a", 1, None) != compute_cache_key("a", 1, "")
+    assert compute_cache_key({"a": 1, "b": 2}) == compute_cache_key({"b": 2, "a": 1})
+
+
+def test_hash_file(tmp_path):
+    path = tmp_path / "file"
+    assert hash_file(path) is None
+    path.write_text("foo")
+    first = hash_file(path)
+    assert first is not None
+    path.write_text("bar")
+    assert hash_file(path) != first
+
+
+def test_hash_files(tmp_path):
+    (tmp_path / "dir" / "__pycache__").mkdir(parents=True)
+    (tmp_path / "dir" / "a").write_text("a")
+    (tmp_path / "file").write_text("file")
+    (tmp_path / "other").write_text("other")
+    first = hash_files(tmp_path, ["dir", "file", "missing"])
+    assert first == hash_files(tmp_path, ["missing", "file", "dir"])
+
+    # Unrelated files are ignored
+    (tmp_path / "other").write_text("changed")
+    (tmp_path / "dir" / "__pycache__" / "a.pyc").write_text("a")
+    assert hash_files(tmp_path, ["dir", "file", "missing"]) == first
+
+    (tmp_path / "dir" / "b").write_text("b")
+    second = hash_files(tmp_path, ["dir", "file", "missing"])
+    assert second != first
+    (tmp_path / "missing").write_text("")
+    assert hash_files(tmp_path, ["dir", "file", "missing"]) != second
+
+
+def test_result_cache(tmp_path):
+    assert ResultCache.create(None, "test") is None
+    cache = ResultCache.create(tmp_path, "test")
+    assert cache is not None
+    key = compute_cache_key("foo")
+    assert cache.get(key) is None
+    cache.set(key, ["bar", {"baz": 1}])
+    assert cache.get(key) == ["bar", {"baz": 1}]
+
+    other_cache = ResultCache(tmp_path, "other")
+    assert other_cache.get(key) is None
+
+    # Broken entries are ignored
+    with open(cache._get_path(key), "w") as f:
+        f.write("{")
+    assert cache.get(key) is None
@@ -0,0 +1,80 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from antsibull_docs.utils.collection_copier import CollectionCopier
+
+
+def _create_collection(path):
+    (path / "plugins" / "modules").mkdir(parents=True)
+    (path / "plugins" / "modules" / "foo.py").write_text("# foo")
+    os.symlink("foo.py", path / "plugins" / "modules" / "bar.py")
+    (path / "tests" / "output").mkdir(parents=True)
+    (path / "tests" / "output" / "result.txt").write_text("ignored")
+    (path / "tests" / "unit").mkdir()
+    (path / "tests" / "unit" / "test_foo.py").write_text("# test")
+    (path / "galaxy.yml").write_text("namespace: foo\nname: bar\n")
+    (path / ".gitignore").write_text("tests/output/\n")
+
+
+def test_collection_copier_link_no_vcs(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    _create_collection(source)
+    with CollectionCopier(link=True) as copier:
+        copier.add_collection(str(source), "foo", "bar")
+        dest = os.path.join(copier.dir, "ansible_collections", "foo", "bar")
+        assert os.path.islink(dest)
+        assert os.path.realpath(dest) == os.path.realpath(source)
+    # Source is left alone when cleaning up
+    assert (source / "plugins" / "modules" / "foo.py").exists()
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not available")
+def test_collection_copier_link_git(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    _create_collection(source)
+    subprocess.check_call(["git", "init", "-q"], cwd=source)
+
+    with CollectionCopier(link=True) as copier:
+        copier.add_collection(str(source), "foo", "bar")
+        dest = os.path.join(copier.dir, "ansible_collections", "foo", "bar")
+        assert not os.path.islink(dest)
+        assert not os.path.exists(os.path.join(dest, ".git"))
+        # Directories without ignored files are linked
+        assert os.path.islink(os.path.join(dest, "plugins"))
+        assert os.path.islink(os.path.join(dest, "tests", "unit"))
+        # Ignored files are not present
+        assert os.path.isdir(os.path.join(dest, "tests"))
+        assert not os.path.islink(os.path.join(dest, "tests"))
+        assert not os.path.exists(os.path.join(dest, "tests", "output"))
+        # Files next to ignored files are copied
+        assert not os.path.islink(os.path.join(dest, "galaxy.yml"))
+        assert os.path.isfile(os.path.join(dest, "galaxy.yml"))
+        # Relative links inside the collection are kept
+        alias = os.path.join(dest, "plugins", "modules", "bar.py")
+        assert os.readlink(alias) == "foo.py"
+
+    assert (source / "tests" / "output" / "result.txt").exists()
+
+
+def test_collection_copier_link_mismatching_layout(tmp_path):
+    source = tmp_path / "ansible_collections" / "other" / "name"
+    source.mkdir(parents=True)
+    _create_collection(source)
+    with CollectionCopier(link=True) as copier:
+        copier.add_collection(str(source), "foo", "bar")
+        dest = os.path.join(copier.dir, "ansible_collections", "foo", "bar")
+        # Falls back to copying
+        assert not os.path.islink(dest)
+        assert not os.path.islink(os.path.join(dest, "plugins"))
+        assert os.path.isfile(os.path.join(dest, "plugins", "modules", "foo.py"))
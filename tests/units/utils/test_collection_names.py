@@ -0,0 +1,210 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+import timeit
+import tracemalloc
+import typing as t
+
+from antsibull_docs.utils.collection_names import NameCollection
+
+PLUGIN_RECORD = {
+    "doc": {
+        "options": {
+            "foo": {
+                "type": "dict",
+                "aliases": ["foo_alias", "foo_other"],
+                "suboptions": {
+                    "bar": {
+                        "type": "list",
+                        "aliases": ["bar_alias"],
+                        "suboptions": {
+                            "baz": {"type": "int", "aliases": ["baz_alias"]},
+                        },
+                    },
+                },
+            },
+            "other": {"type": "str"},
+        },
+    },
+    "return": {
+        "result": {
+            "type": "dict",
+            "contains": {
+                "value": {"type": "str"},
+            },
+        },
+    },
+}
+
+ROLE_RECORD = {
+    "entry_points": {
+        "main": {
+            "options": {
+                "param": {
+                    "type": "dict",
+                    "options": {
+                        "sub": {"type": "bool"},
+                    },
+                },
+            },
+        },
+        "other": {},
+    },
+}
+
+
+def _create_name_collection() -> NameCollection:
+    names = NameCollection({})
+    names._collect_plugin(PLUGIN_RECORD, "foo.bar.module", "module")
+    names._collect_plugin(ROLE_RECORD, "foo.bar.role", "role")
+    return names
+
+
+def _check_name_collection(names: NameCollection) -> None:
+    for foo in ("foo", "foo_alias", "foo_other"):
+        assert names.get_option_type("foo.bar.module", "module", foo) == "dict"
+        for bar in ("bar", "bar_alias"):
+            assert (
+                names.get_option_type("foo.bar.module", "module", f"{foo}/{bar}")
+                == "list"
+            )
+            for baz in ("baz", "baz_alias"):
+                assert names.is_valid_option(
+                    "foo.bar.module", "module", f"{foo}/{bar}/{baz}"
+                )
+                assert (
+                    names.get_option_type(
+                        "foo.bar.module", "module", f"{foo}/{bar}/{baz}"
+                    )
+                    == "int"
+                )
+    assert names.get_option_type("foo.bar.module", "module", "other") == "str"
+    assert not names.is_valid_option("foo.bar.module", "module", "bar")
+    assert not names.is_valid_option("foo.bar.module", "module", "other/bar")
+    assert not names.is_valid_option("foo.bar.module", "module", "foo/baz")
+    assert not names.is_valid_option("foo.bar.module", "module", "foo/bar/baz/x")
+    assert not names.is_valid_option("foo.bar.module", "module", "main###foo")
+    assert not names.is_valid_option("foo.bar.other", "module", "foo")
+    assert not names.is_valid_option("foo.bar.module", "filter", "foo")
+
+    assert names.get_option_type("foo.bar.role", "role", "main###param") == "dict"
+    assert names.get_option_type("foo.bar.role", "role", "main###param/sub") == "bool"
+    assert not names.is_valid_option("foo.bar.role", "role", "param")
+    assert not names.is_valid_option("foo.bar.role", "role", "other###param")
+    assert names.is_valid_role_entrypoint("foo.bar.role", "other")
+
+    assert (
+        names.get_return_value_type("foo.bar.module", "module", "result/value") == "str"
+    )
+
+
+def test_name_collection_options():
+    _check_name_collection(_create_name_collection())
+
+
+def test_name_collection_dump_load():
+    names = _create_name_collection()
+    data = json.loads(json.dumps(names._dump_collection("foo.bar")))
+    assert names._dump_collection("other.collection")["option_tries"] == []
+
+    loaded = NameCollection({})
+    loaded._load_collection("foo.bar", data)
+    _check_name_collection(loaded)
+    assert loaded._dump_collection("foo.bar") == data
+
+    # Aliases are not expanded in the serialized data
+    module_tries = [
+        entry for entry in data["option_tries"] if entry[0] == "foo.bar.module"
+    ]
+    assert len(module_tries) == 1
+    assert ["foo", "foo_alias", "foo_other"] in [
+        option_names for option_names, dummy in module_tries[0][3][1]
+    ]
+
+
+def _create_options(
+    depth: int, width: int, aliases: int, prefix: str = ""
+) -> dict[str, t.Any]:
+    options: dict[str, t.Any] = {}
+    for index in range(width):
+        name = f"{prefix}opt{index}"
+        option: dict[str, t.Any] = {
+            "type": "dict" if depth > 1 else "str",
+            "aliases": [f"{name}_alias{alias}" for alias in range(aliases)],
+        }
+        if depth > 1:
+            option["suboptions"] = _create_options(
+                depth - 1, width, aliases, f"{name}_"
+            )
+        options[name] = option
+    return options
+
+
+def _collect_flat_option_names(
+    result: dict[tuple[str, str, str], str],
+    plugin: tuple[str, str],
+    options: dict[str, t.Any],
+    path_prefixes: list[str],
+) -> None:
+    # The representation NameCollection used before, kept here as a reference
+    for opt, data in sorted(options.items()):
+        names = [opt, *data.get("aliases", [])]
+        paths = [
+            f"{path_prefix}{name}" for name in names for path_prefix in path_prefixes
+        ]
+        for path in paths:
+            result[(*plugin, path)] = data["type"]
+        if "suboptions" in data:
+            _collect_flat_option_names(
+                result, plugin, data["suboptions"], [f"{path}/" for path in paths]
+            )
+
+
+def _measure_memory(func: t.Callable[[], t.Any]) -> tuple[t.Any, int]:
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def test_name_collection_benchmark():
+    options = _create_options(depth=4, width=4, aliases=2)
+    plugin = ("foo.bar.module", "module")
+
+    def create_flat():
+        result: dict[tuple[str, str, str], str] = {}
+        _collect_flat_option_names(result, plugin, options, [""])
+        return result
+
+    def create_trie():
+        names = NameCollection({})
+        names._collect_plugin({"doc": {"options": options}}, *plugin)
+        return names
+
+    flat, flat_memory = _measure_memory(create_flat)
+    names, trie_memory = _measure_memory(create_trie)
+
+    lookups = [key[2] for key in sorted(flat)[:: max(1, len(flat) // 1000)]]
+    for lookup in lookups:
+        assert names.get_option_type(*plugin, lookup) == flat[(*plugin, lookup)]
+
+    flat_time = timeit.timeit(
+        lambda: [flat.get((*plugin, lookup)) for lookup in lookups], number=10
+    )
+    trie_time = timeit.timeit(
+        lambda: [names.get_option_type(*plugin, lookup) for lookup in lookups],
+        number=10,
+    )
+    print(
+        f"{len(flat)} option paths: flat dict {flat_memory} bytes,"
+        f" {flat_time * 1e6 / (10 * len(lookups)):.2f} us/lookup;"
+        f" trie {trie_memory} bytes,"
+        f" {trie_time * 1e6 / (10 * len(lookups)):.2f} us/lookup"
+    )
+    assert trie_memory * 10 < flat_memory
@@ -0,0 +1,56 @@
+# Copyright (c) Ansible Project
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+
+from antsibull_docs.utils.file_watcher import FileWatcher
+
+
+def _write(path, content: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_file_watcher(tmp_path):
+    _write(tmp_path / "a.txt", "a")
+    _write(tmp_path / "dir" / "b.txt", "b")
+    _write(tmp_path / "ignored" / "c.txt", "c")
+    _write(tmp_path / "__pycache__" / "d.pyc", "d")
+
+    watcher = FileWatcher(str(tmp_path), ignore=lambda path: path == "ignored")
+    assert watcher.poll() == set()
+
+    _write(tmp_path / "a.txt", "aa")
+    _write(tmp_path / "dir" / "new.txt", "new")
+    os.unlink(tmp_path / "dir" / "b.txt")
+    _write(tmp_path / "ignored" / "c.txt", "cc")
+    _write(tmp_path / "__pycache__" / "d.pyc", "dd")
+    assert watcher.poll() == {
+        "a.txt",
+        "dir/b.txt",
+        "dir/new.txt",
+    }
+    assert watcher.poll() == set()
+
+
+def test_file_watcher_wait_for_changes(tmp_path):
+    _write(tmp_path / "a.txt", "a")
+    watcher = FileWatcher(str(tmp_path))
+
+    changes = iter(["", "a.txt", "b.txt", "", "c.txt", ""])
+    sleeps: list[float] = []
+
+    def sleep(interval: float) -> None:
+        sleeps.append(interval)
+        name = next(changes)
+        if name:
+            _write(tmp_path / name, f"{name} {len(sleeps)}")
+
+    # Waits until changes happened, and then until no more changes happen
+    assert watcher.wait_for_changes(0.5, sleep=sleep) == {"a.txt", "b.txt"}
+    assert sleeps == [0.5] * 4
+    assert watcher.wait_for_changes(0.5, sleep=sleep) == {"c.txt"}
@@ -0,0 +1,102 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+import asyncio
+
+from antsibull_core import app_context
+
+from antsibull_docs.env_variables import EnvironmentVariableInfo
+from antsibull_docs.jinja2 import FilenameGenerator, OutputFormat
+from antsibull_docs.utils.collection_name_transformer import (
+    CollectionNameTransformer,
+)
+from antsibull_docs.write_docs import BasicPluginInfo, create_template_executor
+from antsibull_docs.write_docs.indexes import (
+    output_callback_indexes,
+    output_environment_variables,
+    output_plugin_indexes,
+)
+from antsibull_docs.write_docs.io import MemoryOutput
+
+PLUGIN_CONTENTS = {
+    "module": {
+        "foo.bar": {
+            "mod": BasicPluginInfo("A module", None),
+            "other": BasicPluginInfo("Another module", None),
+        },
+        "foo.baz": {
+            "mod": BasicPluginInfo("A third module", None),
+        },
+    },
+    "lookup": {
+        "foo.bar": {
+            "lookup": BasicPluginInfo("A lookup", None),
+        },
+    },
+}
+
+CALLBACK_CONTENTS = {
+    "stdout": {
+        "foo.bar": {
+            "callback": BasicPluginInfo("A callback", None),
+        },
+    },
+}
+
+ENV_VARIABLES = {
+    "FOO": EnvironmentVariableInfo(
+        "FOO", description=["The foo."], plugins={"lookup": ["foo.bar.lookup"]}
+    ),
+}
+
+
+async def _write_indexes(output: MemoryOutput, executor=None) -> None:
+    common_args = {
+        "collection_url": CollectionNameTransformer({}, "https://{namespace}/{name}"),
+        "collection_install": CollectionNameTransformer({}, "install {namespace}"),
+        "output_format": OutputFormat.ANSIBLE_DOCSITE,
+        "filename_generator": FilenameGenerator(),
+        "referable_envvars": {"FOO"},
+        "executor": executor,
+    }
+    await asyncio.gather(
+        output_plugin_indexes(PLUGIN_CONTENTS, {}, output, **common_args),
+        output_callback_indexes(CALLBACK_CONTENTS, output, **common_args),
+        output_environment_variables(
+            output,
+            ENV_VARIABLES,
+            output_format=OutputFormat.ANSIBLE_DOCSITE,
+            filename_generator=FilenameGenerator(),
+            referable_envvars={"FOO"},
+            executor=executor,
+        ),
+    )
+
+
+def test_output_indexes_in_workers():
+    with app_context.lib_context(app_context.LibContext(process_max=2)):
+        expected = MemoryOutput()
+        asyncio.run(_write_indexes(expected))
+
+        result = MemoryOutput()
+        executor = create_template_executor(
+            collection_url=CollectionNameTransformer({}, "https://{namespace}/{name}"),
+            collection_install=CollectionNameTransformer({}, "install {namespace}"),
+            output_format=OutputFormat.ANSIBLE_DOCSITE,
+            filename_generator=FilenameGenerator(),
+            referable_envvars={"FOO"},
+        )
+        with executor:
+            asyncio.run(_write_indexes(result, executor))
+
+    assert sorted(result.files) == [
+        "collections/callback_index_stdout.rst",
+        "collections/environment_variables.rst",
+        "collections/index_lookup.rst",
+        "collections/index_module.rst",
+    ]
+    assert result.files == expected.files
+    assert "foo.baz.mod" in result.files["collections/index_module.rst"]
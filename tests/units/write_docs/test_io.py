@@ -0,0 +1,171 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from antsibull_core import app_context
+
+from antsibull_docs.write_docs import io as io_module
+from antsibull_docs.write_docs.io import Output, TrackingOutput
+
+
+def test_ensure_directory_cache(tmp_path, monkeypatch):
+    calls = []
+    makedirs = os.makedirs
+
+    def counting_makedirs(path, *args, **kwargs):
+        calls.append(path)
+        makedirs(path, *args, **kwargs)
+
+    monkeypatch.setattr(io_module.os, "makedirs", counting_makedirs)
+
+    (tmp_path / "a").mkdir()
+    output = Output(str(tmp_path))
+    output.ensure_directory("a/b")
+    output.ensure_directory("a/b")
+    output.ensure_directory("a/./b/")
+    output.ensure_directory("a/c")
+    assert (tmp_path / "a" / "b").is_dir()
+    assert (tmp_path / "a" / "c").is_dir()
+    assert len(calls) == 2
+
+
+def _write_files(output: TrackingOutput, index: int) -> None:
+    async def write() -> None:
+        output.ensure_directory(f"collections/dir{index}")
+        for file_index in range(10):
+            await output.write_file(
+                f"collections/dir{index}/file{file_index}.rst", content="test"
+            )
+        output.register_pattern(f"collections/dir{index}", "*.rst")
+
+    with app_context.lib_context(app_context.LibContext()):
+        asyncio.run(write())
+
+
+def test_tracking_output_threads(tmp_path):
+    output = TrackingOutput(str(tmp_path))
+    output.ensure_directory("collections")
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda index: _write_files(output, index), range(8)))
+
+    assert len(output._shards) > 1
+    for index in range(8):
+        directory = f"collections/dir{index}"
+        assert directory in output.directories
+        assert output.files[directory] == {f"file{i}.rst" for i in range(10)}
+        assert output.patterns[directory] == {"*.rst"}
+
+    # The properties are read-only snapshots
+    with pytest.raises(TypeError):
+        output.files["collections/dir0"] = frozenset()  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        output.files["collections/dir0"].add("other.rst")  # type: ignore[attr-defined]
+
+    (tmp_path / "collections" / "dir0" / "extra.rst").write_text("extra")
+    (tmp_path / "collections" / "dir0" / "extra.txt").write_text("extra")
+    (tmp_path / "collections" / "unknown").mkdir()
+    output.cleanup("collections", "similar-files-and-dirs")
+
+    assert not (tmp_path / "collections" / "dir0" / "extra.rst").exists()
+    assert (tmp_path / "collections" / "dir0" / "extra.txt").exists()
+    assert (tmp_path / "collections" / "dir0" / "file0.rst").exists()
+    assert not (tmp_path / "collections" / "unknown").exists()
+
+
+def _copy(output: Output, source: str, dest: str) -> None:
+    with app_context.lib_context(app_context.LibContext(file_check_content=1024)):
+        asyncio.run(output.copy_file(source, dest))
+
+
+def test_copy_file_link_mode(tmp_path):
+    source = tmp_path / "source.rst"
+    source.write_text("content")
+    root = tmp_path / "root"
+    root.mkdir()
+
+    output = Output(str(root), copy_mode="link")
+    _copy(output, str(source), "dest.rst")
+    dest = root / "dest.rst"
+    assert dest.read_text() == "content"
+    # Same filesystem, so this is either a reflink or a hardlink
+    assert dest.stat().st_ino == source.stat().st_ino or dest.stat().st_nlink == 1
+
+    # Copying again keeps the existing file
+    inode = dest.stat().st_ino
+    _copy(output, str(source), "dest.rst")
+    assert dest.stat().st_ino == inode
+
+    # A replaced source file results in a new destination file, and the old
+    # source file's content is not modified through a hardlink
+    old_source = tmp_path / "old-source.rst"
+    os.rename(source, old_source)
+    source.write_text("new content")
+    _copy(output, str(source), "dest.rst")
+    assert dest.read_text() == "new content"
+    assert old_source.read_text() == "content"
+
+
+def test_copy_file_link_mode_fallback(tmp_path, monkeypatch):
+    monkeypatch.setattr(io_module, "_link_file", lambda source, dest: False)
+    source = tmp_path / "source.rst"
+    source.write_text("content")
+    root = tmp_path / "root"
+    root.mkdir()
+    dest = root / "dest.rst"
+    os.link(source, dest)
+    source_2 = tmp_path / "source-2.rst"
+    source_2.write_text("other content")
+
+    output = Output(str(root), copy_mode="link")
+    _copy(output, str(source_2), "dest.rst")
+    assert dest.read_text() == "other content"
+    assert dest.stat().st_nlink == 1
+    # The hardlinked file was not written to
+    assert source.read_text() == "content"
+
+
+def test_copy_file_link_mode_reflink_mode(tmp_path, monkeypatch):
+    def fake_reflink(source_path, dest_path):
+        # Behaves like a reflink: a new inode with the source's content
+        with open(source_path, "rb") as f_in, open(dest_path, "wb") as f_out:
+            f_out.write(f_in.read())
+        return True
+
+    monkeypatch.setattr(io_module, "_reflink", fake_reflink)
+    source = tmp_path / "source.rst"
+    source.write_text("content")
+    os.chmod(source, 0o644)
+    root = tmp_path / "root"
+    root.mkdir()
+
+    _copy(Output(str(root), copy_mode="link"), str(source), "dest.rst")
+    dest = root / "dest.rst"
+    assert dest.read_text() == "content"
+    assert stat.S_IMODE(dest.stat().st_mode) == 0o644
+
+
+def test_copy_file_link_mode_link_error(tmp_path, monkeypatch):
+    def failing_link(source_path, dest_path):
+        raise PermissionError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setattr(io_module, "_reflink", lambda source, dest: False)
+    monkeypatch.setattr(io_module.os, "link", failing_link)
+    source = tmp_path / "source.rst"
+    source.write_text("content")
+    root = tmp_path / "root"
+    root.mkdir()
+
+    _copy(Output(str(root), copy_mode="link"), str(source), "dest.rst")
+    dest = root / "dest.rst"
+    assert dest.read_text() == "content"
+    assert dest.stat().st_ino != source.stat().st_ino
+    assert os.listdir(root) == ["dest.rst"]
@@ -0,0 +1,143 @@
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+from antsibull_core import app_context
+
+from antsibull_docs.collection_config import CollectionConfig
+from antsibull_docs.docs_parsing import AnsibleCollectionMetadata
+from antsibull_docs.jinja2 import FilenameGenerator, OutputFormat
+from antsibull_docs.jinja2.environment import doc_environment, get_template_filename
+from antsibull_docs.schemas.collection_links import CollectionLinks
+from antsibull_docs.utils.collection_name_transformer import (
+    CollectionNameTransformer,
+)
+from antsibull_docs.write_docs import create_template_executor
+from antsibull_docs.write_docs.io import MemoryOutput
+from antsibull_docs.write_docs.plugin_stubs import (
+    output_all_plugin_stub_rst,
+    write_stub_rst,
+)
+
+STUBS_INFO: dict[str, dict[str, dict[str, t.Any]]] = {
+    "foo.bar": {
+        "module": {
+            "old": {"redirect": "foo.bar.new", "redirect_is_symlink": True},
+            "older": {
+                "redirect": "foo.bar.new",
+                "deprecation": {
+                    "removal_version": "3.0.0",
+                    "warning_text": "Use foo.bar.new.",
+                },
+            },
+            "gone": {
+                "tombstone": {
+                    "removal_version": "2.0.0",
+                    "warning_text": "It is gone.",
+                },
+            },
+        },
+        "lookup": {
+            "old": {"redirect": "foo.bar.new"},
+        },
+    },
+    "foo.baz": {
+        "module": {
+            "old": {"redirect": "foo.bar.new"},
+        },
+    },
+}
+
+COLLECTION_METADATA = {
+    "foo.bar": AnsibleCollectionMetadata(
+        "/foo/bar", CollectionConfig(), version="1.2.3"
+    ),
+    "foo.baz": AnsibleCollectionMetadata(
+        "/foo/baz", CollectionConfig(), version="2.0.0"
+    ),
+}
+
+LINK_DATA = {
+    "foo.bar": CollectionLinks(),
+    "foo.baz": CollectionLinks(),
+}
+
+ENV_ARGS: dict[str, t.Any] = {
+    "collection_url": CollectionNameTransformer({}, "https://{namespace}/{name}"),
+    "collection_install": CollectionNameTransformer({}, "install {namespace}"),
+    "output_format": OutputFormat.ANSIBLE_DOCSITE,
+    "filename_generator": FilenameGenerator(),
+}
+
+
+async def _write_single_stubs(output: MemoryOutput) -> None:
+    env = doc_environment(**ENV_ARGS)
+    redirect_tmpl = env.get_template(
+        get_template_filename("plugin-redirect", OutputFormat.ANSIBLE_DOCSITE)
+    )
+    tombstone_tmpl = env.get_template(
+        get_template_filename("plugin-tombstone", OutputFormat.ANSIBLE_DOCSITE)
+    )
+    for collection_name, plugins_by_type in STUBS_INFO.items():
+        for plugin_type, plugins in plugins_by_type.items():
+            for plugin_short_name, routing_data in plugins.items():
+                await write_stub_rst(
+                    collection_name,
+                    COLLECTION_METADATA[collection_name],
+                    LINK_DATA[collection_name],
+                    plugin_short_name,
+                    plugin_type,
+                    routing_data,
+                    redirect_tmpl,
+                    tombstone_tmpl,
+                    output,
+                    OutputFormat.ANSIBLE_DOCSITE,
+                    FilenameGenerator(),
+                )
+
+
+def test_output_all_plugin_stub_rst():
+    with app_context.lib_context(app_context.LibContext(process_max=2)):
+        expected = MemoryOutput()
+        asyncio.run(_write_single_stubs(expected))
+
+        result = MemoryOutput()
+        asyncio.run(
+            output_all_plugin_stub_rst(
+                STUBS_INFO,
+                result,
+                collection_metadata=COLLECTION_METADATA,
+                link_data=LINK_DATA,
+                **ENV_ARGS,
+            )
+        )
+
+        result_in_workers = MemoryOutput()
+        with create_template_executor(**ENV_ARGS) as executor:
+            asyncio.run(
+                output_all_plugin_stub_rst(
+                    STUBS_INFO,
+                    result_in_workers,
+                    collection_metadata=COLLECTION_METADATA,
+                    link_data=LINK_DATA,
+                    executor=executor,
+                    **ENV_ARGS,
+                )
+            )
+
+    assert sorted(result.files) == [
+        "collections/foo/bar/gone_module.rst",
+        "collections/foo/bar/old_lookup.rst",
+        "collections/foo/bar/old_module.rst",
+        "collections/foo/bar/older_module.rst",
+        "collections/foo/baz/old_module.rst",
+    ]
+    assert result.files == expected.files
+    assert result_in_workers.files == expected.files
+    assert "foo.bar.new" in result.files["collections/foo/baz/old_module.rst"]
+    assert "It is gone." in result.files["collections/foo/bar/gone_module.rst"]